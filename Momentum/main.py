@@ -1,57 +1,45 @@
 import pandas as pd
-import yfinance as yf
-import mplfinance as mpf
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import os
 import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bullfolio.calendars import DURATION_TYPES, download_end, trading_window
+from bullfolio.charts import candlestick_figure, clean_and_prepare_data
+from bullfolio.chunks import batches, merge_scores, spill_scores
+from bullfolio.manifest import read_manifest, write_latest_run, write_manifest, write_markets_manifest
+from bullfolio.composite import composite_scores, parse_weights
+from bullfolio.delta import clear_previous_outputs, last_bar, print_report, rank_changes, relink_charts, reusable_charts
+from bullfolio.history import record_run
+from bullfolio.indicators import apply_filter, compute_indicators, empty_columns, indicator_start, indicator_table
+from bullfolio.markets import MARKETS, parse_markets, throttle
+from bullfolio.matrix import build_panel, field_matrix
+from bullfolio.outputs import OUTPUTS, VECTOR_OUTPUTS
+from bullfolio.overlays import build_addplots
+from bullfolio.quality import check_frames, parse_rules, print_quarantine
+from bullfolio.relstrength import fetch_benchmark, relative_strength
+from bullfolio.store import ingest_download, load_frame, save_frame
+from bullfolio.universe import is_blacklisted, load_blacklist, provider_ticker, record_fetches, save_blacklist
 
 # Constants
 GRAPH_FOLDER = 'graph_custom'
+SYMBOL_LIMIT = 1300
 
-suffix = ""
+market = ""
 csv_file = ""
 
-# Binance Dark Theme
-binance_dark = {
-    "base_mpl_style": "dark_background",
-    "marketcolors": {
-        "candle": {"up": "#3dc985", "down": "#ef4f60"},
-        "edge": {"up": "#3dc985", "down": "#ef4f60"},
-        "wick": {"up": "#3dc985", "down": "#ef4f60"},
-        "ohlc": {"up": "green", "down": "red"},
-        "volume": {"up": "#247252", "down": "#82333f"},
-        "vcedge": {"up": "green", "down": "red"},
-        "vcdopcod": False,
-        "alpha": 1,
-    },
-    "mavcolors": ("#ad7739", "#a63ab2", "#62b8ba"),
-    "facecolor": "#1b1f24",
-    "gridcolor": "#2c2e31",
-    "gridstyle": "--",
-    "y_on_right": True,
-    "rc": {
-        "axes.grid": True,
-        "axes.grid.axis": "y",
-        "axes.edgecolor": "#474d56",
-        "axes.titlecolor": "red",
-        "figure.facecolor": "#161a1e",
-        "figure.titlesize": 10,  # Reduced title size
-        "figure.titleweight": "semibold",
-        "axes.labelsize": 5,  # Reduced label size
-        "axes.titlesize": 8,  # Reduced axes title size
-        "xtick.labelsize": 5,  # Reduced x-axis tick label size
-        "ytick.labelsize": 5,  # Reduced y-axis tick label size
-    },
-    "base_mpf_style": "binance-dark",
-}
-
-def read_csv_and_get_symbols(file_path):
-    """Read CSV and extract stock symbols."""
+def read_csv_and_get_symbols(file_path, limit=SYMBOL_LIMIT):
+    """Read CSV and extract stock symbols (the first limit of them, or all if limit is None)."""
     try:
         df = pd.read_csv(file_path)
         if 'Symbol' not in df.columns:
             raise KeyError("The CSV file must contain a 'Symbol' column.")
-        return df['Symbol'].head(1300).tolist()
+        symbols = df['Symbol'] if limit is None else df['Symbol'].head(limit)
+        return symbols.tolist()
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
         return []
@@ -59,14 +47,19 @@ def read_csv_and_get_symbols(file_path):
         print(e)
         return []
 
-def fetch_stock_data(symbol, start_date, interval):
-    """Fetch historical stock data for a given symbol."""
+def fetch_stock_data(symbol, start_date, interval, end_date=None):
+    """
+    Fetch historical stock data (as traded, with splits and dividends) for a given
+    symbol. Returns an empty frame if the provider has no bars, None if the request failed.
+    """
+    import yfinance as yf
+
     try:
-        symbol_with_suffix = f"{symbol}{suffix}"
-        data = yf.download(symbol_with_suffix, start=start_date, interval=interval)
-        if data.empty or len(data) < 2:
-            print(f"Insufficient data for {symbol}.")
-            return None
+        throttle(market)
+        data = yf.download(provider_ticker(symbol, market), start=start_date, end=end_date and download_end(end_date),
+                           interval=interval, auto_adjust=False, actions=True)
+        if data.empty:
+            print(f"No data for {symbol}.")
         return data
     except Exception as e:
         print(f"Error fetching data for {symbol}: {e}")
@@ -83,124 +76,457 @@ def calculate_return(data):
         print(f"Error calculating return: {e}")
         return None
 
-def clean_and_prepare_data(data, symbol):
-    """Clean and prepare the data for mplfinance."""
-    try:
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.map('_'.join).str.strip()
-
-        column_mapping = {
-            f"Close_{symbol}{suffix}": 'Close',
-            f'High_{symbol}{suffix}': 'High',
-            f'Low_{symbol}{suffix}': 'Low',
-            f'Open_{symbol}{suffix}': 'Open',
-            f'Volume_{symbol}{suffix}': 'Volume',
-        }
-        data = data.rename(columns=column_mapping)
-
-        required_columns = ['Open', 'High', 'Low', 'Close']
-        if not all(col in data.columns for col in required_columns):
-            raise KeyError(f"Required columns {required_columns} not found in data.")
-
-        data = data[required_columns].apply(pd.to_numeric, errors='coerce').dropna()
-        data.index = pd.to_datetime(data.index)
-        return data
-    except Exception as e:
-        print(f"Error cleaning and preparing data: {e}")
-        return None
+def chart_title(symbol, return_percent, excess_return=None):
+    """Title shown above a symbol's chart."""
+    title = f"{symbol} - Return: {return_percent:.2f}%"
+    if excess_return is not None:
+        title += f" ({excess_return:+.2f}% vs benchmark)"
+    return title
 
-def save_candlestick_chart(data, symbol, rank, return_percent):
-    """Save the candlestick chart."""
+def save_candlestick_chart(output, data, row, addplot=None, volume=False):
+    """Add the candlestick chart with any overlays and an optional volume panel to the output."""
+    symbol = row['symbol']
     try:
-        data = clean_and_prepare_data(data, symbol)
+        data = clean_and_prepare_data(data, provider_ticker(symbol, market))
         if data is None or data.empty:
             print(f"Insufficient or invalid data for {symbol}.")
             return
 
-        file_name = os.path.join(GRAPH_FOLDER, f"{rank}.png")
-        title = f"{symbol} - Return: {return_percent:.2f}%"
-        mpf.plot(
-            data,
-            type='candle',
-            style=binance_dark,
-            title=title,
-            ylabel='Price',
-            savefig=dict(fname=file_name, dpi=300, bbox_inches='tight'),
-            figratio=(20, 9),
-            figscale=0.8,
-        )
-        print(f"Candlestick chart saved for {symbol} as {file_name}.")
+        figure = candlestick_figure(data, row['title'], addplot=addplot, volume=volume)
+        file_name = output.add(row, figure)
+        print(f"Candlestick chart saved for {symbol} in {file_name}.")
     except Exception as e:
         print(f"Error saving candlestick chart for {symbol}: {e}")
 
-def main():
-    global suffix, csv_file, GRAPH_FOLDER
-    """Main function to execute the script."""
+def save_vector_chart(output, data, row):
+    """Add the candles to a vector output, which the browser draws without matplotlib."""
+    symbol = row['symbol']
     try:
-        # Ask user to select the country
-        country = input("Do you want to analyze stocks from 'US(us)' or 'India(india)'? ").strip().lower()
-        if country not in ['us', 'india']:
-            print("Invalid choice. Please enter either 'US' or 'India'.")
+        data = clean_and_prepare_data(data, provider_ticker(symbol, market))
+        if data is None or data.empty:
+            print(f"Insufficient or invalid data for {symbol}.")
             return
+        file_name = output.add(row, data)
+        print(f"Vector chart saved for {symbol} in {file_name}.")
+    except Exception as e:
+        print(f"Error saving vector chart for {symbol}: {e}")
+
+def fetch_results(symbols, start_date, interval, blacklist, end_date=None, rules=None, quarantine=None,
+                  histories=None):
+    """
+    Fetch and store each symbol's bars; returns (symbol, return, data) for those
+    with data in the window that pass the quality rules. Failing symbols go into
+    quarantine. If histories is given, bars are fetched from the earlier date
+    the indicators need and each symbol's full history is put into it.
+    """
+    fetch_start = indicator_start(start_date, interval) if histories is not None else start_date
+    frames = {}
+    fetched, missing = [], []
+    for symbol in symbols:
+        print(f"Processing {symbol}...")
+        ticker = provider_ticker(symbol, market)
+        data = fetch_stock_data(symbol, fetch_start, interval, end_date)
+        if data is None:
+            continue
+        if data.empty:
+            missing.append(ticker)
+            continue
+        fetched.append(ticker)
+        # Stores the bars and corporate actions, returns split-adjusted bars
+        data = ingest_download(ticker, interval, data)
+        if data is not None and histories is not None:
+            histories[symbol] = data
+            data = data.loc[start_date:]
+        if data is None or len(data) < 2:
+            print(f"Insufficient data for {symbol}.")
+            continue
+        frames[symbol] = data
+    # Failed requests, outages and windows too short to be sure never count against a ticker;
+    # weekdays are close enough to sessions for that
+    window_sessions = len(pd.bdate_range(fetch_start, end_date or pd.Timestamp.today()))
+    record_fetches(blacklist, fetched, missing, window_sessions)
+
+    # One pass over all fetched symbols keeps bad data out of the ranking and the charts
+    frames, failed = check_frames(frames, rules)
+    if quarantine is not None:
+        quarantine.update(failed)
+    results = []
+    for symbol, data in frames.items():
+        stock_return = calculate_return(data)
+        if stock_return is not None:
+            results.append((symbol, stock_return, data))
+    return results
+
+def score_results(results, benchmark, args, interval='1d', histories=None):
+    """
+    Score table of fetched results indexed by symbol: return, last bar, indicator
+    and relative-strength columns, filtered, with the ranking key in 'score'.
+    Indicators are computed over histories (the full fetched bars) when given.
+    Also returns the indicator matrices for the chart overlays.
+    """
+    scores = pd.DataFrame({'return': {symbol: stock_return for symbol, stock_return, _ in results},
+                           'last_bar': {symbol: last_bar(data) for symbol, _, data in results}},
+                          columns=['return', 'last_bar'])
+    if not results:
+        scores['score'] = pd.Series(dtype=float)
+        return scores, None
+    frames = {symbol: data for symbol, _, data in results}
+
+    # Indicators are computed once for all symbols and reused for filtering and overlays
+    indicators = None
+    if needs_indicators(args):
+        panel = build_panel({symbol: histories[symbol] for symbol in frames} if histories is not None else frames)
+        indicators = compute_indicators(panel, interval)
+        table = indicator_table(panel, indicators)
+        if args.rank_by and args.rank_by not in table.columns:
+            raise ValueError(f"Unknown indicator '{args.rank_by}'. Choose from: {', '.join(table.columns)}.")
+        if args.filter:
+            for column in empty_columns(table, args.filter):
+                print(f"Warning: {column} has no value for any symbol (too little history at '{interval}'), "
+                      f"so the filter drops every name.")
+            try:
+                table = apply_filter(table, args.filter)
+            except Exception as e:
+                raise ValueError(f"Invalid filter '{args.filter}': {e}")
+            print(f"{len(table)} of {len(results)} symbols pass the filter.")
+        scores = scores.join(table, how='inner')
+
+    if benchmark is not None:
+        rs_table = relative_strength(field_matrix(frames), benchmark['Close'])
+        scores = scores.join(rs_table[['excess_return', 'rs_return']])
+
+    if args.rank_by:
+        scores['score'] = scores[args.rank_by]
+    elif args.rs and benchmark is not None:
+        scores['score'] = scores['excess_return']
+    else:
+        scores['score'] = scores['return']
+    return scores.dropna(subset=['score']), indicators
+
+def needs_indicators(args):
+    """Whether the run filters, ranks or draws with the technical indicators."""
+    return bool(args.filter or args.mav or args.rank_by)
+
+def rank_in_chunks(symbols, start_date, interval, blacklist, benchmark, args, end_date=None, rules=None,
+                   quarantine=None):
+    """
+    Fetch and score args.chunk_size symbols at a time, spilling each batch's
+    score table to disk, and merge the batches into one table, best first.
+    Only one batch of price frames is ever held in memory.
+    """
+    with tempfile.TemporaryDirectory(prefix='bullfolio-scores-') as folder:
+        paths = []
+        for number, batch in enumerate(batches(symbols, args.chunk_size), start=1):
+            print(f"Batch {number}: {len(batch)} symbols.")
+            histories = {} if needs_indicators(args) else None
+            results = fetch_results(batch, start_date, interval, blacklist, end_date, rules, quarantine, histories)
+            scores, _ = score_results(results, benchmark, args, interval, histories)
+            if not scores.empty:
+                paths.append(spill_scores(scores, folder, number))
+        merged = pd.DataFrame(list(merge_scores(paths)))
+    if merged.empty:
+        return pd.DataFrame(columns=['return', 'last_bar', 'score'])
+    return merged.set_index('symbol')
+
+def load_chart_data(ticker, interval, start_date, end_date=None):
+    """Bars of one ranked symbol read back from the price store."""
+    history = load_frame(ticker, interval)
+    if history is None or history.empty:
+        return None
+    return history.loc[start_date:end_date]
 
-        # Set the exchange based on the selected country
-        if country == 'us':
-            suffix = ""  # US stocks don't need a suffix for yfinance
-            csv_file = 'us.csv'  # Replace with your US stock list CSV
-        elif country == 'india':
-            suffix = ".NS"
-            csv_file = 'india.csv'
+def parse_args(argv=None):
+    """Parse optional command-line flags; everything else is asked interactively."""
+    parser = argparse.ArgumentParser(description="Rank stocks by momentum and chart them.")
+    parser.add_argument('--lazy', action='store_true',
+                        help="Only score and rank; render charts on demand with python -m bullfolio.viewer.")
+    parser.add_argument('--rs', action='store_true',
+                        help="Rank by return in excess of the market benchmark instead of raw return.")
+    parser.add_argument('--rs-line', action='store_true',
+                        help="Draw the relative-strength line below each candle chart.")
+    parser.add_argument('--benchmark', help="Benchmark ticker (defaults to NIFTY 500 / S&P 500).")
+    parser.add_argument('--filter', help="Indicator filter, e.g. \"close > sma_200 and rsi > 60\". "
+                                         "Columns: close, sma_20, sma_50, sma_200, atr_pct, rsi, "
+                                         "dist_52w_high, dist_52w_low, volume_surge, up_volume_ratio.")
+    parser.add_argument('--mav', action='store_true', help="Draw the 20/50/200-bar moving averages on each chart.")
+    parser.add_argument('--volume', action='store_true', help="Show a volume panel below each chart.")
+    parser.add_argument('--rank-by', help="Rank by an indicator column (e.g. up_volume_ratio) instead of return.")
+    parser.add_argument('--composite', action='store_true',
+                        help="Rank by a weighted z-score of momentum, earnings yield, EPS growth, "
+                             "dividend yield and analyst rating from the market CSV.")
+    parser.add_argument('--weights', help="Composite weights, e.g. \"momentum=0.6,rating=0.2,eps_growth=0.2\".")
+    parser.add_argument('--top', type=int, help="Only chart the top N ranks.")
+    parser.add_argument('--chunk-size', type=int,
+                        help="Process the universe this many symbols at a time, spilling scores to disk, "
+                             "so memory stays flat for very large universes.")
+    parser.add_argument('--output', choices=sorted(OUTPUTS) + sorted(VECTOR_OUTPUTS), default='png',
+                        help="png: one image per rank (default); html: single report.html; pdf: report.pdf chart "
+                             "book; svg: one vector <rank>.svg per rank; canvas: charts.html drawn by the browser. "
+                             "svg and canvas skip matplotlib and draw candles only.")
+    parser.add_argument('--quality-rules',
+                        help="Override data-quality rules, e.g. \"max_bar_change=0.8,max_stale_days=30\" (0 turns a "
+                             "rule off). Rules: positive_prices, unique_dates, min_bars, max_bar_change, max_stale_days.")
+    parser.add_argument('--no-open', action='store_true', help="Do not open the charts when the run finishes.")
+    parser.add_argument('--delta', action='store_true',
+                        help="Compare with the previous run in the same folder, report entries, exits and "
+                             "movers, and only re-render charts that changed.")
+    return parser.parse_args(argv)
 
+def main():
+    """Main function to execute the script."""
+    args = parse_args()
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        print(e)
+        return
+    try:
+        # Ask user to select the countries; several are screened side by side
+        try:
+            countries = parse_markets(input("Do you want to analyze stocks from 'US(us)' or 'India(india)' "
+                                            "(several as 'india,us', or 'all')? "))
+        except ValueError as e:
+            print(e)
+            return
 
-        duration_type = input("Do you want to enter the duration in 'weeks' or 'months'? ").strip().lower()
-        if duration_type not in ['weeks', 'months']:
-            print("Invalid choice. Please enter either 'weeks' or 'months'.")
+        duration_type = input("Do you want to enter the duration in trading 'sessions', 'weeks' or 'months'? ").strip().lower()
+        if duration_type not in DURATION_TYPES:
+            print("Invalid choice. Please enter 'sessions', 'weeks' or 'months'.")
             return
 
         duration = int(input(f"Enter the number of {duration_type} for historical data: "))
+        if duration < 1:
+            raise ValueError(duration)
         interval = input("Enter the data interval (e.g., '1d' for daily, '1wk' for weekly, '1mo' for monthly): ").strip()
-
-        if duration_type == 'weeks':
-            start_date = (datetime.now() - timedelta(weeks=duration)).strftime('%Y-%m-%d')
-        elif duration_type == 'months':
-            start_date = (datetime.now() - timedelta(days=duration * 30)).strftime('%Y-%m-%d')
-
-        print(f"Fetching data from {start_date} with interval '{interval}'.")
     except ValueError:
         print("Invalid input. Please enter valid numbers and interval.")
         return
+    if len(countries) == 1:
+        run_screen(args, weights, countries[0], duration_type, duration, interval)
+    else:
+        run_markets(args, weights, countries, duration_type, duration, interval)
+
+def screen_name(args, duration, duration_type, interval):
+    """Name the rank history is kept under: the window, interval and ranking key of the screen."""
+    name = f"momentum-{duration}{duration_type}{interval}"
+    if args.composite:
+        name += '-composite'
+    elif args.rank_by:
+        name += f"-{args.rank_by}"
+    elif args.rs:
+        name += '-rs'
+    return name
+
+def run_markets(args, weights, countries, duration_type, duration, interval):
+    """
+    Screen several markets at once, one worker process per market (each with its
+    own suffix, benchmark and fetch rate limit), into <folder>/<market>, and
+    combine their manifests into <folder>/markets.json.
+    """
+    if args.benchmark:
+        print("--benchmark applies to a single market; each market uses its own benchmark.")
+        return
+    folder = f"{duration}{duration_type}{interval}"
+    os.makedirs(folder, exist_ok=True)
+    market_args = argparse.Namespace(**dict(vars(args), no_open=True))
+    manifests = {}
+    with ProcessPoolExecutor(max_workers=len(countries)) as pool:
+        futures = {country: pool.submit(run_screen, market_args, weights, country, duration_type, duration,
+                                        interval, os.path.join(folder, country))
+                   for country in countries}
+        for country, future in futures.items():
+            try:
+                manifest = future.result()
+            except Exception as e:
+                print(f"Screen for {country} failed: {e}")
+                continue
+            if manifest is not None:
+                manifests[country] = manifest
+    if not manifests:
+        return
+    write_markets_manifest(folder, {'script': 'Momentum', 'interval': interval,
+                                    'duration': f"{duration} {duration_type}"}, manifests)
+    # Each worker pointed latest_run.json at its own market; settle on the first market asked for
+    first = next(country for country in countries if country in manifests)
+    write_latest_run(os.path.join(folder, first))
+    for country, manifest in manifests.items():
+        print(f"{country}: {len(manifest['ranks'])} ranked symbols in {os.path.join(folder, country)}.")
+    print(f"Tools run without a folder (viewer, sectors, basket, ...) use {os.path.join(folder, first)}.")
+    if not args.no_open:
+        open_path(folder)
+
+def run_screen(args, weights, country, duration_type, duration, interval, folder=None):
+    """
+    Run one screen non-interactively and return its manifest; main() asks for the
+    inputs, the daemon receives them. folder overrides the default run folder.
+    """
+    global market, csv_file, GRAPH_FOLDER
+    # Set the exchange based on the selected country
+    market = country
+    csv_file = MARKETS[country]['csv_file']
+    # The window ends at the last closed session, so reruns before the next close resolve the same dates
+    start_date, end_date = trading_window(country, duration_type, duration)
+    print(f"Fetching data from {start_date} to {end_date} with interval '{interval}'.")
 
-    GRAPH_FOLDER = f"{duration}{duration_type}{interval}"
-    if os.path.exists(GRAPH_FOLDER):
+    GRAPH_FOLDER = folder or f"{duration}{duration_type}{interval}"
+    previous = None
+    if args.delta and os.path.isdir(GRAPH_FOLDER):
+        previous = read_manifest(GRAPH_FOLDER)
+        # Outputs of earlier runs with other flags must not sit next to the new results
+        clear_previous_outputs(GRAPH_FOLDER, keep_charts=args.output == 'png')
+    elif os.path.exists(GRAPH_FOLDER):
         shutil.rmtree(GRAPH_FOLDER)
-    os.makedirs(GRAPH_FOLDER)
+    os.makedirs(GRAPH_FOLDER, exist_ok=True)
 
-    symbols = read_csv_and_get_symbols(csv_file)
+    # Chunked runs read the whole list; they are meant for universes beyond the usual cap
+    symbols = read_csv_and_get_symbols(csv_file, limit=None if args.chunk_size else SYMBOL_LIMIT)
     if not symbols:
         return
 
-    results = []
-    for symbol in symbols:
-        print(f"Processing {symbol}...")
-        data = fetch_stock_data(symbol, start_date, interval)
-        if data is not None:
-            stock_return = calculate_return(data)
-            if stock_return is not None:
-                results.append((symbol, stock_return, data))
+    # Tickers that keep failing are skipped for a while instead of costing a fetch every run
+    blacklist = load_blacklist(market)
+    skipped = {symbol for symbol in symbols if is_blacklisted(blacklist, provider_ticker(symbol, market))}
+    if skipped:
+        print(f"Skipping {len(skipped)} blacklisted symbols (python -m bullfolio.universe --blacklist).")
+        symbols = [symbol for symbol in symbols if symbol not in skipped]
+
+    # The benchmark is fetched once and compared against all symbols in one pass
+    benchmark = None
+    benchmark_ticker = args.benchmark or MARKETS[country]['benchmark']
+    if args.rs or args.rs_line:
+        benchmark = fetch_benchmark(benchmark_ticker, start_date, interval, end_date)
+        if benchmark is None:
+            print("Continuing without relative strength.")
+        else:
+            save_frame(benchmark_ticker, interval, benchmark)
+
+    results = None
+    indicators = None
+    quarantine = {}
+    try:
+        rules = parse_rules(args.quality_rules, interval)
+        if args.chunk_size:
+            scores = rank_in_chunks(symbols, start_date, interval, blacklist, benchmark, args, end_date, rules,
+                                    quarantine)
+        else:
+            histories = {} if needs_indicators(args) else None
+            results = fetch_results(symbols, start_date, interval, blacklist, end_date, rules, quarantine, histories)
+            scores, indicators = score_results(results, benchmark, args, interval, histories)
+            scores = scores.sort_values('score', ascending=False, kind='stable')
+    except ValueError as e:
+        print(e)
+        return
+    finally:
+        save_blacklist(blacklist, market)
+    print_quarantine(quarantine)
+    if needs_indicators(args):
+        scores.to_csv(os.path.join(GRAPH_FOLDER, 'indicators.csv'))
+
+    # Fundamentals from the market CSV are joined to the momentum scores in one merge
+    composite = None
+    if args.composite and not scores.empty:
+        composite = composite_scores(scores['score'], csv_file, weights)
+        composite.to_csv(os.path.join(GRAPH_FOLDER, 'composite.csv'))
+        scores = scores.loc[composite.index]
+        scores['score'] = composite['composite']
+
+    rows = []
+    for rank, (symbol, score) in enumerate(scores.iterrows(), start=1):
+        ticker = provider_ticker(symbol, market)
+        row = {'rank': rank, 'symbol': symbol, 'ticker': ticker, 'score': score['score'], 'return': score['return'],
+               'last_bar': score['last_bar']}
+        excess_return = None
+        if 'excess_return' in scores.columns and pd.notna(score['excess_return']):
+            excess_return = score['excess_return']
+            row['excess_return'] = excess_return
+            row['rs_return'] = score['rs_return']
+        row['title'] = chart_title(symbol, score['return'], excess_return)
+        if composite is not None:
+            row['title'] += f" | Composite z: {row['score']:+.2f}"
+        rows.append(row)
+    meta = {'script': 'Momentum', 'screen': screen_name(args, duration, duration_type, interval),
+            'market': country, 'currency': MARKETS[country]['currency'],
+            'interval': interval, 'start_date': start_date, 'end_date': end_date,
+            'benchmark': benchmark_ticker if benchmark is not None else None,
+            'rs_line': args.rs_line and benchmark is not None,
+            'mav': args.mav, 'filter': args.filter, 'volume': args.volume, 'rank_by': args.rank_by,
+            'composite_weights': weights if composite is not None else None, 'quarantine': quarantine}
+    manifest = write_manifest(GRAPH_FOLDER, meta, rows)
+    # The full rank table is kept per session, so rank and breadth history never needs rebuilding from prices.
+    # A filtered table is only a subset of the universe and would skew both, so it is not kept.
+    if rows and args.filter:
+        print("Filtered runs are not added to the rank history.")
+    elif rows:
+        try:
+            record_run(country, meta['screen'], end_date,
+                       pd.DataFrame({'symbol': scores.index, 'rank': range(1, len(scores) + 1),
+                                     'score': scores['score'].to_numpy(), 'return': scores['return'].to_numpy()}))
+        except ImportError:
+            print("Install pyarrow to keep the rank history (pip install pyarrow).")
+
+    # Unchanged charts of the previous run are renamed to their new rank instead of redrawn
+    reuse = {}
+    if args.delta:
+        if previous is not None:
+            print_report(rank_changes(previous['ranks'], rows))
+        if args.output == 'png':
+            reuse = reusable_charts(GRAPH_FOLDER, previous, meta, rows[:args.top])
+            relink_charts(GRAPH_FOLDER, reuse)
+            print(f"Reusing {len(reuse)} unchanged charts.")
 
-    results.sort(key=lambda x: x[1], reverse=True)
+    if composite is not None:
+        score_label = ' composite z-score'
+    elif args.rank_by:
+        score_label = f" {args.rank_by}"
+    else:
+        score_label = '% excess return' if args.rs and benchmark is not None else '% return'
+    if args.lazy:
+        for row in rows:
+            print(f"{row['rank']}. {row['symbol']}: {row['score']:.2f}{score_label}")
+        print(f"Charts will be rendered on demand. Run: python -m bullfolio.viewer \"{GRAPH_FOLDER}\"")
+        return manifest
 
-    for rank, (symbol, stock_return, data) in enumerate(results, start=1):
-        save_candlestick_chart(data, symbol, rank, stock_return)
-        print(f"{rank}. {symbol}: {stock_return:.2f}% return")
+    benchmark_close = benchmark['Close'] if args.rs_line and benchmark is not None else None
+    mav_indicators = indicators if args.mav else None
+    frames = {symbol: data for symbol, _, data in results} if results is not None else None
+    output_class = VECTOR_OUTPUTS.get(args.output) or OUTPUTS[args.output]
+    output = output_class(GRAPH_FOLDER, {key: value for key, value in manifest.items() if key != 'ranks'})
+    for row in rows[:args.top]:
+        symbol = row['symbol']
+        if row['rank'] in reuse:
+            print(f"{row['rank']}. {symbol}: {row['score']:.2f}{score_label} (unchanged)")
+            continue
+        if frames is not None:
+            data = frames[symbol]
+        else:
+            # Chunked runs kept no frames in memory; read the winner back from the store
+            data = load_chart_data(row['ticker'], interval, start_date, end_date)
+            if data is None:
+                print(f"No stored data for {symbol}.")
+                continue
+            if args.mav:
+                history = load_chart_data(row['ticker'], interval, indicator_start(start_date, interval), end_date)
+                mav_indicators = compute_indicators(build_panel({symbol: history}), interval)
+        if args.output in VECTOR_OUTPUTS:
+            save_vector_chart(output, data, row)
+        else:
+            addplot = build_addplots(data, symbol, benchmark_close, mav_indicators, args.volume)
+            save_candlestick_chart(output, data, row, addplot, args.volume)
+        print(f"{row['rank']}. {symbol}: {row['score']:.2f}{score_label}")
+    output_path = output.close()
+    if not args.no_open:
+        open_path(output_path)
+    return manifest
 
+def open_path(path):
+    """Open a run's charts with the system's default application."""
     try:
         if os.name == 'nt':
-            os.startfile(GRAPH_FOLDER)
+            os.startfile(path)
         elif os.name == 'posix':
-            os.system(f'open "{GRAPH_FOLDER}"' if 'darwin' in os.uname().sysname.lower() else f'xdg-open "{GRAPH_FOLDER}"')
+            os.system(f'open "{path}"' if 'darwin' in os.uname().sysname.lower() else f'xdg-open "{path}"')
     except Exception as e:
-        print(f"Error opening folder: {e}")
+        print(f"Error opening {path}: {e}")
 
 if __name__ == "__main__":
     main()
@@ -1,51 +1,31 @@
 import pandas as pd
-import yfinance as yf
-import mplfinance as mpf
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 import os
 import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bullfolio.calendars import DURATION_TYPES, download_end, trading_window
+from bullfolio.charts import clean_and_prepare_data, render_candlestick_chart
+from bullfolio.chunks import batches
+from bullfolio.manifest import write_manifest, write_markets_manifest
+from bullfolio.markets import MARKETS, parse_markets, throttle
+from bullfolio.matrix import field_matrix
+from bullfolio.quality import check_frames, check_highs, print_quarantine
+from bullfolio.store import ingest_download
+from bullfolio.universe import is_blacklisted, load_blacklist, provider_ticker, record_fetches, save_blacklist
 
 # Constants
 GRAPH_FOLDER = 'graph_custom'
+BATCH_SIZE = 50  # tickers per yfinance request
+FETCH_THREADS = 8  # tickers of a batch downloaded at the same time
+# Chart intervals that can be built from daily history; others are fetched separately
+RESAMPLE_RULES = {'1d': None, '5d': '5B', '1wk': 'W-MON', '1mo': 'MS', '3mo': 'QS'}
 
-suffix = ""
+market = ""
 csv_file = ""
 
-# Binance Dark Theme
-binance_dark = {
-    "base_mpl_style": "dark_background",
-    "marketcolors": {
-        "candle": {"up": "#3dc985", "down": "#ef4f60"},
-        "edge": {"up": "#3dc985", "down": "#ef4f60"},
-        "wick": {"up": "#3dc985", "down": "#ef4f60"},
-        "ohlc": {"up": "green", "down": "red"},
-        "volume": {"up": "#247252", "down": "#82333f"},
-        "vcedge": {"up": "green", "down": "red"},
-        "vcdopcod": False,
-        "alpha": 1,
-    },
-    "mavcolors": ("#ad7739", "#a63ab2", "#62b8ba"),
-    "facecolor": "#1b1f24",
-    "gridcolor": "#2c2e31",
-    "gridstyle": "--",
-    "y_on_right": True,
-    "rc": {
-        "axes.grid": True,
-        "axes.grid.axis": "y",
-        "axes.edgecolor": "#474d56",
-        "axes.titlecolor": "red",
-        "figure.facecolor": "#161a1e",
-        "figure.titlesize": 10,   # Reduced title size
-        "figure.titleweight": "semibold",
-        "axes.labelsize": 5,      # Reduced label size
-        "axes.titlesize": 8,      # Reduced axes title size
-        "xtick.labelsize": 5,     # Reduced x-axis tick label size
-        "ytick.labelsize": 5,     # Reduced y-axis tick label size
-    },
-    "base_mpf_style": "binance-dark",
-}
-
-
 def read_csv_and_get_symbols(file_path):
     """Read CSV and extract stock symbols."""
     try:
@@ -62,11 +42,14 @@ def read_csv_and_get_symbols(file_path):
         return []
 
 
-def fetch_stock_data(symbol, start_date, interval):
+def fetch_stock_data(symbol, start_date, interval, end_date=None):
     """Fetch historical stock data for the given symbol and time period for charting."""
+    import yfinance as yf
+
     try:
-        symbol_with_suffix = f"{symbol}{suffix}"
-        data = yf.download(symbol_with_suffix, start=start_date, interval=interval)
+        throttle(market)
+        data = yf.download(provider_ticker(symbol, market), start=start_date, end=end_date and download_end(end_date),
+                           interval=interval, auto_adjust=False, actions=True)
         if data.empty or len(data) < 2:
             print(f"Insufficient data for {symbol}.")
             return None
@@ -76,58 +59,88 @@ def fetch_stock_data(symbol, start_date, interval):
         return None
 
 
-def get_all_time_high(symbol):
+def fetch_history_batch(symbols):
     """
-    Fetch the full historical data for the symbol and return the maximum closing price.
-    This value is treated as the all‐time high.
+    Download the full daily history of a batch of symbols in one request, store
+    it and return the split-adjusted bars of every symbol that had data, the
+    tickers the provider returned bars for and those it returned none for.
     """
+    import yfinance as yf
+
+    tickers = {provider_ticker(symbol, market): symbol for symbol in symbols}
     try:
-        symbol_with_suffix = f"{symbol}{suffix}"
-        ticker = yf.Ticker(symbol_with_suffix)
-        full_data = ticker.history(period="max")
-        if full_data.empty or 'Close' not in full_data.columns:
-            print(f"No full historical data for {symbol}.")
-            return None
-        return full_data["Close"].max()
+        throttle(market)
+        data = yf.download(list(tickers), period="max", interval='1d', auto_adjust=False, actions=True,
+                           group_by='ticker', threads=FETCH_THREADS, progress=False)
     except Exception as e:
-        print(f"Error fetching full historical data for {symbol}: {e}")
-        return None
-
+        print(f"Error fetching full historical data for {', '.join(symbols)}: {e}")
+        return {}, [], []
 
-def clean_and_prepare_data(data, symbol):
-    """Clean and prepare the data for mplfinance."""
-    try:
-        # If data has MultiIndex columns, flatten them
+    frames = {}
+    fetched, missing = [], []
+    for ticker, symbol in tickers.items():
         if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.map('_'.join).str.strip()
-
-        # Create a mapping for expected column names
-        column_mapping = {
-            f"Close_{symbol}{suffix}": 'Close',
-            f'High_{symbol}{suffix}': 'High',
-            f'Low_{symbol}{suffix}': 'Low',
-            f'Open_{symbol}{suffix}': 'Open',
-            f'Volume_{symbol}{suffix}': 'Volume',
-        }
-        data = data.rename(columns=column_mapping)
-
-        required_columns = ['Open', 'High', 'Low', 'Close']
-        if not all(col in data.columns for col in required_columns):
-            raise KeyError(f"Required columns {required_columns} not found in data.")
-
-        # Ensure numeric conversion and drop any rows with missing values
-        data = data[required_columns].apply(pd.to_numeric, errors='coerce').dropna()
-        data.index = pd.to_datetime(data.index)
-        return data
-    except Exception as e:
-        print(f"Error cleaning and preparing data for {symbol}: {e}")
+            if ticker not in data.columns.get_level_values(0):
+                missing.append(ticker)
+                continue
+            ticker_data = data[ticker].dropna(how='all')
+        else:
+            ticker_data = data
+        if ticker_data.empty or 'Close' not in ticker_data.columns:
+            missing.append(ticker)
+            continue
+        fetched.append(ticker)
+        ticker_data = ingest_download(ticker, '1d', ticker_data)
+        if ticker_data is not None and len(ticker_data) >= 2:
+            frames[symbol] = ticker_data
+    return frames, fetched, missing
+
+
+def fetch_full_histories(symbols, batch_size=BATCH_SIZE):
+    """
+    Full daily history of every symbol keyed by symbol, with the tickers that
+    returned bars and those that returned none. Batches run one after another
+    (yfinance collects a download in module-level state), the tickers within a
+    batch concurrently.
+    """
+    frames = {}
+    fetched, missing = [], []
+    for batch in batches(symbols, batch_size):
+        batch_frames, batch_fetched, batch_missing = fetch_history_batch(batch)
+        frames.update(batch_frames)
+        fetched += batch_fetched
+        missing += batch_missing
+    return frames, fetched, missing
+
+
+def ath_ratios(frames):
+    """
+    All-time high (maximum split-adjusted close), current price and their ratio
+    for every symbol, computed across all symbols at once.
+    """
+    closes = field_matrix(frames, 'Close')
+    table = pd.DataFrame({'all_time_high': closes.max(), 'current_price': closes.ffill().iloc[-1]})
+    table['ath_ratio'] = table['current_price'] / table['all_time_high']
+    return table.dropna().sort_values('ath_ratio', ascending=False, kind='stable')
+
+
+def chart_window(history, start_date, end_date, interval):
+    """The chart bars from start_date to end_date, built from daily history, or None if interval needs its own fetch."""
+    if interval not in RESAMPLE_RULES:
         return None
+    window = history.loc[start_date:end_date]
+    rule = RESAMPLE_RULES[interval]
+    if rule is None:
+        return window
+    aggregation = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    aggregation = {column: how for column, how in aggregation.items() if column in window.columns}
+    return window.resample(rule, label='left', closed='left').agg(aggregation).dropna(subset=['Close'])
 
 
 def save_candlestick_chart(data, symbol, rank, ath_ratio, all_time_high):
     """Save the candlestick chart with a title showing the ATH ratio."""
     try:
-        cleaned_data = clean_and_prepare_data(data, symbol)
+        cleaned_data = clean_and_prepare_data(data, provider_ticker(symbol, market))
         if cleaned_data is None or cleaned_data.empty:
             print(f"Insufficient or invalid data for {symbol}.")
             return
@@ -135,108 +148,153 @@ def save_candlestick_chart(data, symbol, rank, ath_ratio, all_time_high):
         file_name = os.path.join(GRAPH_FOLDER, f"{rank}.png")
         title = (f"{symbol} - Trading at {ath_ratio * 100:.2f}% of its All-Time High "
                  f"(ATH: {all_time_high:.2f})")
-        mpf.plot(
-            cleaned_data,
-            type='candle',
-            style=binance_dark,
-            title=title,
-            ylabel='Price',
-            savefig=dict(fname=file_name, dpi=300, bbox_inches='tight'),
-            figratio=(20, 9),
-            figscale=0.8,
-        )
+        render_candlestick_chart(cleaned_data, file_name, title)
         print(f"Candlestick chart saved for {symbol} as {file_name}.")
     except Exception as e:
         print(f"Error saving candlestick chart for {symbol}: {e}")
 
 
 def main():
-    global suffix, csv_file, GRAPH_FOLDER
     """Main function to execute the script."""
     try:
-        # Ask user to select the country
-        country = input("Do you want to analyze stocks from 'US(us)' or 'India(india)'? ").strip().lower()
-        if country not in ['us', 'india']:
-            print("Invalid choice. Please enter either 'US' or 'India'.")
+        # Ask user to select the countries; several are screened side by side
+        try:
+            countries = parse_markets(input("Do you want to analyze stocks from 'US(us)' or 'India(india)' "
+                                            "(several as 'india,us', or 'all')? "))
+        except ValueError as e:
+            print(e)
             return
 
-        # Set the exchange details based on the selected country
-        if country == 'us':
-            suffix = ""        # US stocks typically don't require a suffix for yfinance
-            csv_file = 'us.csv'  # Replace with your US stock list CSV
-        elif country == 'india':
-            suffix = ".NS"
-            csv_file = 'india.csv'  # Replace with your India stock list CSV
-
         # Ask user for the time period and interval for the candlestick chart
-        duration_type = input("Do you want to enter the duration in 'weeks' or 'months'? ").strip().lower()
-        if duration_type not in ['weeks', 'months']:
-            print("Invalid choice. Please enter either 'weeks' or 'months'.")
+        duration_type = input("Do you want to enter the duration in trading 'sessions', 'weeks' or 'months'? ").strip().lower()
+        if duration_type not in DURATION_TYPES:
+            print("Invalid choice. Please enter 'sessions', 'weeks' or 'months'.")
             return
 
         duration = int(input(f"Enter the number of {duration_type} for historical data: "))
+        if duration < 1:
+            raise ValueError(duration)
         interval = input("Enter the data interval (e.g., '1d' for daily, '1wk' for weekly, '1mo' for monthly): ").strip()
+    except ValueError:
+        print("Invalid input. Please enter valid numbers and interval.")
+        return
 
-        # Calculate the start date based on the duration type
-        if duration_type == 'weeks':
-            start_date = (datetime.now() - timedelta(weeks=duration)).strftime('%Y-%m-%d')
-        elif duration_type == 'months':
-            start_date = (datetime.now() - timedelta(days=duration * 30)).strftime('%Y-%m-%d')
+    if len(countries) == 1:
+        run_screen(countries[0], duration_type, duration, interval)
+    else:
+        run_markets(countries, duration_type, duration, interval)
 
-        print(f"Fetching chart data from {start_date} with interval '{interval}'.")
 
-    except ValueError:
-        print("Invalid input. Please enter valid numbers and interval.")
+def run_markets(countries, duration_type, duration, interval):
+    """
+    Screen several markets at once, one worker process per market, into
+    <folder>/<market>, and combine their rankings into <folder>/markets.json.
+    """
+    folder = f"{duration}{duration_type}{interval}"
+    os.makedirs(folder, exist_ok=True)
+    rankings = {}
+    with ProcessPoolExecutor(max_workers=len(countries)) as pool:
+        futures = {country: pool.submit(run_screen, country, duration_type, duration, interval,
+                                        os.path.join(folder, country), False)
+                   for country in countries}
+        for country, future in futures.items():
+            try:
+                ranking = future.result()
+            except Exception as e:
+                print(f"Screen for {country} failed: {e}")
+                continue
+            if ranking is not None:
+                rankings[country] = ranking
+    if not rankings:
         return
+    write_markets_manifest(folder, {'script': 'ATH', 'interval': interval,
+                                    'duration': f"{duration} {duration_type}"}, rankings)
+    for country, ranking in rankings.items():
+        print(f"{country}: {len(ranking['ranks'])} ranked symbols in {os.path.join(folder, country)}.")
+    open_folder(folder)
+
+
+def run_screen(country, duration_type, duration, interval, folder=None, open_charts=True):
+    """Rank one market by closeness to the all-time high and chart it; returns the run manifest."""
+    global market, csv_file, GRAPH_FOLDER
+    # Set the exchange details based on the selected country
+    market = country
+    csv_file = MARKETS[country]['csv_file']
+    # The window ends at the last closed session, so reruns before the next close resolve the same dates
+    start_date, end_date = trading_window(country, duration_type, duration)
+    print(f"Fetching chart data from {start_date} to {end_date} with interval '{interval}'.")
 
     # Create a unique folder for saving the charts based on the chosen period and interval
-    GRAPH_FOLDER = f"{duration}{duration_type}{interval}"
+    GRAPH_FOLDER = folder or f"{duration}{duration_type}{interval}"
     if os.path.exists(GRAPH_FOLDER):
         shutil.rmtree(GRAPH_FOLDER)
     os.makedirs(GRAPH_FOLDER)
 
     symbols = read_csv_and_get_symbols(csv_file)
     if not symbols:
-        return
-
-    results = []
-    # Process each symbol: fetch chart data and calculate how close it is trading to its all-time high.
-    for symbol in symbols:
-        print(f"Processing {symbol}...")
-        chart_data = fetch_stock_data(symbol, start_date, interval)
-        if chart_data is not None:
-            # Get the full historical data to calculate the all-time high
-            all_time_high = get_all_time_high(symbol)
-            if all_time_high is None:
-                continue
-            # Convert the values to float to ensure they are scalars
-            try:
-                current_price = float(chart_data['Close'].iloc[-1])
-                all_time_high_val = float(all_time_high)
-            except Exception as e:
-                print(f"Error converting price data for {symbol}: {e}")
-                continue
+        return None
 
-            # Calculate the ratio (current price / all-time high)
-            ath_ratio = current_price / all_time_high_val
-            results.append((symbol, ath_ratio, chart_data, all_time_high_val))
+    # Tickers that keep failing are skipped for a while instead of costing a fetch every run
+    blacklist = load_blacklist(market)
+    skipped = {symbol for symbol in symbols if is_blacklisted(blacklist, provider_ticker(symbol, market))}
+    if skipped:
+        print(f"Skipping {len(skipped)} blacklisted symbols (python -m bullfolio.universe --blacklist).")
+        symbols = [symbol for symbol in symbols if symbol not in skipped]
 
-    # Sort symbols by the ATH ratio in descending order (closest to ATH first)
-    results.sort(key=lambda x: x[1], reverse=True)
+    # One full-history download per symbol, in concurrent batches, serves both the ATH and the chart
+    print(f"Fetching full history for {len(symbols)} symbols...")
+    histories, fetched, missing = fetch_full_histories(symbols)
+    for symbol in symbols:
+        if symbol not in histories:
+            print(f"Insufficient data for {symbol}.")
+    # Only tickers the provider answered for with no bars count; failed requests and outages do not
+    record_fetches(blacklist, fetched, missing)
+    save_blacklist(blacklist, market)
+
+    # Closest to the all-time high first, as of the last complete session. Large one-bar moves only
+    # count inside the window or where they make the high: decades of history hold genuine jumps
+    histories = {symbol: history.loc[:end_date] for symbol, history in histories.items()}
+    histories, quarantine = check_frames(histories, moves_since=start_date)
+    histories, spikes = check_highs(histories)
+    quarantine.update(spikes)
+    print_quarantine(quarantine)
+    table = ath_ratios(histories)
 
     # Save the candlestick charts with ranking numbers
-    for rank, (symbol, ath_ratio, chart_data, all_time_high) in enumerate(results, start=1):
-        save_candlestick_chart(chart_data, symbol, rank, ath_ratio, all_time_high)
-        print(f"{rank}. {symbol}: Trading at {ath_ratio * 100:.2f}% of its All-Time High")
-
-    # Attempt to open the folder containing the charts
+    rows = []
+    for rank, (symbol, row) in enumerate(table.iterrows(), start=1):
+        chart_data = chart_window(histories[symbol], start_date, end_date, interval)
+        if chart_data is None:
+            chart_data = fetch_stock_data(symbol, start_date, interval, end_date)
+            if chart_data is not None:
+                chart_data = ingest_download(provider_ticker(symbol, market), interval, chart_data)
+        if chart_data is None or len(chart_data) < 2:
+            print(f"Insufficient chart data for {symbol}.")
+        else:
+            save_candlestick_chart(chart_data, symbol, rank, row['ath_ratio'], row['all_time_high'])
+        print(f"{rank}. {symbol}: Trading at {row['ath_ratio'] * 100:.2f}% of its All-Time High")
+        rows.append({'rank': rank, 'symbol': symbol, 'ticker': provider_ticker(symbol, market),
+                     'ath_ratio': row['ath_ratio'], 'all_time_high': row['all_time_high']})
+
+    # The viewer and the other tools read momentum runs, so an ATH run does not become the latest run
+    manifest = write_manifest(GRAPH_FOLDER, {'script': 'ATH', 'market': country,
+                                             'currency': MARKETS[country]['currency'], 'interval': interval,
+                                             'start_date': start_date, 'end_date': end_date,
+                                             'quarantine': quarantine}, rows, latest=False)
+    if open_charts:
+        open_folder(GRAPH_FOLDER)
+    return manifest
+
+
+def open_folder(folder):
+    """Attempt to open the folder containing the charts."""
     try:
         if os.name == 'nt':
-            os.startfile(GRAPH_FOLDER)
+            os.startfile(folder)
         elif os.name == 'posix':
             # For macOS or Linux
             opener = 'open' if 'darwin' in os.uname().sysname.lower() else 'xdg-open'
-            os.system(f'{opener} "{GRAPH_FOLDER}"')
+            os.system(f'{opener} "{folder}"')
     except Exception as e:
         print(f"Error opening folder: {e}")
 
@@ -0,0 +1,82 @@
+"""
+Per-chart render time: a fresh mplfinance figure per chart (the previous code
+path) against the reused chart templates in bullfolio.charts.
+
+    python benchmarks/chart_render.py [--charts 20] [--bars 250] [--volume]
+
+Charts are drawn from synthetic random-walk bars so the numbers do not depend
+on the price store or the network. Medians are reported because the first
+charts also pay for font loading.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib.pyplot as plt  # noqa: E402
+import mplfinance as mpf  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bullfolio.charts import SAVE_OPTIONS, binance_dark, render_candlestick_chart  # noqa: E402
+
+
+def synthetic_bars(seed, bars):
+    """Random-walk OHLCV bars ending today."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    open_ = close * np.exp(rng.normal(0, 0.01, bars))
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=bars)
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * 1.01,
+        'Low': np.minimum(open_, close) * 0.99,
+        'Close': close,
+        'Volume': rng.integers(10_000, 1_000_000, bars),
+    }, index=index)
+
+
+def legacy_render(data, file_name, title, volume):
+    """One chart the way it was drawn before templates: a new figure each time."""
+    figure, _ = mpf.plot(data, type='candle', style=binance_dark, title=title, ylabel='Price',
+                         volume=volume, figratio=(20, 9), figscale=0.8, returnfig=True)
+    figure.savefig(file_name, **SAVE_OPTIONS)
+    plt.close(figure)
+
+
+def time_charts(render, charts, bars, volume, folder):
+    """Seconds taken by each chart."""
+    timings = []
+    for number in range(charts):
+        data = synthetic_bars(number, bars)
+        file_name = os.path.join(folder, f"{number}.png")
+        started = time.perf_counter()
+        render(data, file_name, f"SYMBOL{number}", volume)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-chart render times.")
+    parser.add_argument('--charts', type=int, default=20)
+    parser.add_argument('--bars', type=int, default=250)
+    parser.add_argument('--volume', action='store_true')
+    args = parser.parse_args()
+
+    def template_render(data, file_name, title, volume):
+        render_candlestick_chart(data, file_name, title, volume=volume)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name, render in (('fresh figure', legacy_render), ('template', template_render)):
+            timings = time_charts(render, args.charts, args.bars, args.volume, folder)
+            print(f"{name:>12}: median {statistics.median(timings) * 1000:.0f} ms, "
+                  f"first {timings[0] * 1000:.0f} ms, total {sum(timings):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared helpers for the BullfolioGraphs screening scripts."""
@@ -0,0 +1,103 @@
+"""
+Corporate-action adjustment layer.
+
+The price store keeps bars as they traded (unadjusted) next to a table of
+split and dividend events per ticker. Cumulative adjustment factors are
+computed from the events and applied on read, so cached history stays valid
+when a split or bonus issue happens later: only the event is recorded, the
+bars never need to be downloaded again.
+
+Yahoo returns prices already adjusted for the splits it knows about at
+download time, so downloads are un-adjusted with the splits contained in the
+same download before they are stored.
+"""
+import numpy as np
+import pandas as pd
+
+ACTION_COLUMNS = ['Dividends', 'Stock Splits']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+def extract_actions(data, ticker):
+    """Split and dividend events contained in a yfinance frame, indexed by date."""
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.map('_'.join).str.strip()
+        data = data.rename(columns={f"{column}_{ticker}": column for column in ACTION_COLUMNS})
+
+    actions = pd.DataFrame(index=pd.to_datetime(data.index))
+    for column in ACTION_COLUMNS:
+        values = data[column] if column in data.columns else 0.0
+        actions[column] = pd.to_numeric(pd.Series(values, index=data.index), errors='coerce').fillna(0).to_numpy()
+    return actions[(actions != 0).any(axis=1)]
+
+
+def naive(index):
+    """Timezone-free copy of a DatetimeIndex, so daily and intraday dates compare."""
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def cumulative_factors(index, event_dates, event_factors):
+    """
+    For every bar in index, the product of the factors of all events dated
+    strictly after it (an event applies to the bars before its ex-date).
+    """
+    if len(event_dates) == 0:
+        return np.ones(len(index))
+    order = np.argsort(event_dates)
+    event_dates = np.asarray(event_dates)[order]
+    event_factors = np.asarray(event_factors, dtype=float)[order]
+    # Product of this event's factor and every later one, plus 1.0 for "no later event"
+    after = np.append(np.cumprod(event_factors[::-1])[::-1], 1.0)
+    positions = np.searchsorted(event_dates, naive(index).values, side='right')
+    return after[positions]
+
+
+def split_factors(index, actions):
+    """Cumulative split ratio still to come for every bar."""
+    splits = actions['Stock Splits'] if actions is not None else pd.Series(dtype=float)
+    splits = splits[splits > 0]
+    return cumulative_factors(index, naive(splits.index).values, splits.to_numpy())
+
+
+def dividend_factors(data, actions):
+    """
+    Cumulative dividend adjustment (1 - dividend / previous close) for every
+    bar. Yahoo reports dividends split-adjusted, so data must be too.
+    """
+    dividends = actions['Dividends'] if actions is not None else pd.Series(dtype=float)
+    dividends = dividends[dividends > 0]
+    if dividends.empty:
+        return np.ones(len(data))
+    ex_dates = naive(dividends.index).values
+    previous = np.searchsorted(naive(data.index).values, ex_dates, side='left') - 1
+    known = previous >= 0
+    previous_close = data['Close'].to_numpy()[previous[known]]
+    factors = 1 - dividends.to_numpy()[known] / previous_close
+    return cumulative_factors(data.index, ex_dates[known], factors)
+
+
+def scale(data, price_factor):
+    """Multiply prices by price_factor and divide volume by it."""
+    data = data.copy()
+    data[PRICE_COLUMNS] = data[PRICE_COLUMNS].mul(price_factor, axis=0)
+    if 'Volume' in data.columns:
+        data['Volume'] = np.rint(data['Volume'] / price_factor).astype('int64')
+    return data
+
+
+def unadjust(data, actions):
+    """Undo the split adjustment Yahoo applied to a freshly downloaded frame."""
+    return scale(data, split_factors(data.index, actions))
+
+
+def adjust(data, actions, dividends=False):
+    """Adjust stored (as-traded) bars for every known split, and optionally dividends."""
+    if actions is None or actions.empty:
+        return data
+    factor = 1 / split_factors(data.index, actions)
+    if dividends:
+        # Dividends are split-adjusted, so they are compared with split-adjusted closes
+        factor = factor * dividend_factors(data[['Close']].mul(factor, axis=0), actions)
+    return scale(data, factor)
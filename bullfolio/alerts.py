@@ -0,0 +1,219 @@
+"""
+Event alerts over the local price store.
+
+Detects new all-time highs, 52-week breakouts and large N-day moves for a
+whole market at once from the aligned close/high matrices, and sends every
+event that was not sent before to one or more sinks:
+
+    jsonl[=path]     append one JSON object per event (default .bullfolio/alerts.jsonl)
+    webhook[=url]    POST the events as JSON (default http://localhost:8765/alerts)
+    desktop          desktop notification (notify-send / osascript)
+
+    python -m bullfolio.alerts --market india --sink jsonl --sink desktop [--days 5 --threshold 10]
+
+Detection only reads the store, so it is cheap enough to run every few
+minutes; pass --update to pull the latest bars first, or keep the store fresh
+with the screeners / python -m bullfolio.store.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import urllib.request
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from bullfolio.markets import MARKETS
+from bullfolio.matrix import build_panel
+from bullfolio.store import DATA_DIR, load_frames, update_frame
+from bullfolio.universe import load_universe
+
+ALERTS_FILE = os.path.join(DATA_DIR, 'alerts.jsonl')
+SEEN_FILE = os.path.join(DATA_DIR, 'alerts_seen.json')
+SEEN_DAYS = 30  # sent events are remembered this long
+DEFAULT_WEBHOOK = 'http://localhost:8765/alerts'
+MIN_HISTORY_BARS = 252  # a recent listing is always at its "all-time high"
+BREAKOUT_WINDOW = pd.Timedelta(days=365)
+RETURN_DAYS = 5
+RETURN_THRESHOLD = 10.0  # percent, either direction
+UPDATE_LOOKBACK_DAYS = 400
+
+
+def detect_events(panel, market, return_days=RETURN_DAYS, return_threshold=RETURN_THRESHOLD):
+    """
+    Events on the latest bar of a market's panel. Only tickers that have a bar
+    on the latest date are considered, so stale tickers never fire.
+    """
+    close = panel['Close']
+    high = panel.get('High', close)
+    if len(close) < 2:
+        return []
+    last_date = close.index[-1]
+    last = close.iloc[-1]
+    fresh = last.notna()
+
+    prior_ath = close.iloc[:-1].max()
+    enough_history = close.count() >= MIN_HISTORY_BARS
+    new_ath = fresh & enough_history & (last > prior_ath)
+
+    window = high.loc[last_date - BREAKOUT_WINDOW:].iloc[:-1]
+    prior_52w_high = window.max()
+    breakout = fresh & (last > prior_52w_high) & ~new_ath
+
+    change = pd.Series(dtype=float)
+    if len(close) > return_days:
+        change = (last / close.ffill().iloc[-1 - return_days] - 1) * 100
+    big_move = fresh & (change.abs() >= return_threshold).reindex(last.index, fill_value=False)
+
+    day = last_date.date().isoformat()
+    events = []
+    for ticker in last.index[new_ath]:
+        events.append({'type': 'new_ath', 'ticker': ticker, 'close': last[ticker], 'level': prior_ath[ticker],
+                       'message': f"{ticker} closed at a new all-time high of {last[ticker]:.2f} "
+                                  f"(previous {prior_ath[ticker]:.2f})"})
+    for ticker in last.index[breakout]:
+        events.append({'type': 'breakout_52w', 'ticker': ticker, 'close': last[ticker],
+                       'level': prior_52w_high[ticker],
+                       'message': f"{ticker} broke out above its 52-week high of {prior_52w_high[ticker]:.2f}"})
+    for ticker in last.index[big_move]:
+        events.append({'type': f'return_{return_days}d', 'ticker': ticker, 'close': last[ticker],
+                       'level': change[ticker],
+                       'message': f"{ticker} moved {change[ticker]:+.1f}% in {return_days} bars"})
+    for event in events:
+        event['market'] = market
+        event['date'] = day
+        event['close'] = round(float(event['close']), 4)
+        event['level'] = round(float(event['level']), 4)
+    return events
+
+
+def event_key(event):
+    """Identity of an event for deduplication: one per type, ticker and bar."""
+    return f"{event['type']}:{event['ticker']}:{event['date']}"
+
+
+def load_seen(now=None):
+    """Keys of the events already sent, dropping those older than SEEN_DAYS."""
+    if not os.path.exists(SEEN_FILE):
+        return {}
+    try:
+        with open(SEEN_FILE) as f:
+            seen = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading sent alerts: {e}")
+        return {}
+    cutoff = ((now or datetime.now()) - timedelta(days=SEEN_DAYS)).isoformat(timespec='seconds')
+    return {key: sent for key, sent in seen.items() if sent >= cutoff}
+
+
+def save_seen(seen):
+    """Persist the keys of the sent events."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(SEEN_FILE, 'w') as f:
+        json.dump(seen, f, indent=1, sort_keys=True)
+
+
+def write_jsonl(events, target=None):
+    """Append events to a JSON Lines file."""
+    path = target or ALERTS_FILE
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+
+
+def post_webhook(events, target=None):
+    """POST the events as one JSON array."""
+    request = urllib.request.Request(target or DEFAULT_WEBHOOK, data=json.dumps(events).encode(),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    with urllib.request.urlopen(request, timeout=10) as response:
+        response.read()
+
+
+def notify_desktop(events, target=None):
+    """Show one desktop notification summarizing the events."""
+    title = f"{len(events)} stock alert{'s' if len(events) != 1 else ''}"
+    body = '\n'.join(event['message'] for event in events[:10])
+    if sys.platform == 'darwin':
+        script = f"display notification {json.dumps(body)} with title {json.dumps(title)}"
+        subprocess.run(['osascript', '-e', script], check=True)
+    else:
+        subprocess.run(['notify-send', title, body], check=True)
+
+
+SINKS = {
+    'jsonl': write_jsonl,
+    'webhook': post_webhook,
+    'desktop': notify_desktop,
+}
+
+
+def parse_sink(text):
+    """Parse "name" or "name=target" into (send function, target)."""
+    name, _, target = text.partition('=')
+    if name not in SINKS:
+        raise ValueError(f"Unknown sink '{name}'. Choose from: {', '.join(SINKS)}.")
+    return SINKS[name], target or None
+
+
+def dispatch(events, sinks, seen, now=None):
+    """Send the events not seen before to every sink and mark them as sent. Returns the sent events."""
+    new_events = [event for event in events if event_key(event) not in seen]
+    if not new_events:
+        return []
+    delivered = False
+    for send, target in sinks:
+        try:
+            send(new_events, target)
+            delivered = True
+        except Exception as e:
+            print(f"Error sending alerts with {send.__name__}: {e}")
+    # Events no sink accepted are retried on the next run
+    if not delivered:
+        return []
+    sent = (now or datetime.now()).isoformat(timespec='seconds')
+    for event in new_events:
+        seen[event_key(event)] = sent
+    return new_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect ATH, breakout and large-move events from the price store.")
+    parser.add_argument('--market', choices=sorted(MARKETS), help="Defaults to every market.")
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--sink', action='append', default=[],
+                        help=f"Where to send new events: {', '.join(SINKS)}, optionally name=target. Repeatable.")
+    parser.add_argument('--days', type=int, default=RETURN_DAYS, help="Bars for the return event.")
+    parser.add_argument('--threshold', type=float, default=RETURN_THRESHOLD, help="Return event threshold in percent.")
+    parser.add_argument('--update', action='store_true', help="Download the latest bars into the store first.")
+    args = parser.parse_args()
+
+    try:
+        sinks = [parse_sink(text) for text in args.sink or ['jsonl']]
+    except ValueError as e:
+        print(e)
+        return
+
+    universe = load_universe([args.market] if args.market else None)
+    seen = load_seen()
+    for market, tickers in universe.groupby('market')['ticker']:
+        if args.update:
+            start = (date.today() - timedelta(days=UPDATE_LOOKBACK_DAYS)).isoformat()
+            for ticker in tickers:
+                update_frame(ticker, args.interval, start)
+        panel = build_panel(load_frames(tickers, args.interval), fields=('High', 'Close'))
+        if 'Close' not in panel:
+            print(f"No stored {market} prices. Fill the store first with python -m bullfolio.store.")
+            continue
+        events = detect_events(panel, market, args.days, args.threshold)
+        new_events = dispatch(events, sinks, seen)
+        print(f"{market}: {len(events)} events on {panel['Close'].index[-1].date()}, {len(new_events)} new.")
+        for event in new_events:
+            print(f"  {event['message']}")
+    save_seen(seen)
+
+
+if __name__ == "__main__":
+    main()
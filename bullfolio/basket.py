@@ -0,0 +1,160 @@
+"""
+Basket view of the top of a screening run.
+
+Takes the top N names of a run's rank table with equal or score weights and,
+from the price store's close matrix, computes the basket's equity curve
+(bought at the start of the window and held), its drawdown, each name's
+contribution to the result and the turnover against a previous run. One
+summary chart replaces opening N charts:
+
+    python -m bullfolio.basket [run_folder] [--top 20] [--weights equal|score] [--previous other_run_folder]
+
+It writes basket.png and basket.csv into the run folder.
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from bullfolio.manifest import latest_run_folder, read_manifest
+from bullfolio.matrix import field_matrix
+from bullfolio.store import load_frames
+
+BASKET_FILE = 'basket.png'
+BASKET_TABLE = 'basket.csv'
+WEIGHTINGS = ('equal', 'score')
+
+
+def basket_weights(rows, top, weighting='equal'):
+    """Weights of the top ranked rows keyed by ticker; score weights use the positive scores only."""
+    rows = rows[:top]
+    if weighting == 'score':
+        scores = pd.Series({row['ticker']: row['score'] for row in rows}, dtype=float).clip(lower=0)
+        if scores.sum() > 0:
+            return scores / scores.sum()
+    return pd.Series(1 / len(rows), index=[row['ticker'] for row in rows]) if rows else pd.Series(dtype=float)
+
+
+def priced_basket(manifest, top, weighting='equal'):
+    """
+    Basket weights of a run, the closes over its window and the tickers left
+    out for lack of stored prices; the weights of the rest are renormalized.
+    """
+    weights = basket_weights(manifest['ranks'], top, weighting)
+    frames = load_frames(list(weights.index), manifest['interval'])
+    closes = field_matrix(frames).loc[manifest['start_date']:manifest.get('end_date')]
+    missing = [ticker for ticker in weights.index if ticker not in closes.columns or closes[ticker].count() < 2]
+    if missing:
+        weights = weights.drop(missing)
+        weights = weights / weights.sum() if weights.sum() > 0 else weights
+    return weights, closes, missing
+
+
+def basket_curve(closes, weights):
+    """
+    Equity curve (starting at 1) of a buy-and-hold basket and each name's
+    contribution to its final return. A name counts as cash until its first bar.
+    """
+    closes = closes[weights.index]
+    growth = (closes / closes.bfill().iloc[0]).ffill().fillna(1.0)
+    equity = growth @ weights
+    contribution = (growth.iloc[-1] - 1) * weights
+    return equity, contribution
+
+
+def drawdown(equity):
+    """Fall of the equity curve from its running peak, as a fraction."""
+    return equity / equity.cummax() - 1
+
+
+def turnover(weights, previous_weights):
+    """Share of the basket that would be traded to move from previous_weights to weights."""
+    both = pd.concat([weights, previous_weights], axis=1).fillna(0)
+    return (both.iloc[:, 0] - both.iloc[:, 1]).abs().sum() / 2
+
+
+def save_basket_chart(equity, drawdowns, contribution, labels, file_name, title):
+    """Equity curve, drawdown and contribution by name in one figure."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.style.use('dark_background')
+    fig = plt.figure(figsize=(12, 7))
+    grid = fig.add_gridspec(2, 2, width_ratios=(3, 1), height_ratios=(3, 1), hspace=0.08, wspace=0.25)
+    equity_ax = fig.add_subplot(grid[0, 0])
+    drawdown_ax = fig.add_subplot(grid[1, 0], sharex=equity_ax)
+    contribution_ax = fig.add_subplot(grid[:, 1])
+
+    equity_ax.plot(equity.index, (equity - 1) * 100, color='#62b8ba', linewidth=1)
+    equity_ax.set_ylabel('Return %', fontsize=7)
+    equity_ax.grid(axis='y', color='#2c2e31', linestyle='--')
+    equity_ax.tick_params(labelbottom=False, labelsize=6)
+    drawdown_ax.fill_between(drawdowns.index, drawdowns * 100, 0, color='#ef4f60', alpha=0.7, linewidth=0)
+    drawdown_ax.set_ylabel('Drawdown %', fontsize=7)
+    drawdown_ax.tick_params(labelsize=6)
+
+    ordered = (contribution * 100).sort_values()
+    colors = ['#3dc985' if value >= 0 else '#ef4f60' for value in ordered]
+    contribution_ax.barh([labels.get(ticker, ticker) for ticker in ordered.index], ordered, color=colors)
+    contribution_ax.set_xlabel('Contribution, % points', fontsize=7)
+    contribution_ax.tick_params(labelsize=max(4, min(7, 300 / max(len(ordered), 1))))
+
+    fig.suptitle(title, fontsize=10)
+    fig.savefig(file_name, dpi=200, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the top of a run's rank table as one basket.")
+    parser.add_argument('folder', nargs='?', help="Run folder (defaults to the latest run).")
+    parser.add_argument('--top', type=int, default=20, help="Names in the basket.")
+    parser.add_argument('--weights', choices=WEIGHTINGS, default='equal',
+                        help="equal weights, or weights proportional to the (positive) scores.")
+    parser.add_argument('--previous', help="Earlier run folder to measure turnover against.")
+    args = parser.parse_args()
+
+    folder = args.folder or latest_run_folder()
+    manifest = read_manifest(folder) if folder else None
+    if manifest is None:
+        print("No run manifest found. Run a screener first.")
+        return
+
+    weights, closes, missing = priced_basket(manifest, args.top, args.weights)
+    if missing:
+        print(f"No stored prices for {', '.join(missing)}; leaving them out.")
+    if weights.empty:
+        print("No basket names with stored prices.")
+        return
+
+    equity, contribution = basket_curve(closes, weights)
+    drawdowns = drawdown(equity)
+    labels = {row['ticker']: row['symbol'] for row in manifest['ranks']}
+    total = (equity.iloc[-1] - 1) * 100
+    summary = f"Return {total:+.2f}%, max drawdown {drawdowns.min() * 100:.2f}%"
+
+    if args.previous:
+        previous = read_manifest(args.previous)
+        if previous is None:
+            print(f"No run manifest in {args.previous}.")
+        else:
+            # Both baskets leave out the names without prices, or identical runs would show turnover
+            previous_weights, _, _ = priced_basket(previous, args.top, args.weights)
+            changed = turnover(weights, previous_weights)
+            summary += f", turnover {changed * 100:.1f}% vs previous run"
+
+    table = pd.DataFrame({'symbol': [labels.get(ticker, ticker) for ticker in weights.index],
+                          'weight': weights, 'contribution': contribution * 100})
+    table.to_csv(os.path.join(folder, BASKET_TABLE), index_label='ticker')
+    file_name = os.path.join(folder, BASKET_FILE)
+    title = (f"Top {len(weights)} {manifest.get('market', '')} basket ({args.weights} weights) "
+             f"{manifest['start_date']} to {equity.index[-1]:%Y-%m-%d}\n{summary}")
+    save_basket_chart(equity, drawdowns, contribution, labels, file_name, title)
+
+    print(table.sort_values('contribution', ascending=False).round(3).to_string(index=False))
+    print(f"\n{summary}")
+    print(f"Basket chart saved as {file_name}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Trading calendars of the supported markets (NSE and NYSE).
+
+Look-back windows are resolved against the exchange's sessions instead of
+"now minus 30 days per month": a window ends at the last complete session (a
+session still trading in the market's time zone is left out) and starts N
+sessions, or N calendar weeks/months, before it. The same window is therefore
+resolved on every run until the next session closes, so run folders, caches
+and rank histories built from it line up across runs.
+
+Sessions come from the exchange_calendars package when it is installed.
+Otherwise weekends and the holidays below are excluded: NYSE holidays follow
+the exchange's fixed rules, NSE holidays are the fixed national holidays plus
+the announced dates listed in holidays.csv next to this module. NSE publishes
+each year's list in December; add it to holidays.csv (unscheduled closures of
+either exchange go there too). A warning is printed for years not listed.
+"""
+import csv
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+from dateutil.easter import easter
+
+from bullfolio.markets import MARKETS
+
+HOLIDAYS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'holidays.csv')
+DURATION_TYPES = ('sessions', 'weeks', 'months')
+NSE_FIXED_HOLIDAYS = ((1, 26), (5, 1), (8, 15), (10, 2), (12, 25))
+LISTED_CALENDARS = ('india',)  # markets whose holidays are mostly announced, not rule-based
+
+_warned = set()
+
+
+def nth_weekday(year, month, weekday, n):
+    """The nth (1-based, or -1 for the last) given weekday (Monday=0) of a month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed(day):
+    """NYSE observance: a Saturday holiday moves to Friday, a Sunday one to Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year):
+    """NYSE full-day holidays of one year."""
+    days = {
+        nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        easter(year) - timedelta(days=2),  # Good Friday
+        nth_weekday(year, 5, 0, -1),  # Memorial Day
+        observed(date(year, 7, 4)),
+        nth_weekday(year, 9, 0, 1),  # Labor Day
+        nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        observed(date(year, 12, 25)),
+    }
+    # New Year's Day falling on a Saturday is not moved back into the old year
+    if date(year, 1, 1).weekday() != 5:
+        days.add(observed(date(year, 1, 1)))
+    if year >= 2022:
+        days.add(observed(date(year, 6, 19)))  # Juneteenth
+    return days | {day for day in listed_holidays('us') if day.year == year}
+
+
+def nse_holidays(year):
+    """NSE trading holidays of one year: fixed national holidays, Good Friday and listed dates."""
+    days = {date(year, month, day) for month, day in NSE_FIXED_HOLIDAYS}
+    days.add(easter(year) - timedelta(days=2))
+    return days | {day for day in listed_holidays('india') if day.year == year}
+
+
+def listed_holidays(market):
+    """Holidays announced by the exchange and listed in holidays.csv for market."""
+    if not os.path.exists(HOLIDAYS_FILE):
+        return set()
+    with open(HOLIDAYS_FILE, newline='') as f:
+        return {date.fromisoformat(row['date']) for row in csv.DictReader(f) if row['market'] == market}
+
+
+def warn_unlisted(market, year):
+    """Warn once per market and year when holidays.csv does not cover year yet."""
+    if market not in LISTED_CALENDARS or (market, year) in _warned:
+        return
+    listed_years = {day.year for day in listed_holidays(market)}
+    if year not in listed_years:
+        _warned.add((market, year))
+        print(f"Warning: {os.path.basename(HOLIDAYS_FILE)} lists no {market} holidays for {year}; "
+              f"only weekends and fixed holidays are skipped (pip install exchange_calendars).")
+
+
+HOLIDAY_RULES = {
+    'india': nse_holidays,
+    'us': nyse_holidays,
+}
+
+
+def sessions(market, start, end):
+    """Trading sessions of market between start and end (inclusive), as a DatetimeIndex."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    try:
+        import exchange_calendars
+
+        calendar = exchange_calendars.get_calendar(MARKETS[market]['calendar'])
+        first, last = max(start, calendar.first_session), min(end, calendar.last_session)
+        if first <= last:
+            return pd.DatetimeIndex(calendar.sessions_in_range(first, last)).tz_localize(None)
+    except ImportError:
+        pass
+    holidays = set()
+    for year in range(start.year, end.year + 1):
+        warn_unlisted(market, year)
+        holidays |= HOLIDAY_RULES[market](year)
+    days = pd.bdate_range(start, end)
+    return days[~days.isin(pd.DatetimeIndex(sorted(holidays)))]
+
+
+def last_complete_session(market, now=None):
+    """The most recent session that has closed, in the market's own time zone."""
+    settings = MARKETS[market]
+    now = pd.Timestamp(now) if now is not None else pd.Timestamp.now(tz=settings['timezone'])
+    if now.tzinfo is None:
+        now = now.tz_localize(settings['timezone'])
+    now = now.tz_convert(settings['timezone'])
+    today = now.tz_localize(None).normalize()
+    recent = sessions(market, today - timedelta(days=14), today)
+    if len(recent) and recent[-1] == today and now.strftime('%H:%M') < settings['close']:
+        recent = recent[:-1]
+    return recent[-1]
+
+
+def trading_window(market, duration_type, duration, now=None):
+    """
+    First and last session (as 'YYYY-MM-DD') of a look-back window of duration
+    sessions, weeks or months ending at the last complete session.
+    """
+    if duration_type not in DURATION_TYPES:
+        raise ValueError(f"Unknown duration type '{duration_type}'. Choose from: {', '.join(DURATION_TYPES)}.")
+    if duration < 1:
+        raise ValueError(f"The number of {duration_type} must be at least 1, not {duration}.")
+    end = last_complete_session(market, now)
+    if duration_type == 'sessions':
+        # Two calendar days per session comfortably covers weekends and holidays
+        recent = sessions(market, end - timedelta(days=2 * duration + 14), end)
+        start = recent[-duration]
+    else:
+        offset = pd.DateOffset(weeks=duration) if duration_type == 'weeks' else pd.DateOffset(months=duration)
+        start = sessions(market, end - offset + timedelta(days=1), end)[0]
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def download_end(end_date):
+    """The exclusive end date yfinance expects for a window ending on end_date."""
+    return (pd.Timestamp(end_date) + timedelta(days=1)).strftime('%Y-%m-%d')
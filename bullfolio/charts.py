@@ -0,0 +1,184 @@
+import re
+
+import pandas as pd
+
+SAVE_OPTIONS = dict(dpi=300, bbox_inches='tight')
+CROP_PAD = 0.1  # inches around the tight box, as bbox_inches='tight' uses
+
+# Binance Dark Theme
+binance_dark = {
+    "base_mpl_style": "dark_background",
+    "marketcolors": {
+        "candle": {"up": "#3dc985", "down": "#ef4f60"},
+        "edge": {"up": "#3dc985", "down": "#ef4f60"},
+        "wick": {"up": "#3dc985", "down": "#ef4f60"},
+        "ohlc": {"up": "green", "down": "red"},
+        "volume": {"up": "#247252", "down": "#82333f"},
+        "vcedge": {"up": "green", "down": "red"},
+        "vcdopcod": False,
+        "alpha": 1,
+    },
+    "mavcolors": ("#ad7739", "#a63ab2", "#62b8ba"),
+    "facecolor": "#1b1f24",
+    "gridcolor": "#2c2e31",
+    "gridstyle": "--",
+    "y_on_right": True,
+    "rc": {
+        "axes.grid": True,
+        "axes.grid.axis": "y",
+        "axes.edgecolor": "#474d56",
+        "axes.titlecolor": "red",
+        "figure.facecolor": "#161a1e",
+        "figure.titlesize": 10,  # Reduced title size
+        "figure.titleweight": "semibold",
+        "axes.labelsize": 5,  # Reduced label size
+        "axes.titlesize": 8,  # Reduced axes title size
+        "xtick.labelsize": 5,  # Reduced x-axis tick label size
+        "ytick.labelsize": 5,  # Reduced y-axis tick label size
+    },
+    "base_mpf_style": "binance-dark",
+}
+
+
+def clean_and_prepare_data(data, ticker):
+    """Clean and prepare the data for mplfinance."""
+    try:
+        if isinstance(data.columns, pd.MultiIndex):
+            data = data.copy()
+            data.columns = data.columns.map('_'.join).str.strip()
+
+        column_mapping = {
+            f"Close_{ticker}": 'Close',
+            f'High_{ticker}': 'High',
+            f'Low_{ticker}': 'Low',
+            f'Open_{ticker}': 'Open',
+            f'Volume_{ticker}': 'Volume',
+        }
+        data = data.rename(columns=column_mapping)
+
+        required_columns = ['Open', 'High', 'Low', 'Close']
+        if not all(col in data.columns for col in required_columns):
+            raise KeyError(f"Required columns {required_columns} not found in data.")
+
+        columns = required_columns + (['Volume'] if 'Volume' in data.columns else [])
+        data = data[columns].apply(pd.to_numeric, errors='coerce').dropna(subset=required_columns)
+        if 'Volume' in data.columns:
+            # Share counts are whole numbers; keep them as integers rather than floats
+            data['Volume'] = data['Volume'].fillna(0).astype('int64')
+        data.index = pd.to_datetime(data.index)
+        return data
+    except Exception as e:
+        print(f"Error cleaning and preparing data for {ticker}: {e}")
+        return None
+
+
+def tick_label_shape(axis):
+    """
+    The tick labels an axis will draw, with every digit as 0: digits are equally
+    wide, so labels of the same shape take the same room.
+    """
+    low, high = sorted(axis.get_view_interval())
+    locs = [loc for loc in axis.get_major_locator()() if low <= loc <= high]
+    formatter = axis.get_major_formatter()
+    labels = formatter.format_ticks(locs) + [formatter.get_offset()]
+    return tuple(sorted({re.sub(r'\d', '0', label) for label in labels}))
+
+
+class ChartTemplate:
+    """
+    Figure and axes of one panel layout, built once per process and reused for
+    every chart with that layout. Each chart clears the axes and draws into
+    them. The tight crop box is measured once per shape of the tick labels and
+    then reused, saving the extra layout pass bbox_inches='tight' costs per save.
+    """
+
+    def __init__(self, data, volume, panels):
+        import mplfinance as mpf
+
+        # Placeholder series create the extra panels; the real ones are drawn by draw()
+        placeholders = [mpf.make_addplot(data['Close'], panel=panel)
+                        for panel in range(2 if volume else 1, panels)]
+        self.volume = volume
+        self.figure, self.axes = mpf.plot(
+            data,
+            type='candle',
+            style=binance_dark,
+            volume=volume,
+            figratio=(20, 9),
+            figscale=0.8,
+            returnfig=True,
+            **({'addplot': placeholders} if placeholders else {}),
+        )
+        self.crops = {}
+        self.crop_key = None
+
+    def draw(self, data, title, addplot=None):
+        """Draw one chart into the template's axes and return the figure."""
+        import mplfinance as mpf
+
+        for ax in self.axes:
+            ax.clear()
+        extra = {}
+        if addplot:
+            addplots = addplot if isinstance(addplot, list) else [addplot]
+            extra['addplot'] = [dict(plot, ax=self.axes[2 * plot.get('panel', 0)]) for plot in addplots]
+        mpf.plot(
+            data,
+            type='candle',
+            style=binance_dark,
+            ylabel='Price',
+            ax=self.axes[0],
+            volume=self.axes[2] if self.volume else False,
+            **extra,
+        )
+        for ax in self.axes[0::2]:
+            ax.yaxis.set_label_position('right')
+        self.figure.suptitle(title)
+        # The right-hand tick labels are the only part whose width varies between charts
+        self.crop_key = tuple(tick_label_shape(ax.yaxis) for ax in self.axes[0::2])
+        return self.figure
+
+    def save(self, file_name, **options):
+        """Save the current chart cropped as bbox_inches='tight' would."""
+        if self.crop_key not in self.crops:
+            self.figure.canvas.draw()
+            tight = self.figure.get_tightbbox(self.figure.canvas.get_renderer())
+            self.crops[self.crop_key] = tight.padded(CROP_PAD)
+        options = dict(SAVE_OPTIONS, **options, bbox_inches=self.crops[self.crop_key])
+        self.figure.savefig(file_name, **options)
+
+
+_templates = {}
+
+
+def chart_template(data, volume, addplot=None):
+    """The process-wide template for the panel layout needed by this chart."""
+    addplots = addplot if isinstance(addplot, list) else [addplot] if addplot else []
+    panels = max([plot.get('panel', 0) for plot in addplots] + [1 if volume else 0]) + 1
+    key = (volume, panels)
+    if key not in _templates:
+        _templates[key] = ChartTemplate(data, volume, panels)
+    return _templates[key]
+
+
+def candlestick_figure(data, title, addplot=None, volume=False):
+    """
+    Draw prepared OHLC data as a candlestick chart and return the figure. The
+    figure is reused by the next chart with the same layout, so do not close it.
+    """
+    volume = volume and 'Volume' in data.columns
+    return chart_template(data, volume, addplot).draw(data, title, addplot)
+
+
+def save_figure(figure, file_name, **options):
+    """Save a figure from candlestick_figure using its template's crop box."""
+    for template in _templates.values():
+        if template.figure is figure:
+            template.save(file_name, **options)
+            return
+    figure.savefig(file_name, **dict(SAVE_OPTIONS, **options))
+
+
+def render_candlestick_chart(data, file_name, title, addplot=None, volume=False):
+    """Render prepared OHLC data as a candlestick chart saved to file_name."""
+    save_figure(candlestick_figure(data, title, addplot=addplot, volume=volume), file_name)
@@ -0,0 +1,45 @@
+"""
+Memory-bounded ranking for universes too large to hold in memory.
+
+Symbols are fetched and scored in fixed-size batches. Each batch's score
+table is spilled to disk sorted by score and its price frames are dropped;
+the spilled tables are then combined with a streaming k-way merge. Peak memory
+is set by the batch size, not by the size of the universe, and the winners'
+bars are read back from the price store one chart at a time.
+"""
+import csv
+import heapq
+import math
+import os
+
+
+def batches(items, size):
+    """Consecutive slices of items with at most size elements each."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def spill_scores(scores, folder, number):
+    """Write a batch's score table (indexed by symbol, with a score column) to disk, best first."""
+    path = os.path.join(folder, f"batch-{number:05d}.csv")
+    scores.sort_values('score', ascending=False, kind='stable').to_csv(path, index_label='symbol')
+    return path
+
+
+def read_spilled(path):
+    """Stream the rows of one spilled score table with numbers parsed back."""
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            for key, value in row.items():
+                if key == 'symbol':
+                    continue
+                try:
+                    row[key] = float(value) if value != '' else math.nan
+                except ValueError:
+                    pass
+            yield row
+
+
+def merge_scores(paths):
+    """Merge spilled score tables into one stream of rows ordered by descending score."""
+    return heapq.merge(*(read_spilled(path) for path in paths), key=lambda row: -row['score'])
@@ -0,0 +1,74 @@
+"""
+Composite momentum + fundamentals score.
+
+The momentum rank table is joined with the valuation, growth, dividend and
+analyst-rating columns of the market snapshot (india.csv / us.csv) in one
+merge. Every factor is turned into a z-score across the universe and the
+weighted average of the z-scores gives the final ranking.
+"""
+import numpy as np
+import pandas as pd
+
+from bullfolio.snapshots import read_snapshot_csv
+
+RATING_SCORES = {'Strong sell': -2, 'Sell': -1, 'Neutral': 0, 'Buy': 1, 'Strong buy': 2}
+DEFAULT_WEIGHTS = {
+    'momentum': 0.5,
+    'earnings_yield': 0.15,
+    'eps_growth': 0.15,
+    'dividend_yield': 0.05,
+    'rating': 0.15,
+}
+Z_CLIP = 3  # outliers (e.g. +4000% EPS growth) are capped at 3 standard deviations
+
+
+def parse_weights(text):
+    """Parse "momentum=0.6,rating=0.4" into a weights dict, starting from the defaults."""
+    weights = dict(DEFAULT_WEIGHTS)
+    if not text:
+        return weights
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown factor '{name}'. Choose from: {', '.join(DEFAULT_WEIGHTS)}.")
+        weights[name] = float(value)
+    if not any(weights.values()):
+        raise ValueError("At least one composite weight must be non-zero.")
+    return weights
+
+
+def factor_table(scores, csv_file):
+    """Momentum score and fundamental factors per symbol, joined in one merge."""
+    snapshot = read_snapshot_csv(csv_file).set_index('symbol')
+    table = pd.DataFrame({'momentum': scores}).join(snapshot, how='left')
+    pe = pd.to_numeric(table['pe'], errors='coerce')
+    factors = pd.DataFrame({
+        'momentum': table['momentum'],
+        # Earnings yield ranks loss-makers last instead of treating a negative P/E as cheap
+        'earnings_yield': (1 / pe).where(pe > 0, 0.0).where(pe.notna()),
+        'eps_growth': pd.to_numeric(table['eps_growth'], errors='coerce'),
+        'dividend_yield': pd.to_numeric(table['dividend_yield'], errors='coerce'),
+        'rating': table['rating'].astype(object).map(RATING_SCORES),
+    }, index=table.index)
+    return factors
+
+
+def zscores(factors):
+    """Column-wise z-scores, clipped, with missing values scored as average (0)."""
+    z = (factors - factors.mean()) / factors.std(ddof=0).replace(0, np.nan)
+    return z.clip(-Z_CLIP, Z_CLIP).fillna(0)
+
+
+def composite_scores(scores, csv_file, weights=None):
+    """
+    Rank symbols by the weighted average z-score of momentum and fundamentals.
+
+    scores is a Series of momentum scores indexed by symbol. Returns the z-score
+    table with a 'composite' column, best first.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    z = zscores(factor_table(scores, csv_file))
+    weight_series = pd.Series(weights, dtype=float).reindex(z.columns).fillna(0)
+    z['composite'] = z.mul(weight_series, axis=1).sum(axis=1) / weight_series.abs().sum()
+    return z.sort_values('composite', ascending=False)
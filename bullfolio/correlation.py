@@ -0,0 +1,166 @@
+"""
+Correlation clusters among the top names of a screening run.
+
+The top ranks of a momentum screen are often one theme many times over. This
+report takes the top K names of a run, computes their return-correlation
+matrix in a single matrix product over the aligned daily returns, groups them
+hierarchically (average linkage on 1 - correlation) and picks the best-ranked
+name of each group, so the pick list is spread across themes:
+
+    python -m bullfolio.correlation [run_folder] [--top 100] [--min-corr 0.6] [--picks 20]
+
+It writes correlation.png (the matrix in cluster order) and clusters.csv into
+the run folder. scipy is used for the clustering when installed; without it
+names join the group of the first better-ranked name they correlate with.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from bullfolio.manifest import latest_run_folder, read_manifest
+from bullfolio.matrix import field_matrix
+from bullfolio.store import load_frames
+
+CORRELATION_FILE = 'correlation.png'
+CLUSTERS_FILE = 'clusters.csv'
+MIN_OVERLAP = 20  # bars two names need in common for a meaningful correlation
+
+
+def correlation_matrix(closes):
+    """
+    Pearson correlation of the daily log returns of every column of a close
+    matrix, as one product of the standardised return matrix with itself.
+    Missing returns count as zero (average) returns.
+    """
+    returns = np.log(closes.ffill()).diff().iloc[1:]
+    values = returns.to_numpy(dtype=float)
+    values = values - np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[std == 0] = np.nan
+    standardised = np.nan_to_num(values / std)
+    corr = standardised.T @ standardised / len(values)
+    np.fill_diagonal(corr, 1.0)
+    return pd.DataFrame(np.clip(corr, -1, 1), index=closes.columns, columns=closes.columns)
+
+
+def cluster_labels(corr, min_corr):
+    """
+    Cluster number per symbol (symbols in rank order), joining names whose
+    average correlation is at least min_corr, and the symbols in leaf order.
+    """
+    try:
+        from scipy.cluster.hierarchy import fcluster, leaves_list, linkage
+        from scipy.spatial.distance import squareform
+    except ImportError:
+        return greedy_clusters(corr, min_corr)
+
+    if len(corr) < 2:
+        return pd.Series(1, index=corr.index), list(corr.index)
+    distance = squareform(1 - corr.to_numpy(), checks=False)
+    tree = linkage(distance, method='average')
+    labels = pd.Series(fcluster(tree, t=1 - min_corr, criterion='distance'), index=corr.index)
+    return renumber(labels), list(corr.index[leaves_list(tree)])
+
+
+def greedy_clusters(corr, min_corr):
+    """Fallback clustering: each name joins the first better-ranked leader it correlates with."""
+    labels = {}
+    leaders = []
+    for symbol in corr.index:
+        leader = next((leader for leader in leaders if corr.at[symbol, leader] >= min_corr), None)
+        if leader is None:
+            leaders.append(symbol)
+            leader = symbol
+        labels[symbol] = labels.get(leader, len(leaders))
+    labels = pd.Series(labels)
+    order = labels.sort_values(kind='stable').index
+    return labels, list(order)
+
+
+def renumber(labels):
+    """Number clusters 1, 2, ... in the order of their best-ranked member."""
+    order = {label: number for number, label in enumerate(dict.fromkeys(labels), start=1)}
+    return labels.map(order)
+
+
+def diversified_picks(labels, picks, per_cluster=1):
+    """The best-ranked per_cluster names of each cluster, in rank order, at most picks of them."""
+    chosen = labels.groupby(labels, sort=False).head(per_cluster)
+    return list(chosen.index[:picks])
+
+
+def save_correlation_heatmap(corr, labels, order, file_name, title):
+    """Render the correlation matrix in cluster order, with cluster boundaries marked."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    ordered = corr.loc[order, order]
+    size = min(4 + 0.12 * len(order), 30)
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots(figsize=(size, size))
+    image = ax.imshow(ordered.to_numpy(), cmap='RdYlGn', vmin=-1, vmax=1, interpolation='nearest')
+    fontsize = max(2, min(7, 600 / max(len(order), 1)))
+    ax.set_xticks(range(len(order)))
+    ax.set_xticklabels(order, rotation=90, fontsize=fontsize)
+    ax.set_yticks(range(len(order)))
+    ax.set_yticklabels([f"{symbol} ({labels[symbol]})" for symbol in order], fontsize=fontsize)
+    ordered_labels = labels[order].to_numpy()
+    for boundary in np.flatnonzero(ordered_labels[1:] != ordered_labels[:-1]) + 0.5:
+        ax.axhline(boundary, color='white', linewidth=0.4)
+        ax.axvline(boundary, color='white', linewidth=0.4)
+    fig.colorbar(image, ax=ax, fraction=0.03, pad=0.02)
+    ax.set_title(title, fontsize=9)
+    fig.savefig(file_name, dpi=200, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster the top names of a run by return correlation.")
+    parser.add_argument('folder', nargs='?', help="Run folder (defaults to the latest run).")
+    parser.add_argument('--top', type=int, default=100, help="Ranked names to compare.")
+    parser.add_argument('--min-corr', type=float, default=0.6, help="Average correlation that joins names into a cluster.")
+    parser.add_argument('--picks', type=int, default=20, help="Length of the diversified pick list.")
+    parser.add_argument('--per-cluster', type=int, default=1, help="Names to pick from each cluster.")
+    args = parser.parse_args()
+
+    folder = args.folder or latest_run_folder()
+    manifest = read_manifest(folder) if folder else None
+    if manifest is None:
+        print("No run manifest found. Run a screener first.")
+        return
+
+    rows = manifest['ranks'][:args.top]
+    frames = load_frames([row['ticker'] for row in rows], manifest['interval'])
+    closes = field_matrix(frames).loc[manifest['start_date']:manifest.get('end_date')]
+    symbols = {row['ticker']: row['symbol'] for row in rows}
+    # Rank order, leaving out names without enough stored bars
+    tickers = [row['ticker'] for row in rows if row['ticker'] in closes.columns
+               and closes[row['ticker']].count() >= MIN_OVERLAP]
+    if len(tickers) < 2:
+        print("Need at least two ranked names with stored prices.")
+        return
+    closes = closes[tickers].rename(columns=symbols)
+
+    corr = correlation_matrix(closes)
+    labels, order = cluster_labels(corr, args.min_corr)
+    picks = diversified_picks(labels, args.picks, args.per_cluster)
+
+    ranks = {row['symbol']: row['rank'] for row in rows}
+    pd.DataFrame({'rank': [ranks[symbol] for symbol in labels.index], 'cluster': labels,
+                  'picked': labels.index.isin(picks)}, index=labels.index).to_csv(
+        os.path.join(folder, CLUSTERS_FILE), index_label='symbol')
+    file_name = os.path.join(folder, CORRELATION_FILE)
+    save_correlation_heatmap(corr, labels, order, file_name,
+                             f"Return correlation of the top {len(corr)} - {labels.nunique()} clusters")
+
+    for cluster, members in labels.groupby(labels, sort=False):
+        print(f"Cluster {cluster}: {', '.join(members.index)}")
+    print(f"\nDiversified picks: {', '.join(f'{ranks[symbol]}. {symbol}' for symbol in picks)}")
+    print(f"Correlation heatmap saved as {file_name}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Long-lived screening daemon.
+
+A cold run pays a second or more importing pandas, yfinance, matplotlib and
+mplfinance before any work starts. The daemon imports them once, draws a
+throw-away chart to warm the font cache and style, and then runs screens sent
+by the client over a local socket, streaming the screen's output back:
+
+    python -m bullfolio.daemon serve [--port 8766]
+    python -m bullfolio.daemon run india months 12 1d -- --rs --top 20
+
+Screens run one at a time, in the daemon's working directory (start it from
+the repository folder). The client only uses the standard library, so it
+starts instantly.
+"""
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import socket
+import socketserver
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PORT = 8766
+SCREENS = {
+    'momentum': os.path.join(REPO_DIR, 'Momentum', 'main.py'),
+}
+
+
+def load_screen(path):
+    """Import a screen script as a module so its run_screen can be called repeatedly."""
+    spec = importlib.util.spec_from_file_location(f"screen_{os.path.basename(os.path.dirname(path))}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def warm_up():
+    """Import the heavy libraries and render one small chart so the first real request is fast."""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    import numpy as np
+    import pandas as pd
+    import yfinance  # noqa: F401
+
+    from bullfolio.charts import render_candlestick_chart
+
+    index = pd.bdate_range(end=pd.Timestamp.today(), periods=20)
+    close = np.linspace(100, 110, len(index))
+    data = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close}, index=index)
+    with open(os.devnull, 'wb') as devnull:
+        render_candlestick_chart(data, devnull, 'warm-up')
+
+
+class SocketWriter:
+    """File-like object that forwards text to the client as it is printed."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        try:
+            self.wfile.write(text.encode('utf-8', 'replace'))
+        except OSError:
+            pass  # the client went away; let the screen finish anyway
+        return len(text)
+
+    def flush(self):
+        try:
+            self.wfile.flush()
+        except OSError:
+            pass
+
+
+def make_handler(screens):
+    """Request handler running one screen per connection."""
+
+    class ScreenHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            writer = SocketWriter(self.wfile)
+            try:
+                request = json.loads(self.rfile.readline())
+                module = screens[request.get('screen', 'momentum')]
+            except (ValueError, KeyError) as e:
+                writer.write(f"Invalid request: {e}\n")
+                return
+            with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                try:
+                    run_request(module, request)
+                except SystemExit:
+                    pass  # argparse reports bad flags by exiting
+                except Exception as e:
+                    print(f"Screen failed: {e}")
+
+    return ScreenHandler
+
+
+def run_request(module, request):
+    """Validate one request like the interactive prompts do and run the screen."""
+    from bullfolio.calendars import DURATION_TYPES
+
+    args = module.parse_args(request.get('argv', []))
+    weights = module.parse_weights(args.weights)
+    market = request['market'].strip().lower()
+    duration_type = request['duration_type'].strip().lower()
+    if market not in module.MARKETS:
+        print(f"Invalid market '{market}'. Choose from: {', '.join(module.MARKETS)}.")
+        return
+    if duration_type not in DURATION_TYPES:
+        print(f"Invalid duration type. Use {', '.join(DURATION_TYPES)}.")
+        return
+    # The daemon has no screen of its own, so it never opens a file browser per request
+    args.no_open = True
+    module.run_screen(args, weights, market, duration_type, int(request['duration']), request['interval'])
+
+
+def serve(port):
+    """Load and warm everything once, then serve screen requests until interrupted."""
+    sys.path.insert(0, REPO_DIR)
+    print("Warming up...")
+    warm_up()
+    screens = {name: load_screen(path) for name, path in SCREENS.items()}
+    with socketserver.TCPServer(('127.0.0.1', port), make_handler(screens)) as server:
+        print(f"Screening daemon ready on port {port}.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def send(request, port):
+    """Send one screen request and print its output as it arrives."""
+    try:
+        connection = socket.create_connection(('127.0.0.1', port))
+    except OSError:
+        print(f"No daemon on port {port}. Start one with: python -m bullfolio.daemon serve")
+        return
+    with connection:
+        connection.sendall((json.dumps(request) + '\n').encode())
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            sys.stdout.write(chunk.decode('utf-8', 'replace'))
+            sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run screens through a warm, long-lived process.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="Start the daemon.")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+
+    run_parser = commands.add_parser('run', help="Run a screen on the daemon.")
+    run_parser.add_argument('market', help="india or us")
+    run_parser.add_argument('duration_type', help="sessions, weeks or months")
+    run_parser.add_argument('duration', type=int)
+    run_parser.add_argument('interval', help="e.g. 1d, 1wk, 1mo")
+    run_parser.add_argument('flags', nargs=argparse.REMAINDER, help="Screen flags after --, e.g. -- --rs --top 20.")
+    run_parser.add_argument('--screen', choices=sorted(SCREENS), default='momentum')
+    run_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.port)
+        return
+    flags = args.flags[1:] if args.flags[:1] == ['--'] else args.flags
+    send({'screen': args.screen, 'market': args.market, 'duration_type': args.duration_type,
+          'duration': args.duration, 'interval': args.interval, 'argv': flags}, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Delta mode for repeated runs into the same folder.
+
+The new rank table is compared with the manifest of the previous run. A chart
+whose symbol has no new bars and an unchanged title is identical to the one
+already on disk, so it is renamed to its new rank instead of being drawn
+again; only the rest are re-rendered. Entries, exits and the biggest rank
+movers are reported.
+"""
+import os
+import shutil
+
+import pandas as pd
+
+from bullfolio.manifest import MANIFEST_FILE
+
+# Manifest fields that change how a chart looks; if any differ nothing is reused
+RENDER_KEYS = ('interval', 'start_date', 'end_date', 'benchmark', 'rs_line', 'mav', 'volume')
+RANK_BUCKET = 10  # movers are only reported when they change bucket (1-10, 11-20, ...)
+TOP_MOVERS = 10
+
+
+def last_bar(data):
+    """Timestamp of the newest bar, as stored in the manifest."""
+    return pd.Timestamp(data.index[-1]).isoformat()
+
+
+def rank_changes(previous_rows, rows):
+    """Previous and new rank per symbol; a missing rank marks an entry or an exit."""
+    previous = pd.Series({row['symbol']: row['rank'] for row in previous_rows}, dtype=float)
+    current = pd.Series({row['symbol']: row['rank'] for row in rows}, dtype=float)
+    changes = pd.DataFrame({'previous_rank': previous, 'rank': current})
+    changes['change'] = changes['previous_rank'] - changes['rank']
+    return changes
+
+
+def print_report(changes, movers=TOP_MOVERS):
+    """Print entries, exits and the biggest movers across rank buckets."""
+    entries = changes[changes['previous_rank'].isna()].sort_values('rank')
+    exits = changes[changes['rank'].isna()].sort_values('previous_rank')
+    both = changes.dropna()
+    bucket_moves = both[(both['previous_rank'] - 1) // RANK_BUCKET != (both['rank'] - 1) // RANK_BUCKET]
+    biggest = bucket_moves.reindex(bucket_moves['change'].abs().sort_values(ascending=False).index).head(movers)
+
+    print(f"\nEntries ({len(entries)}): " + ', '.join(f"{symbol} #{int(rank)}" for symbol, rank in entries['rank'].items()))
+    print(f"Exits ({len(exits)}): " + ', '.join(f"{symbol} (was #{int(rank)})" for symbol, rank in exits['previous_rank'].items()))
+    print("Biggest movers:")
+    for symbol, row in biggest.iterrows():
+        print(f"  {symbol}: #{int(row['previous_rank'])} -> #{int(row['rank'])} ({int(row['change']):+d})")
+
+
+def reusable_charts(folder, previous, meta, rows):
+    """Map new rank -> previous rank for every chart that can be kept as it is."""
+    if previous is None or any(previous.get(key) != meta.get(key) for key in RENDER_KEYS):
+        return {}
+    previous_rows = {row['symbol']: row for row in previous['ranks']}
+    reuse = {}
+    for row in rows:
+        old = previous_rows.get(row['symbol'])
+        if (old is not None and old.get('last_bar') == row.get('last_bar') and old.get('title') == row['title']
+                and os.path.exists(os.path.join(folder, f"{old['rank']}.png"))):
+            reuse[row['rank']] = old['rank']
+    return reuse
+
+
+def clear_previous_outputs(folder, keep_charts=False):
+    """
+    Delete what the previous run left in its folder, as a fresh run starts empty.
+    Only the manifest (already read) and, when keep_charts is set, the numbered
+    png charts that relink_charts may still reuse are kept.
+    """
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if name == MANIFEST_FILE or (keep_charts and name.endswith('.png') and name[:-len('.png')].isdigit()):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def relink_charts(folder, reuse):
+    """Rename reused charts to their new ranks and delete every other chart of the previous run."""
+    # Two passes so a chain of renames (3 -> 4, 4 -> 5) never overwrites a chart still needed
+    for new_rank, old_rank in reuse.items():
+        os.replace(os.path.join(folder, f"{old_rank}.png"), os.path.join(folder, f".{new_rank}.reuse.png"))
+    for name in os.listdir(folder):
+        if name.endswith('.png') and name[:-len('.png')].isdigit():
+            os.remove(os.path.join(folder, name))
+    for new_rank in reuse:
+        os.replace(os.path.join(folder, f".{new_rank}.reuse.png"), os.path.join(folder, f"{new_rank}.png"))
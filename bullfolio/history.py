@@ -0,0 +1,197 @@
+"""
+Rank history across screening runs.
+
+Every run's full rank table is appended to a date-partitioned Parquet store
+(one file per market, screen and session, where a screen is the script with
+its window and interval, e.g. momentum-12months1d), next to a small summary
+table with one breadth row per session. A rerun in the same session replaces
+that session's partition. Queries read only the partitions and columns they
+need and never go back to prices:
+
+    python -m bullfolio.history top --market india [--screen momentum-3months1d] [--top 50] [--sessions 60]
+    python -m bullfolio.history trajectory RELIANCE --market india [--sessions 120]
+    python -m bullfolio.history breadth --market india [--sessions 120]
+
+Breadth is the share of the ranked universe with a positive return over the
+screen's window, so a 3-month screen gives the % of names up over 3 months.
+Requires pyarrow (pip install pyarrow).
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from bullfolio.calendars import last_complete_session, sessions
+from bullfolio.markets import MARKETS
+from bullfolio.store import DATA_DIR
+
+HISTORY_DIR = os.path.join(DATA_DIR, 'ranks')
+PART_FILE = 'part.parquet'
+SUMMARY_FILE = 'summary.parquet'
+
+
+def screen_folder(market, screen):
+    """Folder holding every stored run of one screen in one market."""
+    return os.path.join(HISTORY_DIR, f"market={market}", f"screen={screen}")
+
+
+def partition_path(market, screen, run_date):
+    """File holding the rank table of one screen's run for one session."""
+    return os.path.join(screen_folder(market, screen), f"date={run_date}", PART_FILE)
+
+
+def write_parquet(df, path):
+    """Atomically replace one Parquet file of the history."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, compression='zstd', index=False)
+    os.replace(tmp_path, path)
+
+
+def record_run(market, screen, run_date, ranks):
+    """
+    Store one run's rank table (symbol, rank, score, return) as the session
+    run_date and update the breadth summary with that session's row only.
+    """
+    ranks = ranks[['symbol', 'rank', 'score', 'return']].copy()
+    universe = len(ranks)
+    ranks['rank'] = ranks['rank'].astype('int32')
+    ranks['percentile'] = 100 * (universe - ranks['rank']) / max(universe - 1, 1)
+    write_parquet(ranks, partition_path(market, screen, run_date))
+
+    row = pd.DataFrame([{
+        'date': pd.Timestamp(run_date),
+        'universe': universe,
+        'positive_pct': (ranks['return'] > 0).mean() * 100 if universe else float('nan'),
+        'median_return': ranks['return'].median(),
+        'top_score': ranks['score'].max(),
+    }])
+    summary = read_summary(market, screen)
+    if not summary.empty:
+        row = pd.concat([summary[summary['date'] != row['date'][0]], row], ignore_index=True)
+    write_parquet(row.sort_values('date'), os.path.join(screen_folder(market, screen), SUMMARY_FILE))
+
+
+def stored_screens(market):
+    """Screens with stored runs for market."""
+    folder = os.path.join(HISTORY_DIR, f"market={market}")
+    if not os.path.isdir(folder):
+        return []
+    return sorted(name[len('screen='):] for name in os.listdir(folder) if name.startswith('screen='))
+
+
+def run_dates(market, screen, start=None):
+    """Sessions with a stored run of screen since start, from the partition names alone."""
+    folder = screen_folder(market, screen)
+    if not os.path.isdir(folder):
+        return []
+    dates = sorted(name[len('date='):] for name in os.listdir(folder) if name.startswith('date='))
+    return [day for day in dates if start is None or day >= start]
+
+
+def read_summary(market, screen):
+    """The per-session breadth summary of screen."""
+    path = os.path.join(screen_folder(market, screen), SUMMARY_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['date', 'universe', 'positive_pct', 'median_return', 'top_score'])
+    return pd.read_parquet(path)
+
+
+def read_ranks(market, screen, columns, start=None, symbols=None, max_rank=None):
+    """Long table of (date, symbol, *columns) of the runs since start, read column- and row-filtered."""
+    filters = []
+    if symbols:
+        filters.append(('symbol', 'in', list(symbols)))
+    if max_rank is not None:
+        filters.append(('rank', '<=', max_rank))
+    frames = []
+    for day in run_dates(market, screen, start):
+        df = pd.read_parquet(partition_path(market, screen, day), columns=['symbol'] + list(columns),
+                             filters=filters or None)
+        df.insert(0, 'date', pd.Timestamp(day))
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=['date', 'symbol'] + list(columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def window_start(market, session_count):
+    """First session of the last session_count complete sessions of market, as 'YYYY-MM-DD'."""
+    end = last_complete_session(market)
+    recent = sessions(market, end - pd.Timedelta(days=2 * session_count + 14), end)
+    return recent[-min(session_count, len(recent))].strftime('%Y-%m-%d')
+
+
+def days_in_top(market, screen, top, session_count):
+    """Per symbol: runs in the top ranks over the last sessions, best and latest rank there."""
+    start = window_start(market, session_count)
+    history = read_ranks(market, screen, ['rank'], start=start, max_rank=top)
+    if history.empty:
+        return pd.DataFrame(columns=['days', 'best_rank', 'last_seen']), 0
+    history = history.sort_values('date')
+    table = history.groupby('symbol').agg(days=('date', 'nunique'), best_rank=('rank', 'min'),
+                                          last_seen=('date', 'max'))
+    return table.sort_values(['days', 'best_rank'], ascending=[False, True]), len(run_dates(market, screen, start))
+
+
+def trajectory(market, screen, symbol, session_count):
+    """Rank, percentile and score of one symbol in every run over the last sessions."""
+    history = read_ranks(market, screen, ['rank', 'percentile', 'score'],
+                         start=window_start(market, session_count), symbols=[symbol])
+    return history.drop(columns='symbol').set_index('date')
+
+
+def pick_screen(market, screen):
+    """The requested screen, or the only stored one; None (with a message) otherwise."""
+    screens = stored_screens(market)
+    if screen is None and len(screens) == 1:
+        return screens[0]
+    if screen in screens:
+        return screen
+    if screens:
+        print(f"Choose a screen with --screen: {', '.join(screens)}.")
+    else:
+        print(f"No stored {market} runs yet.")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the rank history of past screening runs.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--market', choices=sorted(MARKETS), required=True)
+    common.add_argument('--screen', help="Screen name, e.g. momentum-12months1d (defaults to the only one stored).")
+    common.add_argument('--sessions', type=int, default=60, help="Look-back window in trading sessions.")
+
+    top_parser = commands.add_parser('top', parents=[common], help="How often names were in the top ranks.")
+    top_parser.add_argument('--top', type=int, default=50)
+    trajectory_parser = commands.add_parser('trajectory', parents=[common], help="Rank path of one symbol.")
+    trajectory_parser.add_argument('symbol')
+    commands.add_parser('breadth', parents=[common], help="Share of the universe with a positive return per run.")
+    args = parser.parse_args()
+
+    screen = pick_screen(args.market, args.screen)
+    if screen is None:
+        return
+
+    if args.command == 'top':
+        table, runs = days_in_top(args.market, screen, args.top, args.sessions)
+        print(f"Days in the top {args.top} of {screen} over the last {args.sessions} sessions ({runs} runs stored):")
+        print(table.to_string() if not table.empty else "No runs in that window.")
+    elif args.command == 'trajectory':
+        history = trajectory(args.market, screen, args.symbol, args.sessions)
+        if history.empty:
+            print(f"{args.symbol} was not ranked by {screen} in the last {args.sessions} sessions.")
+            return
+        print(history.round(2).to_string())
+    else:
+        summary = read_summary(args.market, screen)
+        summary = summary[summary['date'] >= pd.Timestamp(window_start(args.market, args.sessions))]
+        if summary.empty:
+            print("No runs in that window.")
+            return
+        print(summary.set_index('date').round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Technical indicators computed for the whole universe at once.
+
+Every function takes aligned date x ticker matrices (see bullfolio.matrix) and
+uses rolling pandas/NumPy operations over all columns together, so a run
+computes each indicator once rather than once per chart.
+
+Moving averages are counted in bars of the run's interval, the 52-week
+high/low in the bars a year holds at that interval. Screens fetch
+warm-up history before their window (see indicator_start) so the longest
+lookback is filled by the last bar.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from bullfolio.charts import binance_dark
+
+MOVING_AVERAGES = (20, 50, 200)
+ATR_WINDOW = 14
+RSI_WINDOW = 14
+YEAR_BARS = 252  # daily sessions in a year
+VOLUME_WINDOW = 50
+# Bars per year of the intervals that are not intraday
+INTERVAL_YEAR_BARS = {'1d': YEAR_BARS, '5d': 52, '1wk': 52, '1mo': 12, '3mo': 4}
+SESSION_MINUTES = 390  # a US session; India's 375 is close enough for a year's bar count
+INTRADAY_UNITS = {'m': 1, 'h': 60}
+# How far back Yahoo serves intraday bars; warm-up history is cut off there
+INTRADAY_HISTORY_DAYS = {'1m': 7, '60m': 729, '1h': 729}
+DEFAULT_INTRADAY_HISTORY_DAYS = 59
+
+
+def wilder_mean(matrix, window):
+    """Wilder's smoothing (an EMA with alpha 1/window), as used by ATR and RSI."""
+    return matrix.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+
+
+def true_range(high, low, close):
+    """True range matrix: the largest of high-low and the gaps from the previous close."""
+    previous_close = close.shift(1)
+    ranges = np.fmax(high - low, np.fmax((high - previous_close).abs(), (low - previous_close).abs()))
+    return pd.DataFrame(ranges, index=close.index, columns=close.columns)
+
+
+def rsi(close, window=RSI_WINDOW):
+    """Relative strength index of every column."""
+    change = close.diff()
+    gain = wilder_mean(change.clip(lower=0), window)
+    loss = wilder_mean(-change.clip(upper=0), window)
+    return 100 - 100 / (1 + gain / loss.replace(0, np.nan))
+
+
+def year_bars(interval):
+    """Number of bars of interval in a year of trading."""
+    if interval in INTERVAL_YEAR_BARS:
+        return INTERVAL_YEAR_BARS[interval]
+    match = re.fullmatch(r'(\d+)([mh])', interval)
+    if not match:
+        raise ValueError(f"Unknown interval '{interval}'.")
+    minutes = int(match.group(1)) * INTRADAY_UNITS[match.group(2)]
+    return YEAR_BARS * max(SESSION_MINUTES // minutes, 1)
+
+
+def indicator_start(start_date, interval):
+    """
+    Date to fetch from so that the longest lookback (the 200-bar average or
+    the 52-week high) is filled from start_date on. Intraday history only
+    goes back as far as the provider serves it.
+    """
+    bars = max(max(MOVING_AVERAGES), year_bars(interval))
+    # A year of bars spans 365 calendar days; a week more covers holidays
+    days = int(np.ceil(bars / year_bars(interval) * 365)) + 7
+    start = pd.Timestamp(start_date) - pd.Timedelta(days=days)
+    if interval not in INTERVAL_YEAR_BARS:
+        limit = INTRADAY_HISTORY_DAYS.get(interval, DEFAULT_INTRADAY_HISTORY_DAYS)
+        start = min(max(start, pd.Timestamp.today().normalize() - pd.Timedelta(days=limit)), pd.Timestamp(start_date))
+    return start.strftime('%Y-%m-%d')
+
+
+def compute_indicators(panel, interval='1d'):
+    """Full indicator matrices for a panel with at least a Close matrix."""
+    close = panel['Close']
+    high = panel.get('High', close)
+    low = panel.get('Low', close)
+
+    indicators = {f'sma_{window}': close.rolling(window).mean() for window in MOVING_AVERAGES}
+    indicators['atr'] = wilder_mean(true_range(high, low, close), ATR_WINDOW)
+    indicators['rsi'] = rsi(close)
+    indicators['high_52w'] = high.rolling(year_bars(interval), min_periods=1).max()
+    indicators['low_52w'] = low.rolling(year_bars(interval), min_periods=1).min()
+    if 'Volume' in panel:
+        volume = panel['Volume']
+        indicators['volume_surge'] = volume / volume.rolling(VOLUME_WINDOW, min_periods=1).mean().shift(1)
+        indicators['up_volume_ratio'] = up_volume_ratio(close, volume)
+    return indicators
+
+
+def up_volume_ratio(close, volume, window=VOLUME_WINDOW):
+    """Volume traded on up bars divided by volume on down bars over the window."""
+    change = close.diff()
+    up_volume = volume.where(change > 0, 0).rolling(window, min_periods=1).sum()
+    down_volume = volume.where(change < 0, 0).rolling(window, min_periods=1).sum()
+    return up_volume / down_volume.replace(0, np.nan)
+
+
+def latest(matrix):
+    """Last valid value of every column."""
+    return matrix.ffill().iloc[-1]
+
+
+def indicator_table(panel, indicators):
+    """Latest indicator values per ticker, the table filter criteria run against."""
+    close = latest(panel['Close'])
+    table = pd.DataFrame({'close': close})
+    for window in MOVING_AVERAGES:
+        table[f'sma_{window}'] = latest(indicators[f'sma_{window}'])
+    table['atr_pct'] = latest(indicators['atr']) / close * 100
+    table['rsi'] = latest(indicators['rsi'])
+    table['dist_52w_high'] = (close / latest(indicators['high_52w']) - 1) * 100
+    table['dist_52w_low'] = (close / latest(indicators['low_52w']) - 1) * 100
+    if 'volume_surge' in indicators:
+        table['volume_surge'] = latest(indicators['volume_surge'])
+        table['up_volume_ratio'] = latest(indicators['up_volume_ratio'])
+    return table
+
+
+def apply_filter(table, expression):
+    """
+    Keep the rows of an indicator table matching a pandas query expression,
+    e.g. "close > sma_200 and rsi > 60 and dist_52w_high > -10".
+    """
+    return table.query(expression)
+
+
+def empty_columns(table, expression):
+    """Columns used by a filter expression that have no value for any symbol."""
+    return [column for column in table.columns
+            if table[column].isna().all() and re.search(rf'\b{column}\b', expression)]
+
+
+def moving_average_addplots(indicators, ticker, index):
+    """mplfinance addplots of the precomputed moving averages of one ticker."""
+    import mplfinance as mpf
+
+    addplots = []
+    for window, color in zip(MOVING_AVERAGES, binance_dark['mavcolors']):
+        matrix = indicators[f'sma_{window}']
+        if ticker not in matrix.columns:
+            continue
+        series = matrix[ticker].reindex(index)
+        if series.notna().any():
+            addplots.append(mpf.make_addplot(series, color=color, width=0.7))
+    return addplots
@@ -0,0 +1,71 @@
+import json
+import os
+from datetime import datetime
+
+from bullfolio.store import DATA_DIR
+
+MANIFEST_FILE = 'manifest.json'
+MARKETS_FILE = 'markets.json'
+LATEST_RUN_FILE = os.path.join(DATA_DIR, 'latest_run.json')
+
+
+def write_manifest(folder, meta, rows, latest=True):
+    """
+    Write the run parameters and ranked rows into folder/manifest.json. With
+    latest, the tools run without a folder argument use this run from now on.
+    """
+    manifest = dict(meta)
+    manifest['created'] = datetime.now().isoformat(timespec='seconds')
+    manifest['ranks'] = rows
+    with open(os.path.join(folder, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+    if latest:
+        write_latest_run(folder)
+    return manifest
+
+
+def write_latest_run(folder):
+    """Point the tools run without a folder argument at folder, replacing the pointer in one step."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = f"{LATEST_RUN_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'folder': os.path.abspath(folder)}, f)
+    os.replace(tmp_path, LATEST_RUN_FILE)
+
+
+def write_markets_manifest(folder, meta, manifests):
+    """
+    Write folder/markets.json combining the manifests of a multi-market run,
+    keyed by market; each market's charts and manifest are in folder/<market>.
+    """
+    combined = dict(meta)
+    combined['created'] = datetime.now().isoformat(timespec='seconds')
+    combined['markets'] = {market: dict(manifest, folder=market) for market, manifest in manifests.items()}
+    with open(os.path.join(folder, MARKETS_FILE), 'w') as f:
+        json.dump(combined, f, indent=1)
+    return combined
+
+
+def read_manifest(folder):
+    """Read the manifest of a run folder, or None if the run has none."""
+    path = os.path.join(folder, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def latest_run_folder():
+    """Return the folder of the most recent run that wrote a manifest."""
+    if not os.path.exists(LATEST_RUN_FILE):
+        return None
+    with open(LATEST_RUN_FILE) as f:
+        return json.load(f).get('folder')
+
+
+def rank_table(manifest):
+    """The ranked rows of a manifest as a DataFrame indexed by symbol."""
+    import pandas as pd
+
+    return pd.DataFrame(manifest['ranks']).set_index('symbol')
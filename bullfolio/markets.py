@@ -0,0 +1,47 @@
+import time
+
+# Per-market settings shared by the screeners
+MARKETS = {
+    'india': {
+        'suffix': '.NS',
+        'csv_file': 'india.csv',
+        'benchmark': '^CRSLDX',  # NIFTY 500 (use ^NSEI for NIFTY 50)
+        'currency': 'INR',
+        'timezone': 'Asia/Kolkata',
+        'calendar': 'XBOM',  # exchange_calendars code; NSE and BSE share their holidays
+        'close': '15:30',
+        'requests_per_second': 2,
+    },
+    'us': {
+        'suffix': '',  # US stocks don't need a suffix for yfinance
+        'csv_file': 'us.csv',
+        'benchmark': '^GSPC',  # S&P 500
+        'currency': 'USD',
+        'timezone': 'America/New_York',
+        'calendar': 'XNYS',
+        'close': '16:00',
+        'requests_per_second': 4,
+    },
+}
+
+_last_request = {}
+
+
+def parse_markets(text):
+    """Market names from a prompt answer like 'india', 'india,us' or 'all'."""
+    text = text.strip().lower()
+    if text == 'all':
+        return list(MARKETS)
+    markets = [name.strip() for name in text.split(',') if name.strip()]
+    unknown = [name for name in markets if name not in MARKETS]
+    if not markets or unknown:
+        raise ValueError(f"Unknown market '{', '.join(unknown) or text}'. Choose from: {', '.join(MARKETS)} or all.")
+    return list(dict.fromkeys(markets))
+
+
+def throttle(market):
+    """Wait until the market's fetch rate limit allows another request."""
+    wait = 1 / MARKETS[market]['requests_per_second'] - (time.monotonic() - _last_request.get(market, 0))
+    if wait > 0:
+        time.sleep(wait)
+    _last_request[market] = time.monotonic()
@@ -0,0 +1,21 @@
+import pandas as pd
+
+
+def field_matrix(frames, field='Close'):
+    """Align one column of many cleaned frames into a date x ticker matrix."""
+    columns = {ticker: data[field] for ticker, data in frames.items()
+               if data is not None and field in data.columns}
+    if not columns:
+        return pd.DataFrame()
+    return pd.concat(columns, axis=1).sort_index()
+
+
+def first_and_last(matrix):
+    """First and last valid value of every column, as two Series."""
+    return matrix.bfill().iloc[0], matrix.ffill().iloc[-1]
+
+
+def build_panel(frames, fields=('Open', 'High', 'Low', 'Close', 'Volume')):
+    """Aligned date x ticker matrices for several fields, keyed by field name."""
+    panel = {field: field_matrix(frames, field) for field in fields}
+    return {field: matrix for field, matrix in panel.items() if not matrix.empty}
@@ -0,0 +1,262 @@
+"""
+Output backends for a run's charts.
+
+Every backend receives the ranked charts one figure at a time and writes them
+out straight away, so memory use does not grow with the number of charts:
+
+    png    one <rank>.png per chart in the run folder (the default)
+    html   a single self-contained report.html with WebP images, the rank
+           table and run parameters inline, decoded only when scrolled to
+    pdf    a multi-page report.pdf "chart book", one page per chart
+
+The vector backends skip matplotlib altogether and receive the prepared OHLC
+frame instead of a figure (see bullfolio.vector):
+
+    svg    one small <rank>.svg per chart
+    canvas a single charts.html with the OHLC data inline, drawn on canvases
+"""
+import base64
+import html
+import io
+import json
+import os
+
+from bullfolio.charts import save_figure
+from bullfolio.vector import DOWN_COLOR, UP_COLOR, candle_svg, chart_json
+
+HTML_REPORT = 'report.html'
+PDF_REPORT = 'report.pdf'
+CANVAS_REPORT = 'charts.html'
+HTML_DPI = 150  # half the PNG resolution keeps a 500-chart report shareable
+WEBP_QUALITY = 80
+ROW_FIELDS = ('rank', 'symbol', 'score', 'excess_return', 'rs_return', 'last_bar')
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<style>
+  body {{ margin: 0; background: #161a1e; color: #d1d4dc; font-family: sans-serif; }}
+  header {{ padding: 12px 20px; border-bottom: 1px solid #2c2e31; }}
+  figure {{ margin: 20px auto; max-width: 1400px; }}
+  figure img {{ width: 100%; min-height: 200px; background: #1b1f24; }}
+  figcaption {{ font-size: 14px; padding: 4px 0; }}
+</style>
+</head>
+<body>
+<header><h1>{title}</h1><p>{summary}</p></header>
+<script type="application/json" id="run-meta">{meta}</script>
+"""
+
+HTML_TAIL = """<script>
+  // Images are inlined as data-src and only decoded once they come into view
+  const observer = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+      if (entry.isIntersecting) {
+        entry.target.src = entry.target.dataset.src;
+        observer.unobserve(entry.target);
+      }
+    }
+  }, { rootMargin: '800px' });
+  document.querySelectorAll('img[data-src]').forEach((img) => observer.observe(img));
+</script>
+</body>
+</html>
+"""
+
+
+def row_metadata(row):
+    """The fields of a manifest row worth showing next to its chart."""
+    return {field: row[field] for field in ROW_FIELDS if row.get(field) is not None}
+
+
+class PngFolderOutput:
+    """One <rank>.png per chart in the run folder."""
+
+    def __init__(self, folder, meta):
+        self.folder = folder
+
+    def add(self, row, figure):
+        file_name = os.path.join(self.folder, f"{row['rank']}.png")
+        save_figure(figure, file_name)
+        return file_name
+
+    def close(self):
+        return self.folder
+
+
+class HtmlReportOutput:
+    """A single self-contained HTML page, written chart by chart."""
+
+    def __init__(self, folder, meta):
+        self.path = os.path.join(folder, HTML_REPORT)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        title = f"{meta.get('script', 'Run')} {meta.get('market', '')} {meta.get('interval', '')}".strip()
+        summary = f"From {meta.get('start_date')} - created {meta.get('created', '')}".strip(' -')
+        # Entities are not decoded inside a script element; only "</" has to be kept out of it
+        self.file.write(HTML_HEAD.format(title=html.escape(title), summary=html.escape(summary),
+                                         meta=json.dumps(meta, default=str).replace('</', '<\\/')))
+
+    def add(self, row, figure):
+        from PIL import Image
+
+        png = io.BytesIO()
+        save_figure(figure, png, format='png', dpi=HTML_DPI)
+        webp = io.BytesIO()
+        Image.open(png).save(webp, format='WEBP', quality=WEBP_QUALITY, method=6)
+        data = base64.b64encode(webp.getvalue()).decode('ascii')
+        metadata = json.dumps(row_metadata(row), default=str)
+        self.file.write(
+            f'<figure id="rank-{row["rank"]}" data-meta="{html.escape(metadata)}">'
+            f'<figcaption>#{row["rank"]} {html.escape(row.get("title", row["symbol"]))}</figcaption>'
+            f'<img alt="{html.escape(row["symbol"])}" data-src="data:image/webp;base64,{data}"></figure>\n'
+        )
+        return self.path
+
+    def close(self):
+        self.file.write(HTML_TAIL)
+        self.file.close()
+        return self.path
+
+
+class PdfBookOutput:
+    """A multi-page PDF, each page flushed to disk as soon as it is drawn."""
+
+    def __init__(self, folder, meta):
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        self.path = os.path.join(folder, PDF_REPORT)
+        self.pdf = PdfPages(self.path)
+        info = self.pdf.infodict()
+        info['Title'] = f"{meta.get('script', 'Run')} {meta.get('market', '')} from {meta.get('start_date')}"
+
+    def add(self, row, figure):
+        self.pdf.savefig(figure)
+        return self.path
+
+    def close(self):
+        self.pdf.close()
+        return self.path
+
+
+OUTPUTS = {
+    'png': PngFolderOutput,
+    'html': HtmlReportOutput,
+    'pdf': PdfBookOutput,
+}
+
+
+CANVAS_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<style>
+  body {{ margin: 0; background: #161a1e; color: #d1d4dc; font-family: sans-serif; }}
+  h1 {{ padding: 12px 20px; margin: 0; border-bottom: 1px solid #2c2e31; }}
+  figure {{ margin: 20px auto; max-width: 1400px; }}
+  canvas {{ width: 100%; height: 540px; background: #1b1f24; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div id="charts"></div>
+<script>
+const runMeta = {meta};
+const charts = [
+"""
+
+CANVAS_TAIL = """];
+function draw(canvas, chart) {{
+  const ratio = window.devicePixelRatio || 1;
+  const width = canvas.clientWidth, height = canvas.clientHeight;
+  canvas.width = width * ratio; canvas.height = height * ratio;
+  const ctx = canvas.getContext('2d');
+  ctx.scale(ratio, ratio);
+  const bars = chart.ohlc, pad = 60;
+  const low = Math.min(...bars.map((b) => b[2])), high = Math.max(...bars.map((b) => b[1]));
+  const y = (price) => 10 + (high - price) / ((high - low) || 1) * (height - 30);
+  const step = (width - pad) / bars.length;
+  ctx.fillStyle = '#d1d4dc'; ctx.font = '11px sans-serif';
+  for (let i = 0; i <= 4; i++) {{
+    const price = low + (high - low) * i / 4;
+    ctx.fillText(price.toFixed(2), width - pad + 6, y(price) + 4);
+  }}
+  ctx.fillText(chart.dates[0], 4, height - 4);
+  ctx.fillText(chart.dates[chart.dates.length - 1], width - pad - 70, height - 4);
+  bars.forEach(([open, barHigh, barLow, close], i) => {{
+    const x = step * (i + 0.5);
+    ctx.strokeStyle = ctx.fillStyle = close >= open ? '{up}' : '{down}';
+    ctx.beginPath(); ctx.moveTo(x, y(barHigh)); ctx.lineTo(x, y(barLow)); ctx.stroke();
+    ctx.fillRect(x - step * 0.35, Math.min(y(open), y(close)), Math.max(step * 0.7, 1), Math.max(Math.abs(y(open) - y(close)), 0.5));
+  }});
+}}
+const container = document.getElementById('charts');
+const observer = new IntersectionObserver((entries) => {{
+  for (const entry of entries) {{
+    if (entry.isIntersecting) {{
+      draw(entry.target, charts[entry.target.dataset.index]);
+      observer.unobserve(entry.target);
+    }}
+  }}
+}}, {{ rootMargin: '800px' }});
+charts.forEach((chart, index) => {{
+  const figure = document.createElement('figure');
+  const caption = document.createElement('figcaption');
+  caption.textContent = '#' + chart.rank + ' ' + chart.title;
+  const canvas = document.createElement('canvas');
+  canvas.dataset.index = index;
+  figure.append(caption, canvas);
+  container.append(figure);
+  observer.observe(canvas);
+}});
+</script>
+</body>
+</html>
+"""
+
+
+class SvgFolderOutput:
+    """One <rank>.svg per chart, drawn from the OHLC data without matplotlib."""
+
+    def __init__(self, folder, meta):
+        self.folder = folder
+
+    def add(self, row, data):
+        file_name = os.path.join(self.folder, f"{row['rank']}.svg")
+        with open(file_name, 'w', encoding='utf-8') as f:
+            f.write(candle_svg(data, row['title']))
+        return file_name
+
+    def close(self):
+        return self.folder
+
+
+class CanvasReportOutput:
+    """A single charts.html holding every chart's OHLC data, drawn by the browser."""
+
+    def __init__(self, folder, meta):
+        self.path = os.path.join(folder, CANVAS_REPORT)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        title = f"{meta.get('script', 'Run')} {meta.get('market', '')} {meta.get('interval', '')}".strip()
+        meta = json.dumps(meta, default=str).replace('</', '<\\/')
+        self.file.write(CANVAS_HEAD.format(title=html.escape(title), meta=meta))
+
+    def add(self, row, data):
+        chart = chart_json(data, row['title'])
+        chart.update(row_metadata(row))
+        # Escape "</" so no value can close the script element early
+        self.file.write(json.dumps(chart, default=str).replace('</', '<\\/') + ',\n')
+        return self.path
+
+    def close(self):
+        self.file.write(CANVAS_TAIL.format(up=UP_COLOR, down=DOWN_COLOR))
+        self.file.close()
+        return self.path
+
+
+VECTOR_OUTPUTS = {
+    'svg': SvgFolderOutput,
+    'canvas': CanvasReportOutput,
+}
@@ -0,0 +1,14 @@
+from bullfolio.indicators import moving_average_addplots
+from bullfolio.relstrength import rs_addplot
+
+
+def build_addplots(data, key, benchmark_close=None, indicators=None, volume=False):
+    """Collect the optional chart overlays for one prepared frame, or None if there are none."""
+    addplots = []
+    if indicators is not None:
+        addplots.extend(moving_average_addplots(indicators, key, data.index))
+    if benchmark_close is not None:
+        # The volume panel, when shown, takes panel 1 so the RS line moves below it
+        panel = 2 if volume and 'Volume' in data.columns else 1
+        addplots.append(rs_addplot(data, benchmark_close, panel=panel))
+    return addplots or None
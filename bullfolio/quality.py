@@ -0,0 +1,119 @@
+"""
+Data-quality checks run on freshly fetched bars before anything is ranked.
+
+All symbols of a run are checked together on the aligned date x ticker
+matrices, so one pass covers the whole universe. Symbols failing a rule are
+quarantined: they are left out of the ranking and the charts, and the run
+manifest lists them with the reasons. Every rule can be changed or switched
+off (set to 0), e.g. --quality-rules "max_bar_change=0.8,max_stale_days=30".
+"""
+import pandas as pd
+
+from bullfolio.matrix import build_panel
+
+DEFAULT_RULES = {
+    'positive_prices': 1,  # no zero or negative open, high, low or close
+    'unique_dates': 1,  # no two bars with the same timestamp
+    'min_bars': 2,
+    'max_bar_change': 0.5,  # largest split-adjusted close-to-close move, as a fraction
+    'max_stale_days': 14,  # how far the last bar may lag the newest bar of the universe
+}
+# Weekly and longer bars hold genuine moves past max_bar_change (the momentum leaders),
+# so the one-bar check is off for them unless it is set explicitly
+COARSE_INTERVALS = ('5d', '1wk', '1mo', '3mo')
+
+
+def default_rules(interval='1d'):
+    """The default rules for bars of interval."""
+    rules = dict(DEFAULT_RULES)
+    if interval in COARSE_INTERVALS:
+        rules['max_bar_change'] = 0
+    return rules
+
+
+def parse_rules(text, interval='1d'):
+    """Parse "max_bar_change=0.8,min_bars=20" into a rules dict, starting from the defaults for interval."""
+    rules = default_rules(interval)
+    if not text:
+        return rules
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_RULES:
+            raise ValueError(f"Unknown quality rule '{name}'. Choose from: {', '.join(DEFAULT_RULES)}.")
+        rules[name] = float(value)
+    return rules
+
+
+def check_frames(frames, rules=None, moves_since=None):
+    """
+    Check cleaned frames keyed by symbol against the rules. Returns the frames
+    that passed and a {symbol: [reason, ...]} dict of the quarantined ones.
+    With moves_since, only one-bar moves into bars from that date on count, so
+    a long history is not failed for one old jump (a demerger, a listing day).
+    """
+    rules = rules or DEFAULT_RULES
+    reasons = {}
+
+    def flag(symbols, reason):
+        for symbol in symbols:
+            reasons.setdefault(symbol, []).append(reason(symbol) if callable(reason) else reason)
+
+    if rules['unique_dates']:
+        flag([symbol for symbol, data in frames.items() if data.index.has_duplicates], 'duplicate timestamps')
+    # Duplicates are dropped only so the frames can be aligned for the remaining checks
+    unique = {symbol: data[~data.index.duplicated(keep='last')] for symbol, data in frames.items()}
+    panel = build_panel(unique, ('Open', 'High', 'Low', 'Close'))
+    if 'Close' not in panel:
+        return {}, reasons
+    close = panel['Close']
+
+    if rules['positive_prices']:
+        nonpositive = pd.concat([(matrix <= 0).any() for matrix in panel.values()], axis=1).any(axis=1)
+        flag(nonpositive.index[nonpositive], 'zero or negative price')
+    if rules['min_bars']:
+        bars = close.notna().sum()
+        flag(bars.index[bars < rules['min_bars']], lambda symbol: f"only {bars[symbol]} bars")
+    if rules['max_bar_change']:
+        change = close.ffill().pct_change().abs()
+        if moves_since is not None:
+            change = change.loc[pd.Timestamp(moves_since):]
+        change = change.max()
+        flag(change.index[change > rules['max_bar_change']], lambda symbol: f"{change[symbol]:.1%} one-bar move")
+    if rules['max_stale_days']:
+        last_bar = close.notna().iloc[::-1].idxmax()
+        lag = (close.index.max() - pd.to_datetime(last_bar)).dt.days
+        flag(lag.index[lag > rules['max_stale_days']], lambda symbol: f"last bar {lag[symbol]} days old")
+
+    passed = {symbol: data for symbol, data in frames.items() if symbol not in reasons}
+    return passed, reasons
+
+
+def check_highs(frames, rules=None):
+    """
+    Quarantine symbols whose highest close was reached or left by a one-bar
+    move above max_bar_change, i.e. a high that is likely a bad bar. Returns
+    the frames that passed and the reasons like check_frames.
+    """
+    rules = rules or DEFAULT_RULES
+    if not rules['max_bar_change'] or not frames:
+        return frames, {}
+    close = build_panel(frames, ('Close',))['Close'].ffill()
+    change = close.pct_change().abs().to_numpy()
+    high = close.index.get_indexer(close.idxmax())
+    columns = range(close.shape[1])
+    into = change[high, columns]
+    out_of = change[[min(position + 1, len(close) - 1) for position in high], columns]
+    spike = pd.Series(pd.DataFrame({'into': into, 'out_of': out_of}).max(axis=1).to_numpy(), index=close.columns)
+    spike = spike[spike > rules['max_bar_change']]
+    reasons = {symbol: [f"high set by a {move:.1%} one-bar move"] for symbol, move in spike.items()}
+    return {symbol: data for symbol, data in frames.items() if symbol not in reasons}, reasons
+
+
+def print_quarantine(quarantine):
+    """Summarise quarantined symbols and why."""
+    if not quarantine:
+        return
+    print(f"Quarantined {len(quarantine)} symbols with bad data:")
+    for symbol, symbol_reasons in sorted(quarantine.items()):
+        print(f"  {symbol}: {'; '.join(symbol_reasons)}")
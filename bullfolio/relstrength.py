@@ -0,0 +1,64 @@
+import pandas as pd
+
+from bullfolio.calendars import download_end
+from bullfolio.charts import clean_and_prepare_data
+from bullfolio.matrix import first_and_last
+
+RS_LINE_COLOR = "#62b8ba"
+
+
+def fetch_benchmark(ticker, start_date, interval, end_date=None):
+    """Fetch the benchmark index once per run and return its cleaned frame."""
+    import yfinance as yf
+
+    try:
+        data = yf.download(ticker, start=start_date, end=end_date and download_end(end_date), interval=interval)
+        if data.empty or len(data) < 2:
+            print(f"Insufficient data for benchmark {ticker}.")
+            return None
+        return clean_and_prepare_data(data, ticker)
+    except Exception as e:
+        print(f"Error fetching benchmark {ticker}: {e}")
+        return None
+
+
+def relative_strength(closes, benchmark_close):
+    """
+    Score every column of a date x ticker close matrix against the benchmark.
+
+    Returns a DataFrame indexed by ticker with the raw return, the benchmark
+    return over the same span, the excess return and the return of the
+    ratio (RS) line, all in percent.
+    """
+    benchmark_close = benchmark_close.reindex(closes.index.union(benchmark_close.index)).ffill()
+    benchmark_close = benchmark_close.reindex(closes.index)
+    ratio = closes.div(benchmark_close, axis=0)
+
+    start, end = first_and_last(closes)
+    ratio_start, ratio_end = first_and_last(ratio)
+    stock_growth = end / start
+    rs_growth = ratio_end / ratio_start
+    benchmark_growth = stock_growth / rs_growth
+
+    table = pd.DataFrame({
+        'return': (stock_growth - 1) * 100,
+        'benchmark_return': (benchmark_growth - 1) * 100,
+        'excess_return': (stock_growth - benchmark_growth) * 100,
+        'rs_return': (rs_growth - 1) * 100,
+    })
+    return table.dropna()
+
+
+def rs_line(data, benchmark_close):
+    """RS line of one prepared frame against the benchmark, rebased to 1."""
+    benchmark_close = benchmark_close.reindex(data.index.union(benchmark_close.index)).ffill()
+    ratio = data['Close'] / benchmark_close.reindex(data.index)
+    return ratio / ratio.dropna().iloc[0]
+
+
+def rs_addplot(data, benchmark_close, panel=1):
+    """mplfinance addplot drawing the RS line in a panel below the candles."""
+    import mplfinance as mpf
+
+    return mpf.make_addplot(rs_line(data, benchmark_close), panel=panel, color=RS_LINE_COLOR,
+                            width=0.8, ylabel='RS')
@@ -0,0 +1,126 @@
+"""
+Sector rotation report for a screening run.
+
+Joins the run's rank table with the Sector column of the market CSV, scores
+each sector by the median period return of its names and its breadth (share
+of names with a positive return) in a single groupby, and renders one heatmap
+of the result. The return is used whatever the run ranked by (RSI, a
+composite z-score, ...), so the percentages always mean the same thing.
+
+    python -m bullfolio.sectors [run_folder] [--top-sectors 5] [--top-k 5]
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from bullfolio.manifest import latest_run_folder, rank_table, read_manifest
+from bullfolio.markets import MARKETS
+
+SECTOR_FILE = 'sectors.png'
+HEATMAP_COLUMNS = ['median', 'mean', 'breadth', 'best']
+
+
+def read_sectors(csv_file):
+    """Map each symbol of a market CSV to its sector."""
+    df = pd.read_csv(csv_file, usecols=['Symbol', 'Sector'])
+    return df.drop_duplicates('Symbol').set_index('Symbol')['Sector'].fillna('Unknown')
+
+
+def sector_table(ranks, sectors):
+    """Aggregate a rank table (indexed by symbol, with a return column in percent) by sector."""
+    scored = ranks.join(sectors, how='inner')
+    table = scored.groupby('Sector')['return'].agg(
+        count='size',
+        median='median',
+        mean='mean',
+        breadth=lambda s: (s > 0).mean() * 100,
+        best='max',
+    )
+    return table.sort_values(['median', 'breadth'], ascending=False)
+
+
+def top_names_by_sector(ranks, sectors, sector_names, top_k):
+    """The top_k best-ranked names inside each of the given sectors."""
+    scored = ranks.join(sectors, how='inner')
+    scored = scored[scored['Sector'].isin(sector_names)].sort_values('rank')
+    return scored.groupby('Sector', sort=False).head(top_k)
+
+
+def save_sector_heatmap(table, file_name, title):
+    """Render the sector table as one compact heatmap, colouring each column on its own scale."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    values = table[HEATMAP_COLUMNS]
+    spread = (values.max() - values.min()).replace(0, 1)
+    scaled = (values - values.min()) / spread
+
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots(figsize=(6, 0.3 * len(table) + 1.2))
+    ax.imshow(scaled.to_numpy(), cmap='RdYlGn', aspect='auto', vmin=0, vmax=1)
+    for (row, col), value in pd.DataFrame(values.to_numpy()).stack().items():
+        ax.text(col, row, f"{value:.1f}", ha='center', va='center', fontsize=6, color='black')
+    ax.set_xticks(range(len(HEATMAP_COLUMNS)))
+    ax.set_xticklabels(['Median %', 'Mean %', 'Breadth %', 'Best %'], fontsize=7)
+    ax.set_yticks(range(len(table)))
+    ax.set_yticklabels([f"{sector} ({count})" for sector, count in table['count'].items()], fontsize=6)
+    ax.xaxis.tick_top()
+    ax.set_title(title, fontsize=9, pad=20)
+    fig.savefig(file_name, dpi=200, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank sectors from the scored universe of a run.")
+    parser.add_argument('folder', nargs='?', help="Run folder (defaults to the latest run).")
+    parser.add_argument('--top-sectors', type=int, default=5, help="Sectors to list names for.")
+    parser.add_argument('--top-k', type=int, default=5, help="Names to list inside each top sector.")
+    args = parser.parse_args()
+
+    folder = args.folder or latest_run_folder()
+    manifest = read_manifest(folder) if folder else None
+    if manifest is None:
+        print("No run manifest found. Run a screener first.")
+        return
+    market = manifest.get('market')
+    if market not in MARKETS:
+        print(f"Run in {folder} has no known market to read sectors from.")
+        return
+
+    try:
+        sectors = read_sectors(MARKETS[market]['csv_file'])
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error reading sectors: {e}")
+        return
+
+    ranks = rank_table(manifest)
+    if 'return' not in ranks.columns:
+        # Runs from before rows kept their return only have it as the score when ranked by return
+        if manifest.get('rank_by') or manifest.get('composite_weights'):
+            print(f"Run in {folder} has no returns stored for its names. Run the screen again.")
+            return
+        ranks['return'] = ranks['score']
+    table = sector_table(ranks, sectors)
+    if table.empty:
+        print("No ranked symbols have a sector.")
+        return
+
+    table.to_csv(os.path.join(folder, 'sectors.csv'))
+    file_name = os.path.join(folder, SECTOR_FILE)
+    save_sector_heatmap(table, file_name, f"Sector momentum - {market} {manifest['interval']} since {manifest['start_date']}")
+
+    print(table.round(2).to_string())
+    print(f"\nSector heatmap saved as {file_name}.")
+
+    top_sectors = list(table.index[:args.top_sectors])
+    leaders = top_names_by_sector(ranks, sectors, top_sectors, args.top_k)
+    for sector in top_sectors:
+        print(f"\n{sector}:")
+        for symbol, row in leaders[leaders['Sector'] == sector].iterrows():
+            print(f"  {row['rank']}. {symbol}: {row['return']:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
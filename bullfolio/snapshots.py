@@ -0,0 +1,163 @@
+"""
+Compressed history of the screener snapshots (india.csv / us.csv).
+
+Each export is a single day of price, volume, valuation and rating data that
+gets overwritten by the next one. ingest appends it to a date-partitioned
+Parquet store (one zstd-compressed file per market and day); query reads only
+the requested columns from the partitions inside the date range.
+
+    python -m bullfolio.snapshots ingest india.csv [--market india] [--date 2026-10-19]
+    python -m bullfolio.snapshots query --market india --columns relative_volume,pe,rating \\
+        --symbols RELIANCE,TCS --days 90
+
+Requires pyarrow (pip install pyarrow).
+"""
+import argparse
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from bullfolio.markets import MARKETS
+from bullfolio.store import DATA_DIR
+
+SNAPSHOT_DIR = os.path.join(DATA_DIR, 'snapshots')
+PART_FILE = 'part.parquet'
+
+# Screener export columns and the short names they are stored under
+SNAPSHOT_COLUMNS = {
+    'Symbol': 'symbol',
+    'Description': 'name',
+    'Price': 'price',
+    'Price - Currency': 'currency',
+    'Price Change % 1 day': 'change_1d',
+    'Volume 1 day': 'volume',
+    'Relative Volume 1 day': 'relative_volume',
+    'Market capitalization': 'market_cap',
+    'Price to earnings ratio': 'pe',
+    'EPS diluted, Trailing 12 months': 'eps_ttm',
+    'EPS diluted growth %, TTM YoY': 'eps_growth',
+    'Dividend yield %, Trailing 12 months': 'dividend_yield',
+    'Sector': 'sector',
+    'Analyst Rating': 'rating',
+}
+CATEGORY_COLUMNS = ['currency', 'sector', 'rating']
+
+
+def partition_path(market, snapshot_date):
+    """File holding one market's snapshot for one day."""
+    return os.path.join(SNAPSHOT_DIR, f"market={market}", f"date={snapshot_date}", PART_FILE)
+
+
+def read_snapshot_csv(csv_file):
+    """Read a screener export into the compact stored layout."""
+    df = pd.read_csv(csv_file)
+    df = df[[column for column in SNAPSHOT_COLUMNS if column in df.columns]].rename(columns=SNAPSHOT_COLUMNS)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    if 'volume' in df.columns:
+        df['volume'] = pd.to_numeric(df['volume'], errors='coerce').astype('Int64')
+    return df.drop_duplicates('symbol')
+
+
+def ingest(csv_file, market, snapshot_date=None):
+    """Store one screener export as the snapshot of market on snapshot_date (default today)."""
+    snapshot_date = snapshot_date or date.today().isoformat()
+    df = read_snapshot_csv(csv_file)
+    path = partition_path(market, snapshot_date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, compression='zstd', index=False)
+    os.replace(tmp_path, path)
+    return path, len(df)
+
+
+def snapshot_dates(market, start=None, end=None):
+    """Stored snapshot dates of market within [start, end], from the partition names alone."""
+    folder = os.path.join(SNAPSHOT_DIR, f"market={market}")
+    if not os.path.isdir(folder):
+        return []
+    dates = sorted(name[len('date='):] for name in os.listdir(folder) if name.startswith('date='))
+    return [day for day in dates if (start is None or day >= start) and (end is None or day <= end)]
+
+
+def query(market, columns, symbols=None, start=None, end=None):
+    """
+    Long table of (date, symbol, *columns) for the snapshots between start and
+    end, reading only the requested columns of the partitions in range.
+    """
+    filters = [('symbol', 'in', list(symbols))] if symbols else None
+    frames = []
+    for day in snapshot_dates(market, start, end):
+        df = pd.read_parquet(partition_path(market, day), columns=['symbol'] + list(columns), filters=filters)
+        df.insert(0, 'date', pd.Timestamp(day))
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=['date', 'symbol'] + list(columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize_changes(history, columns):
+    """First and last value of every column per symbol, with the change for numeric columns."""
+    history = history.sort_values('date')
+    grouped = history.groupby('symbol', observed=True)
+    summary = {}
+    for column in columns:
+        first = grouped[column].first()
+        last = grouped[column].last()
+        summary[f'{column}_first'] = first
+        summary[f'{column}_last'] = last
+        if pd.api.types.is_numeric_dtype(history[column]):
+            summary[f'{column}_change'] = last - first
+    summary = pd.DataFrame(summary)
+    summary.insert(0, 'snapshots', grouped.size())
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep and query the history of screener snapshots.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help="Append a screener export to the history.")
+    ingest_parser.add_argument('csv_file')
+    ingest_parser.add_argument('--market', choices=sorted(MARKETS))
+    ingest_parser.add_argument('--date', help="Snapshot date (defaults to today).")
+
+    query_parser = commands.add_parser('query', help="Show how columns changed for some symbols.")
+    query_parser.add_argument('--market', choices=sorted(MARKETS), required=True)
+    query_parser.add_argument('--columns', required=True,
+                              help=f"Comma-separated, from: {', '.join(list(SNAPSHOT_COLUMNS.values())[1:])}.")
+    query_parser.add_argument('--symbols', help="Comma-separated symbols (defaults to all).")
+    query_parser.add_argument('--days', type=int, default=90, help="Look-back window in calendar days.")
+    query_parser.add_argument('--output', help="Write the full history to this CSV.")
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        market = args.market
+        if market is None:
+            market = next((name for name, settings in MARKETS.items()
+                           if settings['csv_file'] == os.path.basename(args.csv_file)), None)
+        if market is None:
+            print("Could not tell the market from the file name; pass --market.")
+            return
+        path, count = ingest(args.csv_file, market, args.date)
+        print(f"Stored {count} rows of {market} as {path}.")
+        return
+
+    columns = [column.strip() for column in args.columns.split(',') if column.strip()]
+    symbols = [symbol.strip() for symbol in args.symbols.split(',')] if args.symbols else None
+    start = (date.today() - timedelta(days=args.days)).isoformat()
+    history = query(args.market, columns, symbols, start=start)
+    if history.empty:
+        print(f"No {args.market} snapshots since {start}.")
+        return
+    print(f"{history['date'].nunique()} snapshots since {start}.")
+    print(summarize_changes(history, columns).to_string())
+    if args.output:
+        history.to_csv(args.output, index=False)
+        print(f"History saved as {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Local store of cleaned price frames, one pickle per ticker and interval.
+
+Bars are kept as traded, with split and dividend events stored separately per
+ticker (see bullfolio.adjust); load_frame applies the adjustment on read.
+
+Screeners write every frame they fetch into the store; offline tools
+(viewer, backtest, ...) read from it. To fill it with history up front:
+
+    python -m bullfolio.store --market india --start 2015-01-01 [--interval 1d]
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from bullfolio.adjust import adjust, extract_actions, unadjust
+
+DATA_DIR = '.bullfolio'
+PRICE_DIR = os.path.join(DATA_DIR, 'prices')
+ACTIONS_DIR = os.path.join(DATA_DIR, 'actions')
+
+
+def frame_path(ticker, interval):
+    """Return the on-disk location of the cached frame for ticker."""
+    return os.path.join(PRICE_DIR, interval, f"{ticker}.pkl")
+
+
+def read_pickle(path, ticker):
+    """Read one pickle of the store, or None if it is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        print(f"Error reading cached data for {ticker}: {e}")
+        return None
+
+
+def write_pickle(data, path):
+    """Atomically replace one pickle of the store."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    data.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_actions(ticker):
+    """Known split and dividend events for ticker, or None."""
+    return read_pickle(os.path.join(ACTIONS_DIR, f"{ticker}.pkl"), ticker)
+
+
+def save_actions(ticker, actions):
+    """Merge newly seen split and dividend events into the events of ticker."""
+    existing = load_actions(ticker)
+    if existing is not None and not existing.empty:
+        actions = pd.concat([existing, actions])
+        actions = actions[~actions.index.duplicated(keep='last')].sort_index()
+    if actions.empty:
+        return
+    write_pickle(actions, os.path.join(ACTIONS_DIR, f"{ticker}.pkl"))
+
+
+def load_frame(ticker, interval, adjusted=True, dividends=False):
+    """
+    Load the cached frame for ticker, or None if it was never stored.
+
+    By default prices are adjusted for every known split; pass dividends=True
+    for total-return prices or adjusted=False for the bars as traded.
+    """
+    data = read_pickle(frame_path(ticker, interval), ticker)
+    if data is None or not adjusted:
+        return data
+    return adjust(data, load_actions(ticker), dividends=dividends)
+
+
+def save_frame(ticker, interval, data):
+    """Merge as-traded bars into the cached frame for ticker, newest bars winning."""
+    existing = load_frame(ticker, interval, adjusted=False)
+    if existing is not None and not existing.empty:
+        data = pd.concat([existing, data])
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+    write_pickle(data, frame_path(ticker, interval))
+
+
+def ingest_download(ticker, interval, data):
+    """
+    Store a yfinance download made with auto_adjust=False, actions=True and
+    return its cleaned bars adjusted for every split known for ticker.
+    """
+    from bullfolio.charts import clean_and_prepare_data
+
+    actions = extract_actions(data, ticker)
+    cleaned = clean_and_prepare_data(data, ticker)
+    if cleaned is None or cleaned.empty:
+        return None
+    raw = unadjust(cleaned, actions)
+    save_actions(ticker, actions)
+    save_frame(ticker, interval, raw)
+    return adjust(raw, load_actions(ticker))
+
+
+def stored_tickers(interval):
+    """All tickers with a cached frame for interval."""
+    folder = os.path.join(PRICE_DIR, interval)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(name[:-len('.pkl')] for name in os.listdir(folder) if name.endswith('.pkl'))
+
+
+def load_frames(tickers, interval, dividends=False):
+    """Cached (adjusted) frames for the tickers that have one, keyed by ticker."""
+    frames = {}
+    for ticker in tickers:
+        data = load_frame(ticker, interval, dividends=dividends)
+        if data is not None and not data.empty:
+            frames[ticker] = data
+    return frames
+
+
+def update_frame(ticker, interval, start_date):
+    """Download the bars missing from the cached frame for ticker and merge them in."""
+    import yfinance as yf
+
+    existing = load_frame(ticker, interval, adjusted=False)
+    if existing is not None and not existing.empty and existing.index[0] <= pd.Timestamp(start_date):
+        start_date = existing.index[-1].strftime('%Y-%m-%d')
+    try:
+        data = yf.download(ticker, start=start_date, interval=interval, auto_adjust=False, actions=True)
+    except Exception as e:
+        print(f"Error fetching data for {ticker}: {e}")
+        return None
+    if data.empty:
+        return None
+    return ingest_download(ticker, interval, data)
+
+
+def main():
+    from bullfolio.markets import MARKETS
+    from bullfolio.universe import provider_ticker
+
+    parser = argparse.ArgumentParser(description="Fill the local price store for a market.")
+    parser.add_argument('--market', choices=sorted(MARKETS), required=True)
+    parser.add_argument('--start', required=True, help="First date to keep, e.g. 2015-01-01.")
+    parser.add_argument('--interval', default='1d')
+    args = parser.parse_args()
+
+    symbols = pd.read_csv(MARKETS[args.market]['csv_file'])['Symbol'].dropna().tolist()
+    for number, symbol in enumerate(symbols, start=1):
+        ticker = provider_ticker(symbol, args.market)
+        print(f"[{number}/{len(symbols)}] Updating {ticker}...")
+        update_frame(ticker, args.interval, args.start)
+
+
+if __name__ == "__main__":
+    main()
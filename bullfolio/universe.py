@@ -0,0 +1,186 @@
+"""
+Symbol universe resolver.
+
+Merges the symbol lists in the repository into one table, maps exchange
+symbols to the tickers the data provider (Yahoo) expects, and keeps a
+persisted blacklist of tickers that keep failing so they stop costing a fetch
+on every run. Each market keeps its own blacklist file, so markets screened
+side by side never overwrite each other's records.
+
+    python -m bullfolio.universe [--market india] [--blacklist] [--clear-blacklist]
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from bullfolio.markets import MARKETS
+from bullfolio.store import DATA_DIR
+
+BLACKLIST_DIR = os.path.join(DATA_DIR, 'blacklist')
+FAILURE_THRESHOLD = 3  # consecutive failures before a ticker is skipped
+BLACKLIST_TTL_DAYS = 7  # first skip period, doubled on every later failure
+MAX_BLACKLIST_DAYS = 90
+MIN_FAILURE_SESSIONS = 5  # a shorter window may hold no bars for a ticker that trades fine
+
+# Symbol lists merged into the universe: (file, market, column holding the sector/industry)
+UNIVERSE_SOURCES = [
+    ('ind_nifty500list.csv', 'india', 'Industry'),
+    ('india.csv', 'india', 'Sector'),
+    ('us.csv', 'us', 'Sector'),
+]
+
+# Exchange symbol quirks. TradingView marks Indian REITs/InvITs as NAME.RR where
+# Yahoo lists NAME.NS; US share classes are BRK.B on the exchange but BRK-B on
+# Yahoo. '&' and '-' are kept as they are (M&M.NS, BAJAJ-AUTO.NS).
+STRIPPED_SYMBOL_SUFFIXES = {'india': ('.RR',)}
+SYMBOL_REPLACEMENTS = {'us': (('.', '-'), ('/', '-'))}
+
+
+def provider_ticker(symbol, market):
+    """Map an exchange symbol to the ticker the data provider expects."""
+    symbol = str(symbol).strip().upper()
+    for suffix in STRIPPED_SYMBOL_SUFFIXES.get(market, ()):
+        if symbol.endswith(suffix):
+            symbol = symbol[:-len(suffix)]
+    for text, replacement in SYMBOL_REPLACEMENTS.get(market, ()):
+        symbol = symbol.replace(text, replacement)
+    return f"{symbol}{MARKETS[market]['suffix']}"
+
+
+def read_source(file_path, market, group_column):
+    """One symbol list as a frame of symbol, market, name and group."""
+    df = pd.read_csv(file_path)
+    name_column = 'Company Name' if 'Company Name' in df.columns else 'Description'
+    return pd.DataFrame({
+        'symbol': df['Symbol'].astype(str).str.strip(),
+        'market': market,
+        'name': df[name_column] if name_column in df.columns else None,
+        'sector': df[group_column] if group_column in df.columns else None,
+        'source': os.path.basename(file_path),
+    })
+
+
+def load_universe(markets=None, sources=UNIVERSE_SOURCES):
+    """Merged, de-duplicated universe with provider tickers, one row per ticker."""
+    frames = []
+    for file_path, market, group_column in sources:
+        if markets is not None and market not in markets:
+            continue
+        try:
+            frames.append(read_source(file_path, market, group_column))
+        except (FileNotFoundError, KeyError) as e:
+            print(f"Skipping symbol list '{file_path}': {e}")
+    if not frames:
+        return pd.DataFrame(columns=['symbol', 'market', 'name', 'sector', 'sources', 'ticker'])
+
+    universe = pd.concat(frames, ignore_index=True)
+    universe['ticker'] = [provider_ticker(symbol, market) for symbol, market in zip(universe['symbol'], universe['market'])]
+    # Keep the first name/sector seen for a ticker but remember every list it came from
+    sources_by_ticker = universe.groupby('ticker', sort=False)['source'].agg(', '.join)
+    universe = universe.drop_duplicates('ticker').drop(columns='source').set_index('ticker')
+    universe['sources'] = sources_by_ticker
+    return universe.reset_index()
+
+
+def blacklist_file(market):
+    """File holding one market's failure record."""
+    return os.path.join(BLACKLIST_DIR, f"{market}.json")
+
+
+def load_blacklist(market=None):
+    """The persisted failure record of market (of every market if None), keyed by ticker."""
+    blacklist = {}
+    for name in [market] if market else MARKETS:
+        path = blacklist_file(name)
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path) as f:
+                blacklist.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Error reading blacklist of {name}: {e}")
+    return blacklist
+
+
+def save_blacklist(blacklist, market):
+    """Persist the failure record of market, replacing the file in one step."""
+    os.makedirs(BLACKLIST_DIR, exist_ok=True)
+    path = blacklist_file(market)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(blacklist, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_blacklisted(blacklist, ticker, now=None):
+    """Whether ticker is inside its skip period."""
+    entry = blacklist.get(ticker)
+    if not entry or not entry.get('until'):
+        return False
+    return datetime.fromisoformat(entry['until']) > (now or datetime.now())
+
+
+def record_failure(blacklist, ticker, reason, now=None):
+    """Count a failed fetch; after FAILURE_THRESHOLD in a row the ticker is skipped for a while."""
+    now = now or datetime.now()
+    entry = blacklist.setdefault(ticker, {'failures': 0})
+    entry['failures'] += 1
+    entry['reason'] = reason
+    entry['last_failure'] = now.isoformat(timespec='seconds')
+    if entry['failures'] >= FAILURE_THRESHOLD:
+        days = min(BLACKLIST_TTL_DAYS * 2 ** (entry['failures'] - FAILURE_THRESHOLD), MAX_BLACKLIST_DAYS)
+        entry['until'] = (now + timedelta(days=days)).isoformat(timespec='seconds')
+
+
+def record_success(blacklist, ticker):
+    """Forget past failures of a ticker that returned data."""
+    blacklist.pop(ticker, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the merged symbol universe and the ticker blacklist.")
+    parser.add_argument('--market', choices=sorted(MARKETS))
+    parser.add_argument('--blacklist', action='store_true', help="List the blacklisted tickers instead.")
+    parser.add_argument('--clear-blacklist', action='store_true', help="Forget every recorded failure.")
+    args = parser.parse_args()
+
+    if args.clear_blacklist:
+        for market in [args.market] if args.market else MARKETS:
+            save_blacklist({}, market)
+        print("Blacklist cleared.")
+        return
+
+    blacklist = load_blacklist(args.market)
+    if args.blacklist:
+        for ticker, entry in sorted(blacklist.items()):
+            state = f"skipped until {entry['until']}" if is_blacklisted(blacklist, ticker) else 'retrying'
+            print(f"{ticker}: {entry['failures']} failures, {state} ({entry.get('reason')})")
+        return
+
+    universe = load_universe([args.market] if args.market else None)
+    universe['blacklisted'] = [is_blacklisted(blacklist, ticker) for ticker in universe['ticker']]
+    print(universe.to_string(index=False))
+    print(f"\n{len(universe)} tickers, {int(universe['blacklisted'].sum())} blacklisted.")
+
+
+if __name__ == "__main__":
+    main()
+
+
+def record_fetches(blacklist, fetched, missing, window_sessions=None):
+    """
+    Update the failure record after one round of downloads. Tickers in fetched
+    returned bars and are cleared. Those in missing returned none, which only
+    counts as a failure when the provider answered for other tickers of the
+    round (an outage looks like empty data for all of them) and the window held
+    at least MIN_FAILURE_SESSIONS sessions (None for the full history).
+    """
+    for ticker in fetched:
+        record_success(blacklist, ticker)
+    if not fetched or (window_sessions is not None and window_sessions < MIN_FAILURE_SESSIONS):
+        return
+    for ticker in missing:
+        record_failure(blacklist, ticker, 'No data')
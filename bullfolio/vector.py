@@ -0,0 +1,132 @@
+"""
+Lightweight vector charts drawn without matplotlib.
+
+Line charts are decimated with Largest-Triangle-Three-Buckets (LTTB), which
+keeps the visual shape of a long close series with a few hundred points;
+candle charts keep every OHLC bar. Both are written as small SVG files (or as
+JSON drawn on a canvas by the browser, see bullfolio.outputs), so a chart
+costs a few milliseconds and tens of KB instead of a 300 dpi raster.
+"""
+import html
+
+import numpy as np
+import pandas as pd
+
+from bullfolio.charts import binance_dark
+
+LTTB_POINTS = 400
+WIDTH = 1200
+HEIGHT = 540
+MARGIN = {'top': 40, 'right': 70, 'bottom': 30, 'left': 10}
+GRID_LINES = 5
+UP_COLOR = binance_dark['marketcolors']['candle']['up']
+DOWN_COLOR = binance_dark['marketcolors']['candle']['down']
+BACKGROUND = binance_dark['rc']['figure.facecolor']
+FACE_COLOR = binance_dark['facecolor']
+GRID_COLOR = binance_dark['gridcolor']
+TEXT_COLOR = '#d1d4dc'
+LINE_COLOR = 'white'
+
+
+def lttb(x, y, threshold=LTTB_POINTS):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets decimation:
+    the first and last point, plus from every bucket the point forming the
+    largest triangle with the previous kept point and the next bucket's mean.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def _scale(values, low, high, pixel_low, pixel_high):
+    """Map values in [low, high] linearly onto [pixel_low, pixel_high]."""
+    span = (high - low) or 1
+    return pixel_low + (np.asarray(values, dtype=float) - low) / span * (pixel_high - pixel_low)
+
+
+def _frame(title, low, high, first_date, last_date):
+    """SVG header, background, price grid with labels, title and date range."""
+    top, bottom = MARGIN['top'], HEIGHT - MARGIN['bottom']
+    right = WIDTH - MARGIN['right']
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" '
+        f'font-family="sans-serif" font-size="11" fill="{TEXT_COLOR}">',
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="{BACKGROUND}"/>',
+        f'<rect x="{MARGIN["left"]}" y="{top}" width="{right - MARGIN["left"]}" height="{bottom - top}" fill="{FACE_COLOR}"/>',
+        f'<text x="{WIDTH / 2}" y="24" text-anchor="middle" font-size="15" font-weight="600">{html.escape(title)}</text>',
+    ]
+    for price in np.linspace(low, high, GRID_LINES):
+        y = _scale(price, low, high, bottom, top)
+        parts.append(f'<line x1="{MARGIN["left"]}" x2="{right}" y1="{y:.1f}" y2="{y:.1f}" '
+                     f'stroke="{GRID_COLOR}" stroke-dasharray="4 4"/>')
+        parts.append(f'<text x="{right + 6}" y="{y + 4:.1f}">{price:.2f}</text>')
+    parts.append(f'<text x="{MARGIN["left"]}" y="{HEIGHT - 10}">{first_date:%b %d, %Y}</text>')
+    parts.append(f'<text x="{right}" y="{HEIGHT - 10}" text-anchor="end">{last_date:%b %d, %Y}</text>')
+    return parts
+
+
+def line_svg(close, title, points=LTTB_POINTS):
+    """SVG line chart of a close series, decimated to at most points vertices."""
+    close = close.dropna()
+    kept = lttb(np.arange(len(close)), close.to_numpy(), points)
+    values = close.to_numpy()[kept]
+    low, high = float(close.min()), float(close.max())
+    xs = _scale(kept, 0, max(len(close) - 1, 1), MARGIN['left'], WIDTH - MARGIN['right'])
+    ys = _scale(values, low, high, HEIGHT - MARGIN['bottom'], MARGIN['top'])
+    parts = _frame(title, low, high, close.index[0], close.index[-1])
+    path = ' '.join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    parts.append(f'<polyline points="{path}" fill="none" stroke="{LINE_COLOR}" stroke-width="1"/>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def candle_svg(data, title):
+    """SVG candlestick chart of prepared OHLC data, one wick and body per bar."""
+    low, high = float(data['Low'].min()), float(data['High'].max())
+    bottom, top = HEIGHT - MARGIN['bottom'], MARGIN['top']
+    step = (WIDTH - MARGIN['right'] - MARGIN['left']) / len(data)
+    body_width = max(step * 0.7, 1)
+    centers = MARGIN['left'] + step * (np.arange(len(data)) + 0.5)
+    opens = _scale(data['Open'], low, high, bottom, top)
+    closes = _scale(data['Close'], low, high, bottom, top)
+    highs = _scale(data['High'], low, high, bottom, top)
+    lows = _scale(data['Low'], low, high, bottom, top)
+
+    parts = _frame(title, low, high, data.index[0], data.index[-1])
+    for up, color in ((True, UP_COLOR), (False, DOWN_COLOR)):
+        mask = (data['Close'] >= data['Open']).to_numpy() == up
+        wicks = ''.join(f"M{x:.1f} {h:.1f}V{l:.1f}" for x, h, l in zip(centers[mask], highs[mask], lows[mask]))
+        bodies = ''.join(
+            f"M{x - body_width / 2:.1f} {min(o, c):.1f}h{body_width:.1f}v{max(abs(o - c), 0.5):.1f}h{-body_width:.1f}z"
+            for x, o, c in zip(centers[mask], opens[mask], closes[mask]))
+        parts.append(f'<path d="{wicks}" stroke="{color}" stroke-width="1"/>')
+        parts.append(f'<path d="{bodies}" fill="{color}"/>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def chart_json(data, title):
+    """Compact JSON-ready OHLC payload for drawing a candle chart on a canvas."""
+    return {
+        'title': title,
+        'dates': [f"{day:%Y-%m-%d}" for day in pd.DatetimeIndex(data.index)],
+        'ohlc': np.round(data[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=float), 4).tolist(),
+    }
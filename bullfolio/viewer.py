@@ -0,0 +1,175 @@
+"""
+Local viewer for the ranked list of the latest screening run.
+
+Charts are rendered the first time they are requested, using a pool of worker
+processes, and cached as <rank>.png in the run folder. Every request also
+queues the next few ranks so paging forward in the viewer rarely waits.
+
+    python -m bullfolio.viewer [run_folder] [--port 8000]
+"""
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bullfolio.manifest import latest_run_folder, read_manifest
+
+VIEW_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'view.html')
+CHART_ROUTE = 'charts'
+
+
+def render_rank(folder, meta, row):
+    """Render the chart for one manifest row into the run folder (worker process)."""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    from bullfolio.charts import render_candlestick_chart
+    from bullfolio.indicators import compute_indicators
+    from bullfolio.matrix import build_panel
+    from bullfolio.overlays import build_addplots
+    from bullfolio.store import load_frame
+
+    history = load_frame(row['ticker'], meta['interval'])
+    if history is None or history.empty:
+        raise ValueError(f"No cached data for {row['ticker']}.")
+    data = history.loc[meta['start_date']:meta.get('end_date')]
+
+    benchmark_close = None
+    if meta.get('rs_line'):
+        benchmark = load_frame(meta['benchmark'], meta['interval'])
+        if benchmark is not None:
+            benchmark_close = benchmark['Close']
+    indicators = None
+    if meta.get('mav'):
+        indicators = compute_indicators(build_panel({row['ticker']: history}), meta['interval'])
+    addplot = build_addplots(data, row['ticker'], benchmark_close, indicators, meta.get('volume', False))
+
+    file_name = os.path.join(folder, f"{row['rank']}.png")
+    tmp_name = os.path.join(folder, f".{row['rank']}.tmp.png")
+    render_candlestick_chart(data, tmp_name, row['title'], addplot=addplot, volume=meta.get('volume', False))
+    os.replace(tmp_name, file_name)
+    return file_name
+
+
+class ChartRenderer:
+    """Render-once cache of chart files backed by a process pool."""
+
+    def __init__(self, folder, manifest, workers, prefetch):
+        self.folder = folder
+        self.manifest = manifest
+        self.meta = {key: value for key, value in manifest.items() if key != 'ranks'}
+        self.rows = {row['rank']: row for row in manifest['ranks']}
+        self.prefetch = prefetch
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def submit(self, rank):
+        """Queue rank for rendering unless it is cached or already queued."""
+        row = self.rows.get(rank)
+        if row is None:
+            return None
+        with self.lock:
+            future = self.pending.get(rank)
+            if future is not None and not (future.done() and future.exception()):
+                return future
+            if os.path.exists(os.path.join(self.folder, f"{rank}.png")):
+                return None
+            future = self.pool.submit(render_rank, self.folder, self.meta, row)
+            self.pending[rank] = future
+            return future
+
+    def get(self, rank):
+        """Return the chart path for rank, rendering it if needed."""
+        if rank not in self.rows:
+            return None
+        future = self.submit(rank)
+        # Speculatively render the ranks the user is most likely to open next
+        for next_rank in range(rank + 1, rank + 1 + self.prefetch):
+            self.submit(next_rank)
+        if future is not None:
+            future.result()
+        return os.path.join(self.folder, f"{rank}.png")
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def make_handler(renderer):
+    """Build the request handler bound to a chart renderer."""
+
+    class ViewerHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].strip('/')
+            if path in ('', 'index.html'):
+                self.send_view()
+            elif path == 'ranks.json':
+                self.send_bytes(json.dumps(renderer.manifest).encode(), 'application/json')
+            elif path.startswith(f"{CHART_ROUTE}/") and path.endswith('.png'):
+                self.send_chart(path[len(CHART_ROUTE) + 1:-len('.png')])
+            else:
+                self.send_error(404)
+
+        def send_view(self):
+            with open(VIEW_HTML) as f:
+                html = f.read()
+            html = html.replace('const folder = "graph_custom";', f'const folder = "{CHART_ROUTE}";')
+            self.send_bytes(html.encode(), 'text/html; charset=utf-8')
+
+        def send_chart(self, rank):
+            try:
+                file_name = renderer.get(int(rank))
+            except ValueError:
+                self.send_error(404)
+                return
+            except Exception as e:
+                self.send_error(500, f"Error rendering chart {rank}: {e}")
+                return
+            if file_name is None:
+                self.send_error(404)
+                return
+            with open(file_name, 'rb') as f:
+                self.send_bytes(f.read(), 'image/png')
+
+        def send_bytes(self, body, content_type):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ViewerHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the ranked charts of a screening run.")
+    parser.add_argument('folder', nargs='?', help="Run folder (defaults to the latest run).")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--prefetch', type=int, default=5, help="Ranks to pre-render ahead of the viewer.")
+    args = parser.parse_args()
+
+    folder = args.folder or latest_run_folder()
+    manifest = read_manifest(folder) if folder else None
+    if manifest is None:
+        print("No run manifest found. Run a screener first (e.g. python Momentum/main.py --lazy).")
+        return
+
+    renderer = ChartRenderer(folder, manifest, args.workers, args.prefetch)
+    renderer.submit(1)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(renderer))
+    print(f"Serving {len(manifest['ranks'])} ranked charts from {folder} at http://127.0.0.1:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        renderer.shutdown()
+
+
+if __name__ == "__main__":
+    main()
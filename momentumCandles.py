@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 import os
 import shutil
 
+from bullfolio.universe import provider_ticker
+
 # Constants
 CSV_FILE = 'ind_nifty500list.csv'
 GRAPH_FOLDER = 'graph_custom'
@@ -60,7 +62,7 @@ def read_csv_and_get_symbols(file_path):
 def fetch_stock_data(symbol, start_date, interval):
     """Fetch historical stock data for a given symbol."""
     try:
-        symbol_with_suffix = f"{symbol}.NS"
+        symbol_with_suffix = provider_ticker(symbol, 'india')
         data = yf.download(symbol_with_suffix, start=start_date, interval=interval)
         if data.empty or len(data) < 2:
             print(f"Insufficient data for {symbol}.")
@@ -87,12 +89,13 @@ def clean_and_prepare_data(data, symbol):
         if isinstance(data.columns, pd.MultiIndex):
             data.columns = data.columns.map('_'.join).str.strip()
 
+        ticker = provider_ticker(symbol, 'india')
         column_mapping = {
-            f"Close_{symbol}.NS": 'Close',
-            f'High_{symbol}.NS': 'High',
-            f'Low_{symbol}.NS': 'Low',
-            f'Open_{symbol}.NS': 'Open',
-            f'Volume_{symbol}.NS': 'Volume',
+            f"Close_{ticker}": 'Close',
+            f'High_{ticker}': 'High',
+            f'Low_{ticker}': 'Low',
+            f'Open_{ticker}': 'Open',
+            f'Volume_{ticker}': 'Volume',
         }
         data = data.rename(columns=column_mapping)
 
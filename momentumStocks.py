@@ -1,10 +1,14 @@
 import pandas as pd
 import yfinance as yf
 import matplotlib.pyplot as plt
+import argparse
 import os
 from datetime import datetime, timedelta
 import shutil
 
+from bullfolio.universe import provider_ticker
+from bullfolio.vector import line_svg
+
 # Constants
 CSV_FILE = 'ind_nifty500list.csv'
 GRAPH_FOLDER = 'graph_custom'
@@ -26,7 +30,7 @@ def read_csv_and_get_symbols(file_path):
 def fetch_stock_data(symbol, start_date, interval):
     """Fetch historical stock data for a given symbol."""
     try:
-        symbol_with_suffix = f"{symbol}.NS"
+        symbol_with_suffix = provider_ticker(symbol, 'india')
         data = yf.download(symbol_with_suffix, start=start_date, interval=interval)
         if data.empty or len(data) < 2:
             print(f"Insufficient data for {symbol}.")
@@ -46,9 +50,14 @@ def calculate_return(data):
         print(f"Error calculating return: {e}")
         return None
 
-def save_stock_graph(data, symbol, rank, return_percent):
-    """Plot and save the stock's closing price graph in dark mode."""
+def save_stock_graph(data, symbol, rank, return_percent, svg=False):
+    """Plot and save the stock's closing price graph in dark mode (as a decimated SVG if svg)."""
     try:
+        if svg:
+            close = data['Close'].squeeze(axis=1) if isinstance(data['Close'], pd.DataFrame) else data['Close']
+            with open(os.path.join(GRAPH_FOLDER, f"{rank}.svg"), 'w', encoding='utf-8') as f:
+                f.write(line_svg(close, f"{symbol} - Return: {return_percent:.2f}%"))
+            return
         plt.style.use('dark_background')  # Set dark background style
         plt.figure(figsize=(12, 6))  # Wider figure with 12 inches width and 6 inches height
         plt.plot(data.index, data['Close'], color='white', linewidth=1)  # White line for closing prices
@@ -63,6 +72,11 @@ def save_stock_graph(data, symbol, rank, return_percent):
 
 def main():
     """Main function to execute the script."""
+    parser = argparse.ArgumentParser(description="Rank stocks by return and graph their closing prices.")
+    parser.add_argument('--svg', action='store_true',
+                        help="Write lightweight vector <rank>.svg graphs instead of 300 dpi PNGs.")
+    args = parser.parse_args()
+
     # Ask user for number of months and interval
     try:
         months = int(input("Enter the number of months for historical data (e.g., 18 for 1.5 years): "))
@@ -113,7 +127,7 @@ def main():
 
     # Step 4: Save graphs and print results
     for rank, (symbol, stock_return, data) in enumerate(results, start=1):
-        save_stock_graph(data, symbol, rank, stock_return)
+        save_stock_graph(data, symbol, rank, stock_return, args.svg)
         print(f"{rank}. {symbol}: {stock_return:.2f}% return")
 
     # Step 5: Open the graph folder
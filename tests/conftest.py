@@ -0,0 +1,192 @@
+"""
+Shared fixtures: recorded OHLCV bars served by a stand-in for yf.download, a
+frozen clock for the look-back windows, and golden-file comparisons.
+
+Set UPDATE_GOLDEN=1 to rewrite the golden images and rank tables from the
+current code instead of comparing against them; review the diff before
+committing it.
+"""
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+FIXTURE_DIR = os.path.join(TESTS_DIR, 'fixtures')
+PRICE_DIR = os.path.join(FIXTURE_DIR, 'prices')
+GOLDEN_DIR = os.path.join(TESTS_DIR, 'golden')
+UPDATE_GOLDEN = os.environ.get('UPDATE_GOLDEN') == '1'
+
+# Runs see the market as it was after the close of the last fixture session
+FROZEN_NOW = '2025-12-31 18:00'
+GOLDEN_WIDTH = 600  # golden images are stored as thumbnails of this width
+MEAN_TOLERANCE = 0.01  # mean absolute difference, as a fraction of full scale
+PIXEL_TOLERANCE = 0.005  # share of pixels allowed to differ by more than PIXEL_THRESHOLD
+PIXEL_THRESHOLD = 64
+ASPECT_TOLERANCE = 0.02
+SCORE_TOLERANCE = 1e-6
+
+sys.path.insert(0, REPO_DIR)
+
+
+def load_bars(ticker):
+    """The recorded bars of ticker, in yfinance's single-ticker column layout."""
+    path = os.path.join(PRICE_DIR, f"{ticker}.csv")
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, index_col='Date', parse_dates=True)
+
+
+def fake_download(tickers, start=None, end=None, period=None, interval='1d', actions=False,
+                  group_by='column', **kwargs):
+    """yf.download over the recorded bars: daily only, end exclusive, columns laid out as yfinance does."""
+    if interval != '1d':
+        raise ValueError(f"Only daily fixtures are recorded, not '{interval}'.")
+    names = tickers if isinstance(tickers, list) else [tickers]
+    frames = {}
+    for ticker in names:
+        data = load_bars(ticker)
+        if data is None:
+            continue
+        if period is None:
+            data = data.loc[start:]
+            if end is not None:
+                data = data.loc[data.index < pd.Timestamp(end)]
+        if not actions:
+            data = data.drop(columns=['Dividends', 'Stock Splits'])
+        frames[ticker] = data
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames, axis=1, names=['Ticker', 'Price'])
+    if group_by != 'ticker':
+        data = data.swaplevel(0, 1, axis=1)
+    return data
+
+
+@pytest.fixture
+def bars():
+    """Loader of cleaned OHLCV bars by ticker, as the renderers receive them."""
+    from bullfolio.charts import clean_and_prepare_data
+
+    def load(ticker, last=None):
+        data = clean_and_prepare_data(load_bars(ticker), ticker)
+        return data if last is None else data.iloc[-last:]
+
+    return load
+
+
+@pytest.fixture
+def offline_market(tmp_path, monkeypatch):
+    """
+    A working directory holding the market CSV and an empty store, with
+    downloads served from the fixtures and no rate limiting.
+    """
+    import yfinance
+
+    from bullfolio.markets import MARKETS
+
+    shutil.copy(os.path.join(FIXTURE_DIR, 'india.csv'), tmp_path / 'india.csv')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(yfinance, 'download', fake_download)
+    monkeypatch.setitem(MARKETS['india'], 'requests_per_second', float('inf'))
+    return tmp_path
+
+
+def frozen_trading_window(market, duration_type, duration, now=None):
+    """calendars.trading_window as seen at FROZEN_NOW."""
+    from bullfolio.calendars import trading_window
+
+    return trading_window(market, duration_type, duration, now=now or FROZEN_NOW)
+
+
+def load_module(path):
+    """Import a screen script by path, with its look-back window frozen."""
+    from bullfolio.daemon import load_screen
+
+    module = load_screen(os.path.join(REPO_DIR, path))
+    module.trading_window = frozen_trading_window
+    return module
+
+
+@pytest.fixture(scope='session')
+def momentum():
+    return load_module(os.path.join('Momentum', 'main.py'))
+
+
+@pytest.fixture(scope='session')
+def ath():
+    return load_module(os.path.join('ath', 'main.py'))
+
+
+def thumbnail(image):
+    """image scaled down to GOLDEN_WIDTH, which also evens out anti-aliasing noise."""
+    from PIL import Image
+
+    height = max(1, round(image.height * GOLDEN_WIDTH / image.width))
+    return image.convert('RGB').resize((GOLDEN_WIDTH, height), Image.LANCZOS)
+
+
+def assert_golden_image(path, name):
+    """Compare the image at path with golden/images/<name>.png within a perceptual tolerance."""
+    from PIL import Image
+
+    assert os.path.exists(path), f"{path} was not rendered"
+    golden_path = os.path.join(GOLDEN_DIR, 'images', f"{name}.png")
+    with Image.open(path) as image:
+        rendered = thumbnail(image)
+    if UPDATE_GOLDEN or not os.path.exists(golden_path):
+        os.makedirs(os.path.dirname(golden_path), exist_ok=True)
+        rendered.save(golden_path, optimize=True)
+        if not UPDATE_GOLDEN:
+            pytest.fail(f"No golden image {name}.png; wrote one, review and commit it")
+        return
+    with Image.open(golden_path) as golden:
+        golden = golden.convert('RGB')
+    aspect = rendered.height / rendered.width
+    golden_aspect = golden.height / golden.width
+    assert abs(aspect - golden_aspect) <= ASPECT_TOLERANCE * golden_aspect, (
+        f"{name}: size {rendered.size} differs from golden {golden.size}")
+    rendered = rendered.resize(golden.size)
+    diff = np.abs(np.asarray(rendered, dtype=np.int16) - np.asarray(golden, dtype=np.int16))
+    mean = diff.mean() / 255
+    changed = (diff.max(axis=2) > PIXEL_THRESHOLD).mean()
+    assert mean <= MEAN_TOLERANCE and changed <= PIXEL_TOLERANCE, (
+        f"{name}: mean difference {mean:.4f}, {changed:.2%} of pixels changed")
+
+
+def assert_golden_text(text, name):
+    """Compare text with the golden file golden/<name> exactly."""
+    golden_path = os.path.join(GOLDEN_DIR, name)
+    if UPDATE_GOLDEN or not os.path.exists(golden_path):
+        os.makedirs(os.path.dirname(golden_path), exist_ok=True)
+        with open(golden_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        if not UPDATE_GOLDEN:
+            pytest.fail(f"No golden file {name}; wrote one, review and commit it")
+        return
+    with open(golden_path, encoding='utf-8') as f:
+        assert text == f.read(), f"{name} differs from its golden file"
+
+
+def assert_golden_table(table, name):
+    """Compare a rank table with golden/ranks/<name>.csv: same symbols in the same order, scores within tolerance."""
+    golden_path = os.path.join(GOLDEN_DIR, 'ranks', f"{name}.csv")
+    if UPDATE_GOLDEN or not os.path.exists(golden_path):
+        os.makedirs(os.path.dirname(golden_path), exist_ok=True)
+        table.to_csv(golden_path, index=False, float_format='%.8g', lineterminator='\n')
+        if not UPDATE_GOLDEN:
+            pytest.fail(f"No golden rank table {name}.csv; wrote one, review and commit it")
+        return
+    golden = pd.read_csv(golden_path)
+    assert list(table.columns) == list(golden.columns)
+    assert table['symbol'].tolist() == golden['symbol'].tolist()
+    assert table['rank'].tolist() == golden['rank'].tolist()
+    for column in golden.columns.drop(['rank', 'symbol']):
+        np.testing.assert_allclose(table[column].astype(float), golden[column].astype(float),
+                                   rtol=SCORE_TOLERANCE, err_msg=f"{name}: column {column}")
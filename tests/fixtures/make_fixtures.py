@@ -0,0 +1,80 @@
+"""
+Write the recorded OHLCV fixtures used by the tests.
+
+The bars are a seeded random walk per ticker, so the files can be recreated
+byte for byte; they are committed so the tests never depend on this script or
+the network. One ticker carries a 2:1 split, one a dividend and one a bad
+zero-price bar that the quality checks must quarantine.
+
+    python tests/fixtures/make_fixtures.py
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRICE_DIR = os.path.join(FIXTURE_DIR, 'prices')
+DATES = pd.bdate_range('2024-01-01', '2025-12-31')
+SYMBOLS = {
+    # symbol: (seed, drift, volatility, sector, P/E, EPS growth, dividend yield, rating)
+    'ALPHA': (1, 0.0015, 0.015, 'Finance', 18.0, 25.0, 1.2, 'Buy'),
+    'BRAVO': (2, 0.0008, 0.020, 'Finance', 30.0, 10.0, 0.5, 'Neutral'),
+    'CHARLIE': (3, -0.0004, 0.018, 'Energy', 9.0, -5.0, 3.5, 'Sell'),
+    'DELTA': (4, 0.0011, 0.025, 'Technology', 45.0, 40.0, 0.0, 'Strong buy'),
+    'ECHO': (5, 0.0002, 0.012, 'Energy', 12.0, 3.0, 2.0, 'Buy'),
+    'FOXTROT': (6, 0.0020, 0.030, 'Technology', -20.0, 80.0, 0.0, 'Neutral'),
+    'GOLF': (7, 0.0005, 0.016, 'Consumer', 25.0, 12.0, 1.0, 'Buy'),
+    'HOTEL': (8, 0.0009, 0.014, 'Consumer', 22.0, 15.0, 1.5, 'Neutral'),
+}
+BENCHMARK = ('^CRSLDX', 99, 0.0006, 0.010)
+SPLIT = ('DELTA', '2025-06-02', 2.0)
+DIVIDEND = ('ECHO', '2025-03-03', 4.0)
+BAD_BAR = ('HOTEL', '2025-09-01')
+
+
+def random_walk(seed, drift, volatility):
+    """Seeded OHLCV bars as traded over DATES."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, volatility, len(DATES))))
+    # Each bar opens near the previous close, as real sessions mostly do
+    open_ = np.r_[100, close[:-1]] * np.exp(rng.normal(0, volatility / 3, len(DATES)))
+    spread = np.abs(rng.normal(0, volatility / 2, len(DATES)))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Adj Close': close,
+        'Volume': rng.integers(50_000, 2_000_000, len(DATES)),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=pd.Index(DATES, name='Date'))
+
+
+def main():
+    os.makedirs(PRICE_DIR, exist_ok=True)
+    frames = {f"{symbol}.NS": random_walk(*settings[:3]) for symbol, settings in SYMBOLS.items()}
+    frames[BENCHMARK[0]] = random_walk(*BENCHMARK[1:])
+
+    # yfinance reports bars already split-adjusted and marks the split in its action column
+    ticker, day, ratio = SPLIT
+    frames[f"{ticker}.NS"].loc[day, 'Stock Splits'] = ratio
+    ticker, day, amount = DIVIDEND
+    frames[f"{ticker}.NS"].loc[day, 'Dividends'] = amount
+    ticker, day = BAD_BAR
+    frames[f"{ticker}.NS"].loc[day, ['Open', 'High', 'Low', 'Close', 'Adj Close']] = 0.0
+
+    for ticker, data in frames.items():
+        data.round(4).to_csv(os.path.join(PRICE_DIR, f"{ticker}.csv"))
+
+    pd.DataFrame([{
+        'Symbol': symbol, 'Description': f"{symbol.title()} Ltd", 'Price': 100.0, 'Price - Currency': 'INR',
+        'Price to earnings ratio': pe, 'EPS diluted growth %, TTM YoY': growth,
+        'Dividend yield %, Trailing 12 months': dividend, 'Sector': sector, 'Analyst Rating': rating,
+    } for symbol, (_, _, _, sector, pe, growth, dividend, rating) in SYMBOLS.items()]).to_csv(
+        os.path.join(FIXTURE_DIR, 'india.csv'), index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from bullfolio.adjust import adjust, extract_actions, unadjust
+
+DATES = pd.bdate_range('2025-01-06', periods=6)
+
+
+def bars(close):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.full(len(close), 1000, dtype='int64')}, index=DATES)
+
+
+def actions(**events):
+    """Action table from keyword events like split=(day, ratio) and dividend=(day, amount)."""
+    table = pd.DataFrame(0.0, index=DATES, columns=['Dividends', 'Stock Splits'])
+    if 'split' in events:
+        table.iloc[events['split'][0], 1] = events['split'][1]
+    if 'dividend' in events:
+        table.iloc[events['dividend'][0], 0] = events['dividend'][1]
+    return table[(table != 0).any(axis=1)]
+
+
+def test_unadjust_restores_prices_as_traded():
+    # Yahoo reports a 2:1 split on the fourth bar with the earlier bars already halved
+    downloaded = bars([100, 100, 100, 100, 101, 102])
+    traded = unadjust(downloaded, actions(split=(3, 2.0)))
+    assert traded['Close'].tolist() == [200, 200, 200, 100, 101, 102]
+    assert traded['Volume'].tolist() == [500, 500, 500, 1000, 1000, 1000]
+    pd.testing.assert_frame_equal(adjust(traded, actions(split=(3, 2.0))), downloaded)
+
+
+def test_dividend_before_split_uses_split_adjusted_close():
+    # As traded the close is 200 before a 2:1 split; Yahoo reports the 2.0 dividend
+    # paid on the second bar split-adjusted as 1.0, i.e. 1% of the adjusted close of 100
+    events = actions(split=(3, 2.0), dividend=(1, 1.0))
+    traded = bars([200, 200, 200, 100, 100, 100])
+    adjusted = adjust(traded, events, dividends=True)
+    np.testing.assert_allclose(adjusted['Close'], [99, 100, 100, 100, 100, 100])
+    np.testing.assert_allclose(adjust(traded, events)['Close'], [100] * 6)
+
+
+def test_dividend_after_split():
+    events = actions(split=(1, 2.0), dividend=(4, 1.0))
+    adjusted = adjust(bars([200, 100, 100, 100, 100, 100]), events, dividends=True)
+    np.testing.assert_allclose(adjusted['Close'], [99, 99, 99, 99, 100, 100])
+
+
+def test_extract_actions_from_a_single_ticker_download():
+    data = bars([1, 2, 3, 4, 5, 6]).assign(Dividends=0.0, **{'Stock Splits': 0.0})
+    data.iloc[2, data.columns.get_loc('Stock Splits')] = 5.0
+    data.columns = pd.MultiIndex.from_product([data.columns, ['ABC.NS']], names=['Price', 'Ticker'])
+    events = extract_actions(data, 'ABC.NS')
+    assert events.index.tolist() == [DATES[2]]
+    assert events['Stock Splits'].tolist() == [5.0]
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullfolio import alerts
+from bullfolio.alerts import MIN_HISTORY_BARS, detect_events, dispatch, event_key, load_seen, parse_sink, save_seen
+
+DATES = pd.bdate_range('2024-01-01', periods=MIN_HISTORY_BARS + 20)
+NOW = datetime(2025, 1, 31, 18, 0)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def panel(**closes):
+    close = pd.DataFrame(closes, index=DATES[-len(next(iter(closes.values()))):])
+    return {'High': close, 'Close': close}
+
+
+def flat(bars=len(DATES), level=100.0):
+    return np.full(bars, level)
+
+
+def test_events_on_the_latest_bar():
+    ath = flat()
+    ath[-1] = 110
+    breakout = flat()
+    breakout[:10] = 150  # the all-time high is more than a year old
+    breakout[-1] = 120
+    young = flat(60)
+    young[-1] = 105
+    stale = flat()
+    stale[-1] = np.nan
+    events = detect_events(panel(ATH=ath, BRK=breakout, DROP=np.r_[flat(len(DATES) - 1), 80.0], STALE=stale,
+                                 YOUNG=np.r_[np.full(len(DATES) - 60, np.nan), young]), 'india')
+    kinds = {(event['type'], event['ticker']) for event in events}
+    # ATH and the 52-week breakout are one move, reported once; a recent listing is only a breakout
+    assert kinds == {('new_ath', 'ATH'), ('return_5d', 'ATH'), ('breakout_52w', 'BRK'), ('return_5d', 'BRK'),
+                     ('return_5d', 'DROP'), ('breakout_52w', 'YOUNG')}
+    drop = next(event for event in events if event['ticker'] == 'DROP')
+    assert drop['level'] == -20.0 and drop['date'] == DATES[-1].date().isoformat() and drop['market'] == 'india'
+
+
+def test_events_are_sent_once():
+    events = [{'type': 'new_ath', 'ticker': 'A', 'date': '2025-01-31', 'message': 'A'}]
+    sent = []
+    seen = {}
+    assert dispatch(events, [(lambda batch, target: sent.append(batch), None)], seen, NOW) == events
+    assert dispatch(events, [(lambda batch, target: sent.append(batch), None)], seen, NOW) == []
+    assert sent == [events] and seen == {event_key(events[0]): '2025-01-31T18:00:00'}
+
+
+def test_undelivered_events_are_retried(capsys):
+    def broken(batch, target):
+        raise OSError('offline')
+
+    events = [{'type': 'new_ath', 'ticker': 'A', 'date': '2025-01-31', 'message': 'A'}]
+    seen = {}
+    assert dispatch(events, [(broken, None)], seen, NOW) == []
+    assert seen == {} and 'offline' in capsys.readouterr().out
+
+
+def test_seen_events_expire():
+    save_seen({'new_ath:A:2024-12-01': '2024-12-01T18:00:00', 'new_ath:B:2025-01-30': '2025-01-30T18:00:00'})
+    assert list(load_seen(NOW)) == ['new_ath:B:2025-01-30']
+
+
+def test_parse_sink():
+    send, target = parse_sink('jsonl=events.jsonl')
+    send([{'ticker': 'A'}, {'ticker': 'B'}], target)
+    with open('events.jsonl') as f:
+        assert f.read() == '{"ticker": "A"}\n{"ticker": "B"}\n'
+    assert parse_sink('desktop') == (alerts.notify_desktop, None)
+    with pytest.raises(ValueError):
+        parse_sink('email')
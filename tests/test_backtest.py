@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullfolio import backtest
+from bullfolio.backtest import month_end_closes, momentum_deciles, run_backtest
+
+
+def daily_closes(end, **growth):
+    """Business-day closes compounding at a fixed daily rate per ticker."""
+    index = pd.bdate_range('2024-01-01', end)
+    steps = np.arange(len(index))
+    return pd.DataFrame({ticker: 100 * (1 + rate) ** steps for ticker, rate in growth.items()}, index=index)
+
+
+def test_partial_month_is_not_a_rebalance_date():
+    assert month_end_closes(daily_closes('2024-06-14', A=0.001)).index[-1] == pd.Timestamp('2024-05-31')
+    assert month_end_closes(daily_closes('2024-05-31', A=0.001)).index[-1] == pd.Timestamp('2024-05-31')
+
+
+def test_delisted_names_are_ranked_and_count_as_cash():
+    closes = daily_closes('2024-12-31', A=0.002, B=0.001, C=-0.001, D=0.003)
+    # D is the strongest name but stops trading in August
+    closes.loc['2024-08-15':, 'D'] = np.nan
+    trailing, forward, deciles = momentum_deciles(month_end_closes(closes), lookback=3, hold=1)
+    assert deciles.loc['2024-07-31', 'D'] == deciles.loc['2024-07-31'].min()
+    assert forward.loc['2024-08-31', 'D'] == 0.0
+    assert forward.loc['2024-07-31', 'D'] > 0
+    # No rebalance without an outcome at the end of the data
+    assert forward.index[-1] == pd.Timestamp('2024-11-30')
+    assert forward.notna().sum().sum() == trailing.notna().sum().sum()
+
+
+def test_run_backtest_top_basket_beats_the_weakest_names():
+    closes = daily_closes('2024-12-31', A=0.002, B=0.001, C=-0.001, D=0.0)
+    deciles, periods, summary = run_backtest(closes, lookback=3, hold=1, top=1)
+    assert len(periods) == 8
+    # Four names fill deciles 3, 5, 8 and 10
+    assert deciles.index.tolist() == [3, 5, 8, 10]
+    assert deciles['mean_return'].is_monotonic_decreasing
+    assert summary.loc['top', 'cagr'] > summary.loc['universe', 'cagr']
+
+
+@pytest.mark.parametrize('flag', ['--hold', '--lookback', '--top'])
+@pytest.mark.parametrize('value', ['0', '-1'])
+def test_periods_must_be_positive(flag, value, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['backtest', flag, value])
+    monkeypatch.setattr(backtest, 'load_frames', lambda *args, **kwargs: pytest.fail('prices were loaded'))
+    backtest.main()
+    assert capsys.readouterr().out == f"{flag} must be at least 1.\n"
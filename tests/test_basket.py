@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from bullfolio import basket
+from bullfolio.basket import priced_basket, turnover
+from bullfolio.manifest import write_manifest
+from bullfolio.store import save_frame
+
+WINDOW = {'interval': '1d', 'start_date': '2025-07-01', 'end_date': '2025-12-31'}
+
+
+@pytest.fixture
+def stored_run(bars, tmp_path, monkeypatch):
+    """A run whose third-ranked ticker has no stored prices."""
+    monkeypatch.chdir(tmp_path)
+    for ticker in ('ALPHA.NS', 'BRAVO.NS'):
+        save_frame(ticker, '1d', bars(ticker))
+    rows = [{'rank': rank, 'symbol': ticker[:-3], 'ticker': ticker, 'score': 10.0 - rank}
+            for rank, ticker in enumerate(['ALPHA.NS', 'BRAVO.NS', 'GONE.NS'], start=1)]
+    return dict(WINDOW, ranks=rows)
+
+
+def test_names_without_prices_are_left_out(stored_run):
+    weights, closes, missing = priced_basket(stored_run, 3)
+    assert missing == ['GONE.NS']
+    assert weights.to_dict() == {'ALPHA.NS': 0.5, 'BRAVO.NS': 0.5}
+    assert closes.index[0].strftime('%Y-%m-%d') >= WINDOW['start_date']
+    assert turnover(weights, priced_basket(stored_run, 3)[0]) == 0
+
+
+def test_identical_runs_show_no_turnover(stored_run, monkeypatch, capsys):
+    for folder in ('run', 'previous'):
+        os.makedirs(folder)
+        write_manifest(folder, stored_run, stored_run['ranks'], latest=False)
+    monkeypatch.setattr(basket, 'save_basket_chart', lambda *args: None)
+    monkeypatch.setattr('sys.argv', ['basket', 'run', '--top', '3', '--previous', 'previous'])
+    basket.main()
+    assert 'turnover 0.0% vs previous run' in capsys.readouterr().out
@@ -0,0 +1,70 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from bullfolio import calendars
+from bullfolio.calendars import (download_end, last_complete_session, nyse_holidays, sessions, trading_window)
+
+
+@pytest.fixture(autouse=True)
+def without_exchange_calendars(monkeypatch):
+    """Test the built-in fallback even where exchange_calendars is installed."""
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_exchange_calendars(name, *args, **kwargs):
+        if name == 'exchange_calendars':
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, '__import__', no_exchange_calendars)
+    monkeypatch.setattr(calendars, '_warned', set())
+
+
+def test_nyse_holidays_follow_the_rules():
+    assert {date(2026, 1, 1), date(2026, 1, 19), date(2026, 4, 3), date(2026, 6, 19), date(2026, 7, 3),
+            date(2026, 11, 26), date(2026, 12, 25)} <= nyse_holidays(2026)
+    # New Year's Day 2022 fell on a Saturday and was not observed on the Friday before
+    assert date(2021, 12, 31) not in nyse_holidays(2021)
+    # Unscheduled closures come from holidays.csv
+    assert date(2025, 1, 9) in nyse_holidays(2025)
+
+
+@pytest.mark.parametrize('year', [2025, 2026])
+def test_nse_holidays_are_listed_for_the_current_years(year, capsys):
+    days = sessions('india', f"{year}-01-01", f"{year}-12-31")
+    listed = [day for day in calendars.listed_holidays('india') if day.year == year]
+    assert listed and not any(pd.Timestamp(day) in days for day in listed)
+    assert pd.Timestamp(f"{year}-01-26") not in days
+    assert 'Warning' not in capsys.readouterr().out
+
+
+def test_unlisted_year_warns_once(capsys):
+    sessions('india', '2099-01-01', '2099-01-31')
+    sessions('india', '2099-02-01', '2099-02-28')
+    assert capsys.readouterr().out.count('lists no india holidays for 2099') == 1
+    sessions('us', '2099-01-01', '2099-01-31')
+    assert capsys.readouterr().out == ''
+
+
+def test_last_complete_session_skips_a_session_still_trading():
+    assert last_complete_session('india', '2026-03-04 12:00') == pd.Timestamp('2026-03-02')  # Holi on the 3rd
+    assert last_complete_session('india', '2026-03-04 16:00') == pd.Timestamp('2026-03-04')
+    assert last_complete_session('us', '2026-07-06 09:00') == pd.Timestamp('2026-07-02')
+
+
+def test_trading_window():
+    assert trading_window('us', 'sessions', 3, now='2026-01-21 17:00') == ('2026-01-16', '2026-01-21')
+    assert trading_window('india', 'months', 1, now='2026-03-31 18:00') == ('2026-03-02', '2026-03-30')
+    assert trading_window('india', 'weeks', 1, now='2026-04-15 18:00') == ('2026-04-09', '2026-04-15')
+    assert download_end('2026-04-15') == '2026-04-16'
+
+
+@pytest.mark.parametrize('duration_type', ['sessions', 'weeks', 'months'])
+def test_trading_window_rejects_empty_windows(duration_type):
+    with pytest.raises(ValueError):
+        trading_window('india', duration_type, 0)
+    with pytest.raises(ValueError):
+        trading_window('india', duration_type, -3)
@@ -0,0 +1,14 @@
+import pytest
+
+from bullfolio.composite import DEFAULT_WEIGHTS, parse_weights
+
+
+def test_weights_start_from_the_defaults():
+    assert parse_weights('momentum=0.6, rating=0') == dict(DEFAULT_WEIGHTS, momentum=0.6, rating=0.0)
+    with pytest.raises(ValueError, match='Unknown factor'):
+        parse_weights('return=1')
+
+
+def test_all_zero_weights_are_rejected():
+    with pytest.raises(ValueError, match='non-zero'):
+        parse_weights(','.join(f"{name}=0" for name in DEFAULT_WEIGHTS))
@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+import pytest
+
+from bullfolio.delta import clear_previous_outputs, rank_changes, print_report, relink_charts, reusable_charts
+
+META = {'interval': '1d', 'start_date': '2025-04-01', 'end_date': '2025-12-31', 'benchmark': None,
+        'rs_line': False, 'mav': False, 'volume': False}
+
+
+def row(rank, symbol, last_bar='2025-12-31T00:00:00', title=None):
+    return {'rank': rank, 'symbol': symbol, 'last_bar': last_bar, 'title': title or f"{symbol} chart"}
+
+
+def write_charts(folder, ranks, extension='png'):
+    for rank in ranks:
+        with open(os.path.join(folder, f"{rank}.{extension}"), 'w') as f:
+            f.write(str(rank))
+
+
+def read_chart(folder, rank):
+    with open(os.path.join(folder, f"{rank}.png")) as f:
+        return f.read()
+
+
+def test_rank_changes_mark_entries_and_exits(capsys):
+    # Every name from X4 on drops one rank behind the new entry D; B leaves the list
+    previous = [row(1, 'A'), row(2, 'B'), row(3, 'C')] + [row(rank, f"X{rank}") for rank in range(4, 25)]
+    rows = [row(1, 'D'), row(2, 'A'), row(3, 'C')] + [row(rank + 1, f"X{rank}") for rank in range(4, 25)]
+    changes = rank_changes(previous, rows)
+    assert pd.isna(changes.loc['D', 'previous_rank']) and pd.isna(changes.loc['B', 'rank'])
+    assert changes.loc['A', 'change'] == -1
+    print_report(changes)
+    out = capsys.readouterr().out
+    assert 'Entries (1): D #1' in out
+    assert 'Exits (1): B (was #2)' in out
+    # Only moves across a bucket of ten are reported
+    assert out.endswith('Biggest movers:\n  X10: #10 -> #11 (-1)\n  X20: #20 -> #21 (-1)\n')
+
+
+def test_unchanged_charts_are_reused(tmp_path):
+    folder = str(tmp_path)
+    write_charts(folder, [1, 2, 3])
+    previous = dict(META, ranks=[row(1, 'A'), row(2, 'B'), row(3, 'C', last_bar='2025-12-30T00:00:00')])
+    rows = [row(1, 'B'), row(2, 'A'), row(3, 'C')]
+    # C has a new bar and must be drawn again
+    assert reusable_charts(folder, previous, META, rows) == {1: 2, 2: 1}
+    assert reusable_charts(folder, previous, META, [row(1, 'A', title='A changed')]) == {}
+    assert reusable_charts(folder, previous, dict(META, mav=True), rows) == {}
+    assert reusable_charts(folder, None, META, rows) == {}
+    os.remove(os.path.join(folder, '2.png'))
+    assert reusable_charts(folder, previous, META, rows) == {2: 1}
+
+
+def test_relink_follows_rename_chains(tmp_path):
+    folder = str(tmp_path)
+    write_charts(folder, [1, 2, 3, 4])
+    relink_charts(folder, {2: 1, 3: 2, 4: 3})
+    assert sorted(os.listdir(folder)) == ['2.png', '3.png', '4.png']
+    assert [read_chart(folder, rank) for rank in (2, 3, 4)] == ['1', '2', '3']
+
+
+@pytest.mark.parametrize('keep_charts', [True, False])
+def test_clear_previous_outputs(tmp_path, keep_charts):
+    folder = str(tmp_path)
+    write_charts(folder, [1, 2])
+    write_charts(folder, [1], 'svg')
+    for name in ('manifest.json', 'report.html', 'composite.csv', 'sectors.png'):
+        open(os.path.join(folder, name), 'w').close()
+    os.makedirs(os.path.join(folder, 'extra'))
+    clear_previous_outputs(folder, keep_charts)
+    expected = ['1.png', '2.png', 'manifest.json'] if keep_charts else ['manifest.json']
+    assert sorted(os.listdir(folder)) == expected
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from bullfolio import history
+from bullfolio.history import days_in_top, read_ranks, read_summary, record_run, stored_screens, trajectory
+
+SCREEN = 'momentum-3months1d'
+RUNS = {
+    '2026-03-09': ['A', 'B', 'C', 'D'],
+    '2026-03-10': ['B', 'A', 'C', 'D'],
+    '2026-03-11': ['B', 'C', 'A', 'D'],
+}
+
+
+@pytest.fixture(autouse=True)
+def stored_runs(tmp_path, monkeypatch):
+    """Three sessions of one screen, queried as of the close of the last one."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(history, 'last_complete_session', lambda market: pd.Timestamp('2026-03-11'))
+    for day, symbols in RUNS.items():
+        record_run('india', SCREEN, day, ranks(symbols))
+
+
+def ranks(symbols, returns=(12.0, 5.0, -1.0, -8.0)):
+    return pd.DataFrame({'symbol': symbols, 'rank': range(1, len(symbols) + 1),
+                         'score': returns[:len(symbols)], 'return': returns[:len(symbols)]})
+
+
+def test_runs_are_partitioned_by_session():
+    assert stored_screens('india') == [SCREEN] and stored_screens('us') == []
+    table = read_ranks('india', SCREEN, ['rank', 'percentile'], start='2026-03-10', max_rank=2)
+    assert table['date'].dt.strftime('%Y-%m-%d').tolist() == ['2026-03-10', '2026-03-10', '2026-03-11', '2026-03-11']
+    assert table['symbol'].tolist() == ['B', 'A', 'B', 'C']
+    assert table['percentile'].round(1).tolist() == [100.0, 66.7, 100.0, 66.7]
+
+
+def test_rerun_replaces_the_session():
+    record_run('india', SCREEN, '2026-03-11', ranks(['D', 'C'], returns=(3.0, 2.0)))
+    assert read_ranks('india', SCREEN, ['rank'], start='2026-03-11')['symbol'].tolist() == ['D', 'C']
+    summary = read_summary('india', SCREEN).set_index('date')
+    assert len(summary) == 3
+    assert summary.loc['2026-03-10', ['universe', 'positive_pct', 'median_return']].tolist() == [4, 50.0, 2.0]
+    assert summary.loc['2026-03-11', ['universe', 'positive_pct', 'top_score']].tolist() == [2, 100.0, 3.0]
+
+
+def test_days_in_top():
+    table, runs = days_in_top('india', SCREEN, 2, 3)
+    assert runs == 3
+    assert table.index.tolist() == ['B', 'A', 'C']
+    assert table['days'].tolist() == [3, 2, 1] and table['best_rank'].tolist() == [1, 1, 2]
+    # Two sessions only reach back to the 10th
+    assert days_in_top('india', SCREEN, 1, 2)[0].index.tolist() == ['B']
+
+
+def test_trajectory():
+    path = trajectory('india', SCREEN, 'A', 3)
+    assert path['rank'].tolist() == [1, 2, 3]
+    assert path.index.strftime('%Y-%m-%d').tolist() == list(RUNS)
+    assert trajectory('india', SCREEN, 'Z', 3).empty
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullfolio.indicators import (apply_filter, compute_indicators, empty_columns, indicator_start,
+                                  indicator_table, year_bars)
+from bullfolio.matrix import build_panel
+
+
+def test_year_bars_scale_with_the_interval():
+    assert [year_bars(interval) for interval in ('1d', '1wk', '1mo', '3mo')] == [252, 52, 12, 4]
+    assert year_bars('1h') == 252 * 6
+    with pytest.raises(ValueError):
+        year_bars('fortnightly')
+
+
+def test_indicator_start_covers_the_longest_lookback():
+    assert pd.Timestamp(indicator_start('2025-04-01', '1d')) <= pd.Timestamp('2024-04-01')
+    # 200 weekly bars are almost four years
+    assert pd.Timestamp(indicator_start('2025-04-01', '1wk')) <= pd.Timestamp('2021-06-01')
+
+
+def test_weekly_52_week_high_uses_52_bars(bars):
+    weekly = bars('ALPHA.NS').resample('W-FRI').agg({'Open': 'first', 'High': 'max', 'Low': 'min',
+                                                      'Close': 'last', 'Volume': 'sum'}).dropna()
+    indicators = compute_indicators(build_panel({'ALPHA': weekly}), '1wk')
+    assert indicators['high_52w']['ALPHA'].iloc[-1] == weekly['High'].iloc[-52:].max()
+
+
+def test_filter_on_an_empty_column_is_reported(bars):
+    panel = build_panel({'ALPHA': bars('ALPHA.NS', 120), 'BRAVO': bars('BRAVO.NS', 120)})
+    table = indicator_table(panel, compute_indicators(panel))
+    assert table['sma_200'].isna().all()
+    expression = 'close > sma_200 and rsi > 0'
+    assert empty_columns(table, expression) == ['sma_200']
+    assert apply_filter(table, expression).empty
+    assert empty_columns(table, 'close > sma_20') == []
+
+
+def test_indicators_of_the_full_history_fill_sma_200(bars):
+    panel = build_panel({'ALPHA': bars('ALPHA.NS')})
+    table = indicator_table(panel, compute_indicators(panel))
+    close = bars('ALPHA.NS')['Close']
+    assert np.isclose(table.loc['ALPHA', 'sma_200'], close.iloc[-200:].mean())
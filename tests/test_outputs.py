@@ -0,0 +1,55 @@
+import json
+import re
+
+from bullfolio.charts import candlestick_figure
+from bullfolio.outputs import CanvasReportOutput, HtmlReportOutput, PdfBookOutput, SvgFolderOutput
+
+META = {'script': 'Momentum', 'market': 'india', 'interval': '1d', 'start_date': '2025-04-01',
+        'filter': 'close > sma_50 & rsi < 70', 'note': '</script><b>'}
+ROWS = [{'rank': 1, 'symbol': 'ALPHA', 'score': 12.5, 'title': 'ALPHA & Co <1>'},
+        {'rank': 2, 'symbol': 'BRAVO', 'score': -3.0, 'title': 'BRAVO'}]
+
+
+def script_json(text, pattern):
+    """The JSON inside the script element matched by pattern, as the browser would read it."""
+    body = re.search(pattern, text, re.S).group(1)
+    assert '</script' not in body
+    return json.loads(body.replace('<\\/', '</'))
+
+
+def test_html_report_keeps_meta_intact(bars, tmp_path):
+    output = HtmlReportOutput(tmp_path, META)
+    for row in ROWS:
+        output.add(row, candlestick_figure(bars(f"{row['symbol']}.NS", 60), row['title']))
+    text = open(output.close(), encoding='utf-8').read()
+    assert script_json(text, r'<script type="application/json" id="run-meta">(.*?)</script>') == META
+    assert text.count('<figure id="rank-') == 2
+    assert 'ALPHA &amp; Co &lt;1&gt;' in text
+    assert text.count('data:image/webp;base64,') == 2
+
+
+def test_canvas_report_keeps_meta_intact(bars, tmp_path):
+    output = CanvasReportOutput(tmp_path, META)
+    for row in ROWS:
+        output.add(row, bars(f"{row['symbol']}.NS", 60))
+    text = open(output.close(), encoding='utf-8').read()
+    assert script_json(text, r'const runMeta = (.*?);\n') == META
+    assert text.count('"ohlc"') == 2
+
+
+def test_pdf_book_has_a_page_per_chart(bars, tmp_path):
+    output = PdfBookOutput(tmp_path, META)
+    for row in ROWS:
+        output.add(row, candlestick_figure(bars(f"{row['symbol']}.NS", 60), row['title']))
+    data = open(output.close(), 'rb').read()
+    assert data.startswith(b'%PDF')
+    assert len(re.findall(rb'/Type\s*/Page\b', data)) == 2
+
+
+def test_svg_folder_writes_a_file_per_rank(bars, tmp_path):
+    output = SvgFolderOutput(tmp_path, META)
+    for row in ROWS:
+        output.add(row, bars(f"{row['symbol']}.NS", 60))
+    output.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['1.svg', '2.svg']
+    assert (tmp_path / '1.svg').read_text(encoding='utf-8').startswith('<svg')
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from bullfolio.quality import DEFAULT_RULES, check_frames, check_highs, default_rules, parse_rules
+
+DATES = pd.bdate_range('2025-01-01', periods=40)
+
+
+def frame(close, index=DATES):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close}, index=index[:len(close)])
+
+
+def steady(start=100.0, bars=40):
+    return start * 1.001 ** np.arange(bars)
+
+
+def test_clean_frames_pass():
+    passed, reasons = check_frames({'A': frame(steady()), 'B': frame(steady(50))})
+    assert sorted(passed) == ['A', 'B'] and reasons == {}
+
+
+def test_each_rule_quarantines():
+    jump = steady()
+    jump[20:] *= 2
+    zero = steady()
+    zero[5] = 0
+    frames = {
+        'ok': frame(steady()),
+        'jump': frame(jump),
+        'zero': frame(zero),
+        'short': frame(steady(bars=1)),
+        'stale': frame(steady(bars=20)),
+        'dupes': pd.concat([frame(steady()), frame(steady()).iloc[-1:]]),
+    }
+    passed, reasons = check_frames(frames)
+    assert list(passed) == ['ok']
+    assert reasons['jump'] == ['100.2% one-bar move']
+    assert 'zero or negative price' in reasons['zero']
+    assert reasons['short'] == ['only 1 bars', 'last bar 55 days old']
+    assert reasons['stale'] == ['last bar 28 days old']
+    assert reasons['dupes'] == ['duplicate timestamps']
+
+
+def test_rules_can_be_switched_off():
+    jump = steady()
+    jump[20:] *= 2
+    rules = parse_rules('max_bar_change=0')
+    assert rules['min_bars'] == DEFAULT_RULES['min_bars']
+    passed, reasons = check_frames({'jump': frame(jump)}, rules)
+    assert list(passed) == ['jump'] and reasons == {}
+
+
+def test_large_moves_pass_on_weekly_bars():
+    jump = steady()
+    jump[20:] *= 2
+    weekly = {'jump': frame(jump, pd.date_range('2025-01-03', periods=40, freq='W-FRI'))}
+    assert check_frames(weekly, parse_rules(None, '1wk'))[1] == {}
+    assert default_rules('1mo')['max_bar_change'] == 0 and default_rules('1h') == DEFAULT_RULES
+    # An explicit limit still applies
+    assert check_frames(weekly, parse_rules('max_bar_change=0.5', '1wk'))[1] == {'jump': ['100.2% one-bar move']}
+
+
+def test_old_moves_are_ignored_before_moves_since():
+    jump = steady()
+    jump[5:] *= 2
+    passed, reasons = check_frames({'jump': frame(jump)}, moves_since=DATES[10])
+    assert list(passed) == ['jump']
+    passed, reasons = check_frames({'jump': frame(jump)}, moves_since=DATES[5])
+    assert reasons == {'jump': ['100.2% one-bar move']}
+
+
+def test_a_high_set_by_a_spike_is_quarantined():
+    spike = steady()
+    spike[3] *= 3
+    doubled = steady()
+    doubled[5:] *= 2
+    passed, reasons = check_highs({'spike': frame(spike), 'doubled': frame(doubled), 'ok': frame(steady())})
+    # The old doubling is not at the high, the one-bar spike is
+    assert sorted(passed) == ['doubled', 'ok']
+    assert reasons == {'spike': ['high set by a 200.3% one-bar move']}
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from conftest import assert_golden_image, assert_golden_text
+from bullfolio.charts import render_candlestick_chart
+from bullfolio.indicators import compute_indicators
+from bullfolio.matrix import build_panel
+from bullfolio.overlays import build_addplots
+from bullfolio.vector import candle_svg, chart_json, line_svg
+
+BARS = 120
+
+
+def test_candlestick_chart(bars, tmp_path):
+    path = tmp_path / 'chart.png'
+    render_candlestick_chart(bars('ALPHA.NS', BARS), path, 'ALPHA - Return: 12.34%')
+    assert_golden_image(path, 'candlestick')
+
+
+def test_candlestick_chart_with_volume(bars, tmp_path):
+    path = tmp_path / 'chart.png'
+    render_candlestick_chart(bars('BRAVO.NS', BARS), path, 'BRAVO - Return: -1.23%', volume=True)
+    assert_golden_image(path, 'candlestick_volume')
+
+
+def test_candlestick_chart_with_overlays(bars, tmp_path):
+    data = bars('DELTA.NS', BARS)
+    indicators = compute_indicators(build_panel({'DELTA': bars('DELTA.NS')}))
+    addplot = build_addplots(data, 'DELTA', bars('^CRSLDX')['Close'], indicators, volume=True)
+    path = tmp_path / 'chart.png'
+    render_candlestick_chart(data, path, 'DELTA - Return: 5.00% | vs benchmark: +1.00%', addplot=addplot,
+                             volume=True)
+    assert_golden_image(path, 'candlestick_overlays')
+
+
+def test_reused_template_draws_the_same_chart(bars, tmp_path):
+    # Charts share one figure per layout; drawing another chart in between must leave no trace
+    first, second, again = tmp_path / 'first.png', tmp_path / 'second.png', tmp_path / 'again.png'
+    render_candlestick_chart(bars('ECHO.NS', BARS), first, 'ECHO')
+    render_candlestick_chart(bars('FOXTROT.NS', BARS), second, 'FOXTROT')
+    render_candlestick_chart(bars('ECHO.NS', BARS), again, 'ECHO')
+    with Image.open(first) as expected, Image.open(again) as actual:
+        assert expected.size == actual.size
+        assert np.array_equal(np.asarray(expected), np.asarray(actual))
+
+
+def test_crop_box_follows_the_price_labels(bars, tmp_path, monkeypatch):
+    from bullfolio import charts
+
+    # Same integer width, but the narrow range is labelled 49.90 ... 50.10
+    wide = bars('ALPHA.NS', BARS)
+    wide[['Open', 'High', 'Low', 'Close']] *= 50 / wide['Close'].mean()
+    narrow = wide.copy()
+    narrow[['Open', 'High', 'Low', 'Close']] = 50 + (narrow[['Open', 'High', 'Low', 'Close']] - 50) / 200
+    monkeypatch.setattr(charts, '_templates', {})
+    render_candlestick_chart(narrow, tmp_path / 'fresh.png', 'NARROW')
+    monkeypatch.setattr(charts, '_templates', {})
+    render_candlestick_chart(wide, tmp_path / 'wide.png', 'WIDE')
+    render_candlestick_chart(narrow, tmp_path / 'reused.png', 'NARROW')
+    with Image.open(tmp_path / 'fresh.png') as fresh, Image.open(tmp_path / 'reused.png') as reused:
+        assert reused.size == fresh.size
+
+
+def test_line_graph(bars, tmp_path, monkeypatch):
+    import matplotlib
+    import momentumStocks
+
+    monkeypatch.setattr(momentumStocks, 'GRAPH_FOLDER', str(tmp_path))
+    # The script switches the global style; keep that from leaking into the candle charts
+    with matplotlib.rc_context():
+        momentumStocks.save_stock_graph(bars('GOLF.NS', BARS), 'GOLF', 1, 7.5)
+    assert_golden_image(tmp_path / '1.png', 'line_graph')
+
+
+@pytest.mark.parametrize('ticker', ['ALPHA.NS', 'DELTA.NS'])
+def test_candle_svg(bars, ticker):
+    assert_golden_text(candle_svg(bars(ticker, BARS), ticker), f"svg/candle_{ticker}.svg")
+
+
+def test_line_svg(bars):
+    assert_golden_text(line_svg(bars('CHARLIE.NS')['Close'], 'CHARLIE - Return: -3.21%'), 'svg/line.svg')
+
+
+def test_chart_json_matches_bars(bars):
+    data = bars('ALPHA.NS', BARS)
+    chart = chart_json(data, 'ALPHA')
+    assert len(chart['ohlc']) == len(chart['dates']) == BARS
+    assert chart['dates'][-1] == data.index[-1].strftime('%Y-%m-%d')
@@ -0,0 +1,117 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import assert_golden_image, assert_golden_table
+
+from bullfolio.manifest import latest_run_folder, read_manifest
+
+WINDOW = ('india', 'months', 9, '1d')
+PRESETS = {
+    'return': [],
+    'relative_strength': ['--rs'],
+    'rank_by_rsi': ['--rank-by', 'rsi'],
+    'filter': ['--filter', 'close > sma_50'],
+    'composite': ['--composite'],
+}
+RANK_COLUMNS = ['rank', 'symbol', 'score', 'excess_return', 'rs_return']
+
+
+def run_momentum(momentum, flags):
+    args = momentum.parse_args(flags + ['--no-open'])
+    return momentum.run_screen(args, momentum.parse_weights(args.weights), *WINDOW, folder='run')
+
+
+def rank_table(manifest):
+    table = pd.DataFrame(manifest['ranks'])
+    return table[[column for column in RANK_COLUMNS if column in table.columns]]
+
+
+@pytest.mark.parametrize('preset', sorted(PRESETS))
+def test_momentum_ranks(momentum, offline_market, preset):
+    manifest = run_momentum(momentum, PRESETS[preset] + ['--lazy'])
+    assert (manifest['start_date'], manifest['end_date']) == ('2025-04-01', '2025-12-31')
+    assert_golden_table(rank_table(manifest), f"momentum_{preset}")
+
+
+def test_momentum_quarantines_bad_bars(momentum, offline_market):
+    manifest = run_momentum(momentum, ['--lazy'])
+    # HOTEL has a zero-price bar; DELTA's split is adjusted away and must not look like a crash
+    assert list(manifest['quarantine']) == ['HOTEL']
+    assert 'DELTA' in {row['symbol'] for row in manifest['ranks']}
+
+
+def test_short_window_filters_on_long_lookbacks(momentum, offline_market):
+    args = momentum.parse_args(['--lazy', '--no-open', '--filter', 'close > sma_200 and dist_52w_high > -10'])
+    manifest = momentum.run_screen(args, momentum.parse_weights(None), 'india', 'months', 3, '1d', folder='run')
+    # Warm-up history before the 3-month window fills the 200-bar average and the 52-week high;
+    # HOTEL's bad bar is before the window, so it is ranked this time
+    assert [row['symbol'] for row in manifest['ranks']] == ['ALPHA', 'CHARLIE', 'HOTEL']
+    indicators = pd.read_csv(os.path.join('run', 'indicators.csv'), index_col=0)
+    assert indicators['sma_200'].notna().all()
+
+
+def test_filtered_runs_leave_the_rank_history_alone(momentum, offline_market):
+    pytest.importorskip('pyarrow')
+    from bullfolio.history import read_ranks
+
+    full = run_momentum(momentum, ['--lazy'])
+    filtered = run_momentum(momentum, ['--lazy', '--filter', 'close > sma_200'])
+    assert len(filtered['ranks']) < len(full['ranks'])
+    stored = read_ranks('india', full['screen'], ['rank'])
+    assert stored['symbol'].tolist() == [row['symbol'] for row in full['ranks']]
+
+
+def test_outage_blacklists_nothing(momentum, offline_market, monkeypatch):
+    import yfinance
+    from bullfolio.universe import load_blacklist
+
+    # yfinance answers an outage with empty frames
+    monkeypatch.setattr(yfinance, 'download', lambda *args, **kwargs: pd.DataFrame())
+    for _ in range(3):
+        run_momentum(momentum, ['--lazy'])
+    assert load_blacklist('india') == {}
+
+
+def test_one_session_window_blacklists_nothing(momentum, offline_market):
+    from bullfolio.universe import load_blacklist
+
+    args = momentum.parse_args(['--lazy', '--no-open'])
+    for _ in range(3):
+        momentum.run_screen(args, momentum.parse_weights(None), 'india', 'sessions', 1, '1d', folder='run')
+    assert load_blacklist('india') == {}
+
+
+def test_chunked_ranks_match_single_pass(momentum, offline_market):
+    manifest = run_momentum(momentum, ['--lazy', '--chunk-size', '3'])
+    assert_golden_table(rank_table(manifest), 'momentum_return')
+
+
+def test_momentum_chart(momentum, offline_market):
+    manifest = run_momentum(momentum, ['--rs-line', '--mav', '--volume', '--top', '1'])
+    assert sorted(name for name in os.listdir('run') if name.endswith('.png')) == ['1.png']
+    assert manifest['ranks'][0]['symbol'] == 'ALPHA'
+    assert_golden_image(os.path.join('run', '1.png'), 'momentum_top')
+
+
+def test_delta_run_drops_outputs_of_other_flags(momentum, offline_market):
+    run_momentum(momentum, ['--lazy', '--composite', '--filter', 'close > sma_50'])
+    for name in ('report.html', 'charts.html', '2.svg', '1.png', '9.png'):
+        open(os.path.join('run', name), 'w').close()
+    assert {'composite.csv', 'indicators.csv'} <= set(os.listdir('run'))
+    manifest = run_momentum(momentum, ['--lazy', '--delta'])
+    # The composite titles differ from the new ones, so none of the previous charts is reused either
+    assert sorted(os.listdir('run')) == ['manifest.json']
+    assert manifest['composite_weights'] is None
+
+
+def test_ath_ranks(ath, offline_market):
+    ranking = ath.run_screen(*WINDOW, folder='run', open_charts=False)
+    assert list(ranking['quarantine']) == ['HOTEL']
+    assert read_manifest('run') == json.loads(json.dumps(ranking))
+    assert latest_run_folder() is None
+    table = pd.DataFrame(ranking['ranks'])[['rank', 'symbol', 'ath_ratio', 'all_time_high']]
+    assert_golden_table(table, 'ath')
+    assert_golden_image(os.path.join('run', '1.png'), 'ath_top')
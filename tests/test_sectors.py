@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+import pandas as pd
+
+from conftest import REPO_DIR
+
+from bullfolio.sectors import sector_table, top_names_by_sector
+
+
+def test_sectors_aggregate_returns_not_scores():
+    # Ranked by RSI: the score is not a return and must not show up as one
+    ranks = pd.DataFrame({'rank': [1, 2, 3, 4], 'score': [80.0, 70.0, 60.0, 50.0],
+                          'return': [12.0, -4.0, 6.0, 2.0]}, index=['A', 'B', 'C', 'D'])
+    sectors = pd.Series({'A': 'Energy', 'B': 'Energy', 'C': 'Finance', 'D': 'Finance'}, name='Sector')
+    table = sector_table(ranks, sectors)
+    assert table.loc['Energy', ['median', 'breadth', 'best']].tolist() == [4.0, 50.0, 12.0]
+    assert table.loc['Finance', ['median', 'breadth', 'best']].tolist() == [4.0, 100.0, 6.0]
+    leaders = top_names_by_sector(ranks, sectors, ['Finance'], 1)
+    assert leaders.index.tolist() == ['C']
+
+
+def test_sectors_module_does_not_import_matplotlib():
+    # matplotlib is only loaded when the heatmap is drawn
+    code = "import sys, bullfolio.sectors; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
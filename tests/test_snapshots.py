@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from bullfolio.snapshots import ingest, query, read_snapshot_csv, snapshot_dates, summarize_changes
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def export(file_name, prices, rating='Buy'):
+    """A screener export in the column layout of india.csv, with a column the store drops."""
+    pd.DataFrame({
+        'Symbol': list(prices) + [list(prices)[0]],
+        'Description': [f"{symbol} Ltd" for symbol in prices] + ['duplicate'],
+        'Price': list(prices.values()) + [0.0],
+        'Volume 1 day': ['1000'] * len(prices) + ['1'],
+        'Sector': 'Finance',
+        'Analyst Rating': rating,
+        'Technical Rating 1 day': 'Neutral',
+    }).to_csv(file_name, index=False)
+    return file_name
+
+
+def test_export_is_stored_compactly():
+    snapshot = read_snapshot_csv(export('india.csv', {'A': 10.0, 'B': 20.0}))
+    assert snapshot.columns.tolist() == ['symbol', 'name', 'price', 'volume', 'sector', 'rating']
+    assert snapshot['symbol'].tolist() == ['A', 'B'] and snapshot['name'].tolist() == ['A Ltd', 'B Ltd']
+    assert snapshot['rating'].dtype == 'category' and snapshot['volume'].dtype == 'Int64'
+
+
+def test_query_reads_the_days_in_range():
+    ingest(export('day1.csv', {'A': 10.0, 'B': 20.0}), 'india', '2026-03-09')
+    ingest(export('day2.csv', {'A': 11.0, 'B': 19.0}, rating='Strong buy'), 'india', '2026-03-10')
+    path, count = ingest(export('day3.csv', {'A': 12.0, 'B': 18.0}), 'india', '2026-03-11')
+    assert count == 2 and path.endswith('date=2026-03-11/part.parquet')
+    assert snapshot_dates('india', start='2026-03-10') == ['2026-03-10', '2026-03-11']
+    assert snapshot_dates('us') == []
+
+    history = query('india', ['price', 'rating'], symbols=['A'], end='2026-03-10')
+    assert history.columns.tolist() == ['date', 'symbol', 'price', 'rating']
+    assert history['price'].tolist() == [10.0, 11.0]
+    assert history['rating'].astype(str).tolist() == ['Buy', 'Strong buy']
+    assert query('india', ['price'], start='2027-01-01').empty
+
+
+def test_summarize_changes():
+    for day, prices in (('2026-03-09', {'A': 10.0, 'B': 20.0}), ('2026-03-11', {'A': 12.0, 'B': 18.0})):
+        ingest(export(f"{day}.csv", prices), 'india', day)
+    summary = summarize_changes(query('india', ['price', 'rating']), ['price', 'rating'])
+    assert summary.loc['A', ['snapshots', 'price_first', 'price_last', 'price_change']].tolist() == [2, 10.0, 12.0, 2.0]
+    assert summary.loc['B', 'price_change'] == -2.0
+    assert 'rating_change' not in summary.columns
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from bullfolio.universe import (BLACKLIST_TTL_DAYS, FAILURE_THRESHOLD, MAX_BLACKLIST_DAYS, blacklist_file,
+                                is_blacklisted, load_blacklist, load_universe, provider_ticker,
+                                record_failure, record_fetches, record_success, save_blacklist)
+
+NOW = datetime(2026, 3, 2, 9, 0)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """The blacklist files live under .bullfolio of the working directory."""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize('symbol, market, ticker', [
+    ('RELIANCE', 'india', 'RELIANCE.NS'),
+    (' m&m ', 'india', 'M&M.NS'),
+    ('BAJAJ-AUTO', 'india', 'BAJAJ-AUTO.NS'),
+    ('EMBASSY.RR', 'india', 'EMBASSY.NS'),
+    ('BRK.B', 'us', 'BRK-B'),
+    ('BF/A', 'us', 'BF-A'),
+])
+def test_provider_ticker(symbol, market, ticker):
+    assert provider_ticker(symbol, market) == ticker
+
+
+def test_failures_blacklist_with_a_growing_skip_period():
+    blacklist = {}
+    for _ in range(FAILURE_THRESHOLD - 1):
+        record_failure(blacklist, 'BAD.NS', 'no data', NOW)
+    assert not is_blacklisted(blacklist, 'BAD.NS', NOW)
+    record_failure(blacklist, 'BAD.NS', 'no data', NOW)
+    assert is_blacklisted(blacklist, 'BAD.NS', NOW)
+    assert not is_blacklisted(blacklist, 'BAD.NS', NOW + timedelta(days=BLACKLIST_TTL_DAYS, seconds=1))
+    record_failure(blacklist, 'BAD.NS', 'no data', NOW)
+    assert blacklist['BAD.NS']['until'] == (NOW + timedelta(days=2 * BLACKLIST_TTL_DAYS)).isoformat()
+    for _ in range(10):
+        record_failure(blacklist, 'BAD.NS', 'no data', NOW)
+    assert blacklist['BAD.NS']['until'] == (NOW + timedelta(days=MAX_BLACKLIST_DAYS)).isoformat()
+    record_success(blacklist, 'BAD.NS')
+    assert blacklist == {}
+
+
+def test_only_empty_answers_count_as_failures():
+    blacklist = {'OK.NS': {'failures': 2}}
+    # Nothing came back at all: an outage, not three dead tickers
+    record_fetches(blacklist, [], ['OK.NS', 'BAD.NS'], 250)
+    assert blacklist == {'OK.NS': {'failures': 2}}
+    # A one-session window may hold no bars for a ticker that trades fine
+    record_fetches(blacklist, ['OK.NS'], ['BAD.NS'], 1)
+    assert blacklist == {}
+    record_fetches(blacklist, ['OK.NS'], ['BAD.NS'], 250)
+    record_fetches(blacklist, ['OK.NS'], ['BAD.NS'])
+    assert list(blacklist) == ['BAD.NS'] and blacklist['BAD.NS']['failures'] == 2
+
+
+def test_blacklists_are_kept_per_market():
+    india, us = {}, {}
+    record_failure(india, 'BAD.NS', 'no data', NOW)
+    record_failure(us, 'GONE', 'delisted', NOW)
+    save_blacklist(india, 'india')
+    save_blacklist(us, 'us')
+    # Saving one market leaves the other's record alone
+    save_blacklist({}, 'us')
+    save_blacklist(us, 'us')
+    assert load_blacklist('india') == india
+    assert load_blacklist('us') == us
+    assert set(load_blacklist()) == {'BAD.NS', 'GONE'}
+
+
+def test_unreadable_blacklist_is_reported(capsys):
+    save_blacklist({}, 'india')
+    with open(blacklist_file('india'), 'w') as f:
+        f.write('{broken')
+    assert load_blacklist('india') == {}
+    assert 'Error reading blacklist of india' in capsys.readouterr().out
+
+
+def test_universe_merges_lists_by_ticker():
+    pd.DataFrame({'Symbol': ['TCS', 'INFY'], 'Company Name': ['Tata', 'Infosys'],
+                  'Industry': ['IT', 'IT']}).to_csv('nifty.csv', index=False)
+    pd.DataFrame({'Symbol': ['TCS', 'EMBASSY.RR'], 'Description': ['TCS Ltd', 'Embassy'],
+                  'Sector': ['Technology', 'Finance']}).to_csv('india.csv', index=False)
+    sources = [('nifty.csv', 'india', 'Industry'), ('india.csv', 'india', 'Sector'), ('missing.csv', 'us', 'Sector')]
+    universe = load_universe(sources=sources).set_index('ticker')
+    assert universe.index.tolist() == ['TCS.NS', 'INFY.NS', 'EMBASSY.NS']
+    # The first list wins for the name and sector, but every source is remembered
+    assert universe.loc['TCS.NS', ['name', 'sector', 'sources']].tolist() == ['Tata', 'IT', 'nifty.csv, india.csv']
+    assert load_universe(['us'], sources=sources).empty